@@ -7,21 +7,7 @@ import re
 import nuke
 import nukescripts
 
-try:
-    if hasattr(nuke, 'NUKE_VERSION_MAJOR') and nuke.NUKE_VERSION_MAJOR >= 16:
-        from PySide6 import QtCore, QtGui, QtWidgets
-        from PySide6.QtCore import Qt
-    else:
-        from PySide2 import QtCore, QtGui, QtWidgets
-        from PySide2.QtCore import Qt
-except ImportError:
-    QtGui = None
-    QtWidgets = None
-    QtCore = None
-
 import prefs
-import tabtabtab as _tabtabtab
-from colors import ColorPaletteDialog
 from constants import (
     ANCHOR_DEFAULT_COLOR,
     ANCHOR_PREFIX,
@@ -31,25 +17,91 @@ from constants import (
     DOT_LABEL_FONT_SIZE_LARGE,
     DOT_LABEL_FONT_SIZE_MEDIUM,
     KNOB_NAME,
+    LINK_GRID_COLUMNS,
+    LINK_GRID_SPACING,
     NODE_LABEL_FONT_SIZE_LARGE,
 )
 from link import (
+    FqnnResolver,
+    anchor_generation,
+    anchor_id,
+    assign_new_anchor_id,
+    backdrop_index,
+    bump_anchor_generation,
+    current_group_path,
     find_node_color,
     find_smallest_containing_backdrop,
     get_fully_qualified_node_name,
     get_link_class_for_source,
+    group_index,
+    group_node,
+    has_expression_label,
+    invalidate_anchor_index,
+    invalidate_link_index,
     is_anchor,
+    is_anchor_index_seeded,
     is_link,
+    link_anchor_id,
+    links_to,
+    parent_group_path,
     reconnect_link_node,
+    register_anchor_in_index,
+    seeded_anchors,
+    seeded_links_for,
     setup_link_node,
 )
+from util import undo_group
+
+# ---------------------------------------------------------------------------
+# Deferred UI imports
+#
+# PySide, tabtabtab and colors are imported on first use, not at module
+# import, so menu.py loads quickly and `nuke -t` sessions never touch Qt.
+# ---------------------------------------------------------------------------
+
+def _qt_modules():
+    """Return (QtCore, QtGui, QtWidgets) for this Nuke's PySide, or None without Qt."""
+    try:
+        if hasattr(nuke, 'NUKE_VERSION_MAJOR') and nuke.NUKE_VERSION_MAJOR >= 16:
+            from PySide6 import QtCore, QtGui, QtWidgets
+        else:
+            from PySide2 import QtCore, QtGui, QtWidgets
+    except ImportError:
+        return None
+    return QtCore, QtGui, QtWidgets
+
+
+def _color_palette_dialog_class():
+    """Return colors.ColorPaletteDialog, or None when Qt is unavailable."""
+    if _qt_modules() is None:
+        return None
+    from colors import ColorPaletteDialog
+    return ColorPaletteDialog
+
+
+def _new_picker(plugin):
+    """Build a hidden, frameless tabtabtab picker for *plugin*."""
+    import tabtabtab
+    QtCore = _qt_modules()[0]
+    return tabtabtab.TabTabTabWidget(plugin, winflags=QtCore.Qt.FramelessWindowHint)
+
+
+def _tile_color_qcolors(node):
+    """Return the (background, text) QColor pair for a picker row from *node*'s tile_color."""
+    QtGui = _qt_modules()[1]
+    color_int = node['tile_color'].value()  # 0xRRGGBBAA — reads what was actually set
+    r = (color_int >> 24) & 0xFF
+    g = (color_int >> 16) & 0xFF
+    b = (color_int >> 8) & 0xFF
+    color = QtGui.QColor(r, g, b)
+    return (color, color)
 
 
 def sanitize_anchor_name(name):
     return re.sub(r'[^A-Za-z0-9_]', '_', name.strip())
 
 
-def find_anchor_color(anchor):
+def find_anchor_color(anchor, backdrops=None, default_colors=None):
     """Return the tile color an anchor should display.
 
     Priority:
@@ -57,12 +109,15 @@ def find_anchor_color(anchor):
          input is a Read node.
       2. The anchor's input node color (with Preferences fallback).
       3. Hard-coded default purple if neither is available.
+
+    *backdrops* (a link.backdrop_index()) and *default_colors* (a class ->
+    color cache) let bulk callers share those lookups across many anchors.
     """
     input_node = anchor.input(0)
 
     # --- 1. Backdrop color — only for Read nodes ---
     if input_node is not None and input_node.Class() == 'Read':
-        smallest = find_smallest_containing_backdrop(anchor)
+        smallest = find_smallest_containing_backdrop(anchor, backdrops)
         if smallest is not None:
             color = smallest['tile_color'].value()
             if color != 0:
@@ -70,7 +125,7 @@ def find_anchor_color(anchor):
 
     # --- 2. Attached input node color (with Preferences fallback) ---
     if input_node is not None:
-        return find_node_color(input_node)
+        return find_node_color(input_node, default_colors)
 
     # --- 3. Default anchor color ---
     return ANCHOR_DEFAULT_COLOR
@@ -124,6 +179,54 @@ def propagate_anchor_color(anchor_node, color_int):
         link_node['tile_color'].setValue(color_int)
 
 
+def anchors_by_tile_color(anchors=None):
+    """Return {tile_color int: [anchor nodes]} for *anchors* (default: all_anchors()).
+
+    Dot anchors are left out — their colors are fixed by the system.
+    """
+    index = {}
+    for anchor_node in all_anchors() if anchors is None else anchors:
+        if anchor_node.Class() == 'Dot':
+            continue
+        index.setdefault(int(anchor_node['tile_color'].value()), []).append(anchor_node)
+    return index
+
+
+def links_by_anchor(path=None):
+    """Return link.links_by_reference() for the group at *path* (default: the current group).
+
+    Read it with link.links_to().
+    """
+    return group_index(path).links_by_reference()
+
+
+def recolor_anchors(color_remap):
+    """Recolor anchors and their links according to *color_remap* ({old int: new int}).
+
+    Every anchor whose tile_color is a key of *color_remap* gets the mapped
+    color, and so does each link referencing it.  Remaps are matched against
+    the colors anchors had before the call, so {A: B, B: C} swaps rather than
+    cascading A to C.  Covers the anchors of the current group, reading the
+    group's cached index, recorded as a single undo step.  Returns the number
+    of anchors recolored.
+    """
+    targets = [
+        (anchor_node, color_remap[old_color])
+        for old_color, anchor_nodes in anchors_by_tile_color().items()
+        if old_color in color_remap and color_remap[old_color] != old_color
+        for anchor_node in anchor_nodes
+    ]
+    if not targets:
+        return 0
+    links = links_by_anchor()
+    with undo_group("Recolor anchors"):
+        for anchor_node, color_int in targets:
+            anchor_node['tile_color'].setValue(color_int)
+            for link_node in links_to(links, anchor_node):
+                link_node['tile_color'].setValue(color_int)
+    return len(targets)
+
+
 def _persist_custom_colors_from_dialog(dialog):
     """Save any newly staged custom colors from *dialog* back to prefs and disk.
 
@@ -142,6 +245,7 @@ def set_anchor_color(anchor_node):
 
     This is the entry point called by the 'Set Color' PyScript_Knob on the anchor node.
     """
+    ColorPaletteDialog = _color_palette_dialog_class()
     if ColorPaletteDialog is None:
         return
     if anchor_node.Class() == 'Dot':
@@ -165,28 +269,64 @@ def anchor_display_name(node):
     return node.name()[len(ANCHOR_PREFIX):]
 
 
-def all_anchors():
-    anchors = [n for n in nuke.allNodes() if is_anchor(n)]
+def all_anchors(path=None):
+    """Return the anchors in the group at *path* (default: the current group), sorted by name.
+
+    Root-level lookups use the manifest seed when one is active.
+    """
+    if path is None:
+        path = current_group_path()
+    anchors = seeded_anchors() if not path else None
+    if anchors is None:
+        anchors = list(group_index(path).anchors)
     anchors.sort(key=lambda n: anchor_display_name(n).lower())
     return anchors
 
 
+def anchors_by_display_name(path=None):
+    """Return {display name: anchor} for the group at *path*, keeping find_anchor_by_name()'s pick.
+
+    Build it once to resolve many names against a single scan.
+    """
+    anchors = {}
+    for anchor in all_anchors(path):
+        anchors.setdefault(anchor_display_name(anchor), anchor)
+    return anchors
+
+
 def find_anchor_by_name(display_name):
     """Return the anchor node whose display name equals *display_name*, or None."""
     for anchor in all_anchors():
         if anchor_display_name(anchor) == display_name:
             return anchor
+    if is_anchor_index_seeded():
+        # The manifest may predate anchors created outside this plugin — fall
+        # back to a full scan before reporting a miss.
+        invalidate_anchor_index()
+        return find_anchor_by_name(display_name)
     return None
 
 
 def get_links_for_anchor(anchor_node):
-    """Return all link nodes in the current script that reference *anchor_node*."""
+    """Return all link nodes that reference *anchor_node*.
+
+    Links live in the anchor's own group, so only that group's index is read;
+    use links_by_anchor() when handling many anchors.  Links are matched
+    on the anchor's ID, or on its FQNN for links that predate anchor IDs.
+    Root anchors listed in the manifest use its link lists instead.
+    """
+    links = seeded_links_for(anchor_node)
+    if links is not None:
+        return links
     fqnn = get_fully_qualified_node_name(anchor_node)
-    return [node for node in nuke.allNodes() if is_link(node) and node[KNOB_NAME].getText() == fqnn]
+    return group_index(parent_group_path(anchor_node)).links_for(fqnn, anchor_id(anchor_node))
+
 
+def suggest_anchor_name(input_node, backdrops=None):
+    """Return a suggested anchor name based on the input node's file knob and backdrop context.
 
-def suggest_anchor_name(input_node):
-    """Return a suggested anchor name based on the input node's file knob and backdrop context."""
+    *backdrops* is an optional link.backdrop_index() shared across many calls.
+    """
     suggestion = ""
 
     if 'file' in input_node.knobs():
@@ -196,7 +336,7 @@ def suggest_anchor_name(input_node):
             m = re.match(r'^(.+)_v\d+(?:\.[^.]+)?\.[^.]+$', filename)
             suggestion = m.group(1) if m else os.path.splitext(filename)[0]
 
-    smallest = find_smallest_containing_backdrop(input_node)
+    smallest = find_smallest_containing_backdrop(input_node, backdrops)
     if smallest is not None:
         label = smallest['label'].getValue().strip()
         if label:
@@ -210,8 +350,11 @@ def rename_anchor_to(anchor_node, name, color=None):
 
     Raises ValueError if *name* sanitizes to an empty string.
     For Dot anchors the node name is kept in sync with the label so that the
-    FQNN (which embeds the node name) reflects the new name.  Old FQNNs stored
-    on link nodes are updated to the new FQNN.
+    FQNN (which embeds the node name) reflects the new name.  Links that carry
+    the anchor's ID keep resolving without any change to their stored
+    reference, and links with expression labels redraw the new name on their
+    own, so such links are not written at all.  Links from before anchor IDs
+    have their old FQNN rewritten to the new one.
 
     Parameters
     ----------
@@ -228,36 +371,46 @@ def rename_anchor_to(anchor_node, name, color=None):
         if not sanitized:
             raise ValueError(f"Anchor name {name!r} produces an empty sanitized name")
 
+        old_full_name = anchor_node.fullName()
         old_fqnn = get_fully_qualified_node_name(anchor_node)
+        links = group_index(parent_group_path(anchor_node)).links_for(
+            old_fqnn, anchor_id(anchor_node))
         anchor_node.setName(ANCHOR_PREFIX + sanitized)
+        register_anchor_in_index(anchor_node, old_full_name)
         new_label = name.strip()
         anchor_node['label'].setValue(new_label)
         new_fqnn = get_fully_qualified_node_name(anchor_node)
-
-        for node in nuke.allNodes():
-            if is_link(node) and node[KNOB_NAME].getText() == old_fqnn:
-                node[KNOB_NAME].setValue(new_fqnn)
-                node['label'].setValue(f"Link: {new_label}")
+        _retarget_links(links, new_fqnn, new_label)
     else:
         sanitized = sanitize_anchor_name(name)
         if not sanitized:
             raise ValueError(f"Anchor name {name!r} produces an empty sanitized name")
 
+        old_full_name = anchor_node.fullName()
         old_fqn = get_fully_qualified_node_name(anchor_node)
+        links = group_index(parent_group_path(anchor_node)).links_for(
+            old_fqn, anchor_id(anchor_node))
         anchor_node.setName(ANCHOR_PREFIX + sanitized)
+        register_anchor_in_index(anchor_node, old_full_name)
         anchor_node['label'].setValue(anchor_display_name(anchor_node))
         new_fqn = get_fully_qualified_node_name(anchor_node)
 
         new_label = anchor_node['label'].getText() or anchor_node.name()
-        for node in nuke.allNodes():
-            if is_link(node) and node[KNOB_NAME].getText() == old_fqn:
-                node[KNOB_NAME].setValue(new_fqn)
-                node['label'].setValue(f"Link: {new_label}")
+        _retarget_links(links, new_fqn, new_label)
 
     if color is not None:
         propagate_anchor_color(anchor_node, color)
 
 
+def _retarget_links(links, new_fqnn, new_label):
+    """Point renamed-anchor *links* at *new_fqnn* and *new_label*, writing only what is stale."""
+    for node in links:
+        if not link_anchor_id(node):
+            node[KNOB_NAME].setValue(new_fqnn)
+        if not has_expression_label(node):
+            node['label'].setValue(f"Link: {new_label}")
+
+
 def rename_anchor(anchor_node):
     """Prompt the user for a new name (and optionally a new color) and rename the anchor."""
     if anchor_node.Class() == 'Dot':
@@ -269,6 +422,7 @@ def rename_anchor(anchor_node):
             else anchor_display_name(anchor_node)
         )
 
+    ColorPaletteDialog = _color_palette_dialog_class()
     if ColorPaletteDialog is None:
         # Qt unavailable — fall back to plain text input
         name = nuke.getInput("Rename anchor:", suggested)
@@ -285,7 +439,7 @@ def rename_anchor(anchor_node):
         initial_name=suggested,
         custom_colors=prefs.custom_colors,
     )
-    if dialog.exec_() != QtWidgets.QDialog.Accepted:
+    if dialog.exec_() != ColorPaletteDialog.Accepted:
         return
     _persist_custom_colors_from_dialog(dialog)
     chosen_name = dialog.chosen_name
@@ -312,16 +466,16 @@ def rename_selected_anchor():
 def reconnect_anchor_node(anchor_node):
     # Bug fix: filter by exact FQNN match so only this anchor's links reconnect,
     # not all links in the script (the old substring check was commented out).
-    fqnn = get_fully_qualified_node_name(anchor_node)
-    for node in nuke.allNodes():
-        if is_link(node) and node[KNOB_NAME].getText() == fqnn:
-            reconnect_link_node(node)
+    resolver = FqnnResolver()
+    for node in get_links_for_anchor(anchor_node):
+        reconnect_link_node(node, resolver)
 
 
-def reconnect_all_links():
-    for node in nuke.allNodes():
-        if is_link(node):
-            reconnect_link_node(node)
+def reconnect_all_links(path=None):
+    """Reconnect every link in the group at *path* (default: the current group)."""
+    resolver = FqnnResolver()
+    for node in group_index(path).links:
+        reconnect_link_node(node, resolver)
 
 
 def create_anchor():
@@ -332,6 +486,7 @@ def create_anchor():
 
     suggested = suggest_anchor_name(input_node) if input_node is not None else ""
 
+    ColorPaletteDialog = _color_palette_dialog_class()
     if ColorPaletteDialog is None:
         # Qt unavailable — fall back to plain text input
         name = nuke.getInput("Anchor name:", suggested)
@@ -349,7 +504,7 @@ def create_anchor():
         initial_name=suggested,
         custom_colors=prefs.custom_colors,
     )
-    if dialog.exec_() != QtWidgets.QDialog.Accepted:
+    if dialog.exec_() != ColorPaletteDialog.Accepted:
         return
     _persist_custom_colors_from_dialog(dialog)
     chosen_name = dialog.chosen_name
@@ -369,6 +524,41 @@ def create_from_anchor(anchor_node):
     return link
 
 
+def create_links_for_anchors(anchor_nodes):
+    """Create one link per anchor in *anchor_nodes*, as a single undo step.
+
+    Links are created with nuke.nodes rather than createNode, so there is no
+    per-node autoplace or selection churn; they are laid out in picking order
+    in a grid LINK_GRID_COLUMNS wide below the DAG center, and selected
+    together once at the end.  Returns the new links.
+    """
+    if not anchor_nodes:
+        return []
+    links = []
+    with undo_group("Create Links"):
+        nukescripts.clear_selection_recursive()
+        for anchor_node in anchor_nodes:
+            source = anchor_node if anchor_node.Class() == 'Dot' else anchor_node.input(0)
+            link = getattr(nuke.nodes, get_link_class_for_source(source))()
+            setup_link_node(anchor_node, link)
+            links.append(link)
+        _layout_in_grid(links, nuke.center())
+        for link in links:
+            link['selected'].setValue(True)
+    return links
+
+
+def _layout_in_grid(nodes, origin):
+    """Place *nodes* row by row, LINK_GRID_COLUMNS wide, horizontally centered on *origin*."""
+    cell_width = max(node.screenWidth() for node in nodes) + LINK_GRID_SPACING
+    cell_height = max(node.screenHeight() for node in nodes) + LINK_GRID_SPACING
+    left = int(origin[0]) - min(len(nodes), LINK_GRID_COLUMNS) * cell_width // 2
+    top = int(origin[1])
+    for index, node in enumerate(nodes):
+        row, column = divmod(index, LINK_GRID_COLUMNS)
+        node.setXYpos(left + column * cell_width, top + row * cell_height)
+
+
 def create_anchor_named(name, input_node=None, color=None):
     """Create an anchor with the given *name* without any user prompt.
 
@@ -391,6 +581,12 @@ def create_anchor_named(name, input_node=None, color=None):
 
     nukescripts.clear_selection_recursive()
     anchor = nuke.createNode('NoOp')
+    _init_anchor_node(anchor, sanitized, input_node, color)
+    return anchor
+
+
+def _init_anchor_node(anchor, sanitized, input_node, color, backdrops=None, default_colors=None):
+    """Name, wire, place, color and add knobs to a freshly created anchor NoOp."""
     anchor.setName(ANCHOR_PREFIX + sanitized)
     anchor['label'].setValue(anchor_display_name(anchor))
 
@@ -404,11 +600,12 @@ def create_anchor_named(name, input_node=None, color=None):
     if color is not None:
         anchor['tile_color'].setValue(color)
     else:
-        anchor['tile_color'].setValue(find_anchor_color(anchor))
+        anchor['tile_color'].setValue(find_anchor_color(anchor, backdrops, default_colors))
     add_reconnect_anchor_knob(anchor)
     add_rename_anchor_knob(anchor)
     add_set_color_anchor_knob(anchor)
-    return anchor
+    assign_new_anchor_id(anchor)
+    register_anchor_in_index(anchor)
 
 
 def create_anchor_silent(input_node=None):
@@ -424,6 +621,66 @@ def create_anchor_silent(input_node=None):
     return create_anchor_named(suggested, input_node)
 
 
+def _uncollide_anchor_name(sanitized, taken_names):
+    """Return *sanitized*, or *sanitized*_2, _3, ... — the first whose node name is free.
+
+    The chosen full node name is added to *taken_names*.
+    """
+    candidate = sanitized
+    suffix = 2
+    while ANCHOR_PREFIX + candidate in taken_names:
+        candidate = f"{sanitized}_{suffix}"
+        suffix += 1
+    taken_names.add(ANCHOR_PREFIX + candidate)
+    return candidate
+
+
+def create_anchors_for_nodes(nodes):
+    """Create an anchor under each of *nodes* in one pass, as a single undo step.
+
+    Anchors, links, backdrops and nodes that already feed an anchor are
+    skipped.  Names come from suggest_anchor_name() (falling back to the node
+    name) and are made unique against a set of the script's node names, so no
+    anchor is renamed by Nuke.  The backdrop index and Preferences color lookups
+    are shared across all nodes, and anchors are created with nuke.nodes.NoOp()
+    and placed directly below their inputs instead of through createNode's
+    autoplace.  Returns the new anchors.
+    """
+    anchored_inputs = {
+        anchor_node.input(0).fullName()
+        for anchor_node in all_anchors()
+        if anchor_node.input(0) is not None
+    }
+    input_nodes = [
+        node for node in nodes
+        if node.Class() != 'BackdropNode' and not is_anchor(node) and not is_link(node)
+        and node.fullName() not in anchored_inputs
+    ]
+    if not input_nodes:
+        return []
+
+    backdrops = backdrop_index()
+    default_colors = {}
+    taken_names = {node.name() for node in nuke.allNodes()}
+    anchors = []
+    with undo_group("Anchor All Selected"):
+        nukescripts.clear_selection_recursive()
+        for input_node in input_nodes:
+            suggested = suggest_anchor_name(input_node, backdrops) or input_node.name()
+            sanitized = _uncollide_anchor_name(sanitize_anchor_name(suggested), taken_names)
+            anchor = nuke.nodes.NoOp()
+            _init_anchor_node(anchor, sanitized, input_node, None, backdrops, default_colors)
+            anchors.append(anchor)
+    return anchors
+
+
+def create_anchors_for_selected():
+    """Menu entry point: anchor every selected input node (see create_anchors_for_nodes)."""
+    if not prefs.plugin_enabled:
+        return []
+    return create_anchors_for_nodes(nuke.selectedNodes())
+
+
 def create_link_for_anchor_named(display_name):
     """Create a link node wired to the anchor with *display_name*.
 
@@ -447,8 +704,83 @@ def try_create_link_for_anchor_named(display_name):
     return create_from_anchor(anchor)
 
 
-class AnchorPlugin(_tabtabtab.TabTabTabPlugin):
-    """tabtabtab plugin that lists all anchor nodes for link creation."""
+# Knobs whose changes alter what the anchor pickers list or how they draw it
+_PICKER_KNOB_NAMES = frozenset(('name', 'label', 'tile_color'))
+
+# Classes menu.py registers on_anchor_candidates_changed() for
+ANCHOR_CANDIDATE_CLASSES = ('NoOp', 'Dot', 'PostageStamp', 'BackdropNode', 'Group')
+
+
+# Path of the group the pickers were last opened from ('' for the Root).  The
+# picker widgets outlive a single open and invoke from Qt, where Nuke's
+# context is always the Root, so the group is captured when they are shown.
+_picker_group_path = ''
+
+
+def _capture_picker_group():
+    global _picker_group_path
+    _picker_group_path = current_group_path()
+
+
+@contextlib.contextmanager
+def _picker_group_context():
+    """Enter the group the pickers were opened from; yields False if it no longer exists."""
+    group = group_node(_picker_group_path)
+    if group is None:
+        yield False
+        return
+    with group:
+        yield True
+
+
+def _picker_change_token():
+    """Change token shared by the anchor pickers: anchor generation, script name and group."""
+    return (anchor_generation(), nuke.root().name(), _picker_group_path)
+
+
+def on_anchor_candidates_changed():
+    """onCreate/onDestroy callback for node classes that can be anchors or backdrops."""
+    bump_anchor_generation()
+
+
+def on_node_created_or_destroyed():
+    """Unfiltered onCreate/onDestroy callback for anchors and links of any class.
+
+    Any node named Anchor_* is an anchor, and copied LINK_SOURCE_CLASSES nodes
+    carry a stored FQNN, so they too move the anchor generation.  New anchors
+    join an active manifest seed, whoever created them; links coming or going
+    drop the manifest's link lists.
+    """
+    node = nuke.thisNode()
+    if is_anchor(node):
+        register_anchor_in_index(node)
+    elif is_link(node):
+        invalidate_link_index()
+
+
+def on_anchor_candidate_knob_changed():
+    """knobChanged callback: invalidate the pickers when a listed or drawn knob changes.
+
+    A node renamed to an anchor name joins an active manifest seed.
+    """
+    knob_name = nuke.thisKnob().name()
+    if knob_name not in _PICKER_KNOB_NAMES:
+        return
+    node = nuke.thisNode()
+    if knob_name == 'name' and is_anchor(node):
+        register_anchor_in_index(node)
+    else:
+        bump_anchor_generation()
+
+
+class AnchorPlugin:
+    """tabtabtab plugin that lists all anchor nodes for link creation.
+
+    Implements the tabtabtab.TabTabTabPlugin interface by duck typing rather than
+    subclassing, so defining it does not import tabtabtab or Qt.
+    """
+
+    supports_multi_select = True
 
     def get_items(self):
         return [
@@ -456,27 +788,33 @@ class AnchorPlugin(_tabtabtab.TabTabTabPlugin):
                 'menuobj': anchor,
                 'menupath': 'Anchors/' + anchor_display_name(anchor),
             }
-            for anchor in all_anchors()
+            for anchor in all_anchors(_picker_group_path)
         ]
 
+    def get_change_token(self):
+        return _picker_change_token()
+
     def get_weights_file(self):
         return os.path.expanduser('~/.nuke/paste_hidden_anchor_weights.json')
 
     def invoke(self, thing):
         anchor = thing['menuobj']
-        if nuke.exists(anchor.name()):
-            create_from_anchor(anchor)
+        with _picker_group_context() as entered:
+            if entered and nuke.exists(anchor.name()):
+                create_from_anchor(anchor)
+
+    def invoke_many(self, things):
+        with _picker_group_context() as entered:
+            if entered:
+                create_links_for_anchors([
+                    thing['menuobj'] for thing in things if nuke.exists(thing['menuobj'].name())
+                ])
 
     def get_icon(self, menuobj):
         return None
 
     def get_color(self, menuobj):
-        color_int = menuobj['tile_color'].value()  # 0xRRGGBBAA — reads what was actually set
-        r = (color_int >> 24) & 0xFF
-        g = (color_int >> 16) & 0xFF
-        b = (color_int >> 8) & 0xFF
-        color = QtGui.QColor(r, g, b)
-        return (color, color)
+        return _tile_color_qcolors(menuobj)
 
 
 def _offer_make_dot_anchor(dot_node):
@@ -520,9 +858,10 @@ _anchor_picker_widget = None
 def select_anchor_and_create():
     if not prefs.plugin_enabled:
         return
-    if QtWidgets is None:
+    if _qt_modules() is None:
         return
-    if not all_anchors():
+    _capture_picker_group()
+    if not all_anchors(_picker_group_path):
         return
     global _anchor_picker_widget
     if _anchor_picker_widget is not None:
@@ -533,9 +872,7 @@ def select_anchor_and_create():
             return
         except RuntimeError:
             _anchor_picker_widget = None
-    _anchor_picker_widget = _tabtabtab.TabTabTabWidget(
-        AnchorPlugin(), winflags=Qt.FramelessWindowHint
-    )
+    _anchor_picker_widget = _new_picker(AnchorPlugin())
     _anchor_picker_widget.under_cursor()
     _anchor_picker_widget.show()
     _anchor_picker_widget.raise_()
@@ -594,8 +931,11 @@ def navigate_to_anchor(anchor_node):
     nukescripts.clear_selection_recursive()
 
 
-class AnchorNavigatePlugin(_tabtabtab.TabTabTabPlugin):
-    """tabtabtab plugin that lists all anchor nodes for DAG navigation."""
+class AnchorNavigatePlugin:
+    """tabtabtab plugin that lists anchors and labelled backdrops for DAG navigation.
+
+    Duck-typed like AnchorPlugin, so defining it does not import tabtabtab or Qt.
+    """
 
     def get_items(self):
         items = [
@@ -603,9 +943,12 @@ class AnchorNavigatePlugin(_tabtabtab.TabTabTabPlugin):
                 'menuobj': anchor_node,
                 'menupath': 'Anchors/' + anchor_display_name(anchor_node),
             }
-            for anchor_node in all_anchors()
+            for anchor_node in all_anchors(_picker_group_path)
         ]
-        for backdrop_node in nuke.allNodes('BackdropNode'):
+        group = group_node(_picker_group_path)
+        if group is None:
+            return items
+        for backdrop_node in nuke.allNodes('BackdropNode', group=group):
             label = backdrop_node['label'].value().strip()
             if label:
                 items.append({
@@ -614,29 +957,28 @@ class AnchorNavigatePlugin(_tabtabtab.TabTabTabPlugin):
                 })
         return items
 
+    def get_change_token(self):
+        return _picker_change_token()
+
     def get_weights_file(self):
         return os.path.expanduser('~/.nuke/paste_hidden_anchor_navigate_weights.json')
 
     def invoke(self, thing):
         node = thing['menuobj']
-        if not nuke.exists(node.name()):
-            return
-        _save_dag_position()
-        if node.Class() == 'BackdropNode':
-            navigate_to_backdrop(node)
-            return
-        navigate_to_anchor(node)
+        with _picker_group_context() as entered:
+            if not entered or not nuke.exists(node.name()):
+                return
+            _save_dag_position()
+            if node.Class() == 'BackdropNode':
+                navigate_to_backdrop(node)
+                return
+            navigate_to_anchor(node)
 
     def get_icon(self, menuobj):
         return None
 
     def get_color(self, menuobj):
-        color_int = menuobj['tile_color'].value()  # 0xRRGGBBAA — reads what was actually set
-        r = (color_int >> 24) & 0xFF
-        g = (color_int >> 16) & 0xFF
-        b = (color_int >> 8) & 0xFF
-        color = QtGui.QColor(r, g, b)
-        return (color, color)
+        return _tile_color_qcolors(menuobj)
 
 
 _anchor_navigate_widget = None
@@ -646,13 +988,14 @@ _back_position = None  # (zoom_level, center_xy) tuple or None — session-only
 def select_anchor_and_navigate():
     if not prefs.plugin_enabled:
         return
-    if QtWidgets is None:
+    if _qt_modules() is None:
         return
+    _capture_picker_group()
     labelled_backdrops = [
-        bd for bd in nuke.allNodes('BackdropNode')
+        bd for bd in nuke.allNodes('BackdropNode', group=group_node(_picker_group_path))
         if bd['label'].value().strip()
     ]
-    if not all_anchors() and not labelled_backdrops:
+    if not all_anchors(_picker_group_path) and not labelled_backdrops:
         return
     global _anchor_navigate_widget
     if _anchor_navigate_widget is not None:
@@ -663,9 +1006,48 @@ def select_anchor_and_navigate():
             return
         except RuntimeError:
             _anchor_navigate_widget = None
-    _anchor_navigate_widget = _tabtabtab.TabTabTabWidget(
-        AnchorNavigatePlugin(), winflags=Qt.FramelessWindowHint
-    )
+    _anchor_navigate_widget = _new_picker(AnchorNavigatePlugin())
     _anchor_navigate_widget.under_cursor()
     _anchor_navigate_widget.show()
     _anchor_navigate_widget.raise_()
+
+
+def _prewarm_picker(widget, plugin_class):
+    """Return *widget* brought up to date hidden, or a new hidden picker for *plugin_class*."""
+    if widget is not None:
+        try:
+            widget.prewarm()
+            return widget
+        except RuntimeError:
+            pass  # underlying Qt widget was deleted; build a new one
+    return _new_picker(plugin_class())
+
+
+def prewarm_ui():
+    """Build the anchor pickers and warm up the color dialog without showing them.
+
+    Opt-in via prefs.prewarm_ui_enabled.  Both picker widgets are constructed
+    hidden (or refreshed, if they already exist), so the first A / Alt+A press
+    only has to show them.  One ColorPaletteDialog is built and discarded so
+    the first Create Anchor does not pay Qt's first-use style and font costs.
+    """
+    if not prefs.plugin_enabled or not prefs.prewarm_ui_enabled:
+        return
+    if not nuke.GUI or _qt_modules() is None:
+        return
+    global _anchor_picker_widget, _anchor_navigate_widget
+    _anchor_picker_widget = _prewarm_picker(_anchor_picker_widget, AnchorPlugin)
+    _anchor_navigate_widget = _prewarm_picker(_anchor_navigate_widget, AnchorNavigatePlugin)
+    ColorPaletteDialog = _color_palette_dialog_class()
+    if ColorPaletteDialog is not None:
+        ColorPaletteDialog(custom_colors=prefs.custom_colors).deleteLater()
+
+
+def schedule_prewarm_ui():
+    """Queue prewarm_ui() for when Qt is next idle (after menu.py loads or a script opens)."""
+    if not prefs.prewarm_ui_enabled or not nuke.GUI:
+        return
+    qt_modules = _qt_modules()
+    if qt_modules is None:
+        return
+    qt_modules[0].QTimer.singleShot(0, prewarm_ui)
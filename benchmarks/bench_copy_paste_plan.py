@@ -0,0 +1,108 @@
+"""Benchmark: copy and paste planning over a large synthetic selection.
+
+Times copy_paste_plan.plan_copy() and plan_paste() on synthetic descriptor
+graphs: Reads fed into Grades, anchors, and Link/Local hidden-input Dots.
+Runs outside Nuke; copy_paste_plan.py does not import nuke.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_copy_paste_plan.py [--nodes 100000] [--budget-us 5]
+
+Exits non-zero when the median per-node planning time exceeds the budget.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import copy_paste_plan  # noqa: E402
+from copy_paste_plan import NodeDescriptor  # noqa: E402
+
+
+def make_selection(count, stem='shot'):
+    """Return (selection, graph) with *count* selected nodes in groups of four."""
+    selection = []
+    graph = {}
+    for i in range(count // 4):
+        plate = NodeDescriptor('Anchor_plate%d' % i, 'NoOp', fqnn='%s.Anchor_plate%d' % (stem, i),
+                               is_anchor=True)
+        grade = NodeDescriptor('Grade%d' % i, 'Grade', name='Grade%d' % i,
+                               fqnn='%s.Grade%d' % (stem, i))
+        graph[plate.key] = plate
+        graph[grade.key] = grade
+        read = NodeDescriptor('Read%d' % i, 'Read', fqnn='%s.Read%d' % (stem, i), xpos=i)
+        consumer = NodeDescriptor('Merge%d' % i, 'Merge2', inputs=[read.key])
+        link_dot = NodeDescriptor('DotL%d' % i, 'Dot', hide_input=True, inputs=[plate.key])
+        local_dot = NodeDescriptor('DotP%d' % i, 'Dot', hide_input=True, inputs=[grade.key])
+        selection.extend([read, consumer, link_dot, local_dot])
+    return selection, graph
+
+
+DOT_TYPES = {copy_paste_plan.MAKE_LINK_DOT: 'link', copy_paste_plan.MAKE_LOCAL_DOT: 'local'}
+
+
+def as_pasted(selection, plan):
+    """Return descriptors as paste sees them: copies carrying the knobs the plan stamped."""
+    stamped = {}
+    for step in plan:
+        if step[0] == copy_paste_plan.STAMP:
+            stamped[step[1]] = (step[2], None)
+        elif step[0] in DOT_TYPES:
+            stamped[step[1]] = (step[3], DOT_TYPES[step[0]])
+    pasted = []
+    for node in selection:
+        stored_fqnn, dot_type = stamped.get(node.key, (None, None))
+        pasted.append(NodeDescriptor(
+            node.key + '_1', node.node_class, xpos=node.xpos, ypos=node.ypos,
+            inputs=[key + '_1' for key in node.inputs if key is not None],
+            stored_fqnn=stored_fqnn, dot_type=dot_type,
+        ))
+    return pasted
+
+
+def time_ms(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return (time.perf_counter() - start) * 1000.0, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--nodes', type=int, default=100000)
+    parser.add_argument('--budget-us', type=float, default=5.0)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    selection, graph = make_selection(args.nodes)
+    anchors_by_input = {}
+    sources = {'Read%d_1' % i: graph['Anchor_plate%d' % i] for i in range(args.nodes // 4)}
+    sources.update({'DotL%d_1' % i: graph['Anchor_plate%d' % i] for i in range(args.nodes // 4)})
+    sources.update({'DotP%d_1' % i: graph['Grade%d' % i] for i in range(args.nodes // 4)})
+
+    copy_timings = []
+    paste_timings = []
+    for _ in range(args.repeat):
+        elapsed, plan = time_ms(copy_paste_plan.plan_copy, selection, graph,
+                                anchor_for_input=anchors_by_input.get)
+        copy_timings.append(elapsed)
+        pasted = as_pasted(selection, plan)
+        elapsed, paste_plan = time_ms(copy_paste_plan.plan_paste, pasted, 'shot',
+                                      lambda node: sources.get(node.key), {}.get)
+        paste_timings.append(elapsed)
+
+    copy_ms = statistics.median(copy_timings)
+    paste_ms = statistics.median(paste_timings)
+    per_node_us = (copy_ms + paste_ms) * 1000.0 / len(selection)
+    print('plan_copy:  %8.1f ms, %d steps' % (copy_ms, len(plan)))
+    print('plan_paste: %8.1f ms, %d steps' % (paste_ms, len(paste_plan)))
+    print('per node: %.2f us (budget %.1f us)' % (per_node_us, args.budget_us))
+    return 0 if per_node_us <= args.budget_us else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
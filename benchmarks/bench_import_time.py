@@ -0,0 +1,86 @@
+"""Benchmark: cost of importing menu.py in a headless session.
+
+Each run starts a fresh interpreter with stub nuke/nukescripts modules
+(nuke.GUI = False, as under `nuke -t`), times `import menu`, and records
+which UI modules (PySide, tabtabtab, colors) that import pulled in. Runs
+outside Nuke; the stubs come from tests/stubs.py.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_import_time.py [--repeat 10] [--budget-ms 50]
+
+Exits non-zero when any UI module is imported or the median exceeds the budget.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+UI_MODULES = ('PySide2', 'PySide6', 'tabtabtab', 'colors')
+
+CHILD_SCRIPT = '''
+import importlib.util
+import json
+import sys
+import time
+from unittest.mock import MagicMock
+
+repo_root, ui_modules = sys.argv[1], sys.argv[2].split(',')
+sys.path.insert(0, repo_root)
+spec = importlib.util.spec_from_file_location('_stubs', repo_root + '/tests/stubs.py')
+stubs = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(stubs)
+nuke = stubs.make_stub_nuke_module()
+nuke.GUI = False
+nuke.__getattr__ = lambda name: MagicMock(name='nuke.' + name)  # menu/callback APIs
+sys.modules['nuke'] = nuke
+sys.modules['nukescripts'] = stubs.make_stub_nukescripts_module()
+
+start = time.perf_counter()
+import menu  # noqa: E402,F401
+elapsed_ms = (time.perf_counter() - start) * 1000.0
+loaded = sorted(name for name in sys.modules if name.split('.')[0] in ui_modules)
+print(json.dumps({'ms': elapsed_ms, 'ui_modules': loaded}))
+'''
+
+
+def run_once(home):
+    env = dict(os.environ, HOME=home)  # prefs.py writes ~/.nuke on first import
+    output = subprocess.check_output(
+        [sys.executable, '-c', CHILD_SCRIPT, REPO_ROOT, ','.join(UI_MODULES)],
+        env=env, cwd=home,
+    )
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--budget-ms', type=float, default=50.0)
+    args = parser.parse_args(argv)
+
+    timings = []
+    ui_loaded = set()
+    with tempfile.TemporaryDirectory() as home:
+        for _ in range(args.repeat):
+            result = run_once(home)
+            timings.append(result['ms'])
+            ui_loaded.update(result['ui_modules'])
+
+    median = statistics.median(timings)
+    print('import menu: median %.2f ms, worst %.2f ms over %d runs (budget %.1f ms)' % (
+        median, max(timings), len(timings), args.budget_ms))
+    if ui_loaded:
+        print('UI modules imported at load time: %s' % ', '.join(sorted(ui_loaded)))
+        return 1
+    return 0 if median <= args.budget_ms else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""Benchmark: picker open and per-keystroke latency under an offscreen Qt platform.
+
+Builds a real TabTabTabWidget around a synthetic plugin of each requested
+size, shows it, and types search sequences into its TabyLineEdit with
+QTest.  A keystroke is timed from the key event to the list view having
+repainted with the final results, so it includes background scoring for
+large lists; an open is timed from show() to the first repaint.
+
+Needs PySide6 or PySide2.  QT_QPA_PLATFORM defaults to offscreen, so no
+display is required.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_picker_latency.py [--sizes 100 1000 10000 100000]
+        [--budget-ms 16] [--open-budget-ms 50]
+
+Exits non-zero when the p90 keystroke or the p90 open of any size exceeds its
+budget, and with 2 when no PySide is available.
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORDS = [
+    'plate', 'camera', 'grade', 'blur', 'merge', 'roto', 'matte', 'key', 'bg', 'fg',
+    'cc', 'denoise', 'lens', 'hero', 'sky', 'fx', 'cg', 'beauty', 'spec', 'diffuse',
+]
+SEQUENCES = ['plate', 'hbg', 'cgbeauty', 'grade_key', 'zq']
+
+
+def _load_qt():
+    """Return (QtCore, QtWidgets, QtTest), or None without PySide."""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    try:
+        from PySide6 import QtCore, QtTest, QtWidgets
+    except ImportError:
+        try:
+            from PySide2 import QtCore, QtTest, QtWidgets
+        except ImportError:
+            return None
+    return QtCore, QtWidgets, QtTest
+
+
+def _load_tabtabtab():
+    spec = importlib.util.spec_from_file_location(
+        '_bench_tabtabtab', os.path.join(REPO_ROOT, 'tabtabtab.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_items(count, seed=0):
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        name = '_'.join(rng.choice(WORDS) for _ in range(3)) + str(i)
+        items.append({'menupath': 'Anchors/' + name, 'menuobj': i})
+    return items
+
+
+def make_plugin(tabtabtab, items):
+    """Return a TabTabTabPlugin serving *items*, with no weights file and a fixed token."""
+
+    class SyntheticPlugin(tabtabtab.TabTabTabPlugin):
+        def get_items(self):
+            return items
+
+        def get_weights_file(self):
+            return None
+
+        def get_change_token(self):
+            return len(items)
+
+        def invoke(self, thing):
+            pass
+
+    return SyntheticPlugin()
+
+
+def percentiles(timings):
+    """Return {'p50', 'p90', 'p99', 'max'} of *timings*."""
+    if len(timings) < 2:
+        value = timings[0] if timings else 0.0
+        return {'p50': value, 'p90': value, 'p99': value, 'max': value}
+    cuts = statistics.quantiles(timings, n=100, method='inclusive')
+    return {'p50': cuts[49], 'p90': cuts[89], 'p99': cuts[98], 'max': max(timings)}
+
+
+def _settle(app, widget):
+    """Wait for background scoring, deliver its results, and repaint the list now."""
+    # The model's private pool runs its scoring; results arrive as queued signals.
+    widget.things_model._pool.waitForDone()
+    app.processEvents()
+    widget.things.viewport().repaint()
+
+
+def time_open(app, widget, repeat):
+    """Return open latencies in ms: show() until the first repaint, then hide again."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        widget.show()
+        _settle(app, widget)
+        timings.append((time.perf_counter() - start) * 1000.0)
+        widget.hide()
+        app.processEvents()
+    return timings
+
+
+def time_typing(app, widget, qt_test, sequences, repeat):
+    """Return per-keystroke latencies in ms for typing each of *sequences* from empty."""
+    widget.show()
+    timings = []
+    for _ in range(repeat):
+        for sequence in sequences:
+            widget.input.clear()
+            _settle(app, widget)
+            for char in sequence:
+                start = time.perf_counter()
+                qt_test.QTest.keyClicks(widget.input, char)
+                _settle(app, widget)
+                timings.append((time.perf_counter() - start) * 1000.0)
+    widget.hide()
+    app.processEvents()
+    return timings
+
+
+def _report(label, timings):
+    stats = percentiles(timings)
+    print('  %-10s p50 %7.2f  p90 %7.2f  p99 %7.2f  max %7.2f ms  (n=%d)' % (
+        label, stats['p50'], stats['p90'], stats['p99'], stats['max'], len(timings)))
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000])
+    parser.add_argument('--budget-ms', type=float, default=16.0)
+    parser.add_argument('--open-budget-ms', type=float, default=50.0)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    qt = _load_qt()
+    if qt is None:
+        print('PySide6 or PySide2 is required')
+        return 2
+    _, QtWidgets, QtTest = qt
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    tabtabtab = _load_tabtabtab()
+
+    over_budget = False
+    for size in args.sizes:
+        plugin = make_plugin(tabtabtab, make_items(size))
+        start = time.perf_counter()
+        widget = tabtabtab.TabTabTabWidget(plugin)
+        build_ms = (time.perf_counter() - start) * 1000.0
+        print('%d items: widget built in %.1f ms' % (size, build_ms))
+        opens = _report('open', time_open(app, widget, args.repeat))
+        keys = _report('keystroke', time_typing(app, widget, QtTest, SEQUENCES, args.repeat))
+        if opens['p90'] > args.open_budget_ms or keys['p90'] > args.budget_ms:
+            over_budget = True
+        widget.deleteLater()
+        app.processEvents()
+
+    print('budgets: keystroke p90 %.1f ms, open p90 %.1f ms' % (
+        args.budget_ms, args.open_budget_ms))
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
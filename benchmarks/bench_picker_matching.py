@@ -0,0 +1,95 @@
+"""Benchmark: picker matching and scoring over a large anchor list.
+
+Times SearchIndex.scored_chunks(), which matches and scores in one pass, i.e.
+the per-keystroke work NodeModel.update() does before sorting, over a
+synthetic list of anchors. Runs outside Nuke; Qt is not needed for the measured code.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_picker_matching.py [--anchors 10000] [--budget-ms 5]
+
+Exits non-zero when the median keystroke exceeds the budget.
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORDS = [
+    'plate', 'camera', 'grade', 'blur', 'merge', 'roto', 'matte', 'key', 'bg', 'fg',
+    'cc', 'denoise', 'lens', 'hero', 'sky', 'fx', 'cg', 'beauty', 'spec', 'diffuse',
+]
+NEEDLES = ['p', 'pl', 'pla', 'plat', 'plate', 'pg', 'hbg', 'cgbeauty', 'zq', 'kf']
+
+
+def _load_tabtabtab():
+    """Load tabtabtab.py, falling back to the test suite's Qt stubs without PySide."""
+    try:
+        import PySide6  # noqa: F401
+    except ImportError:
+        try:
+            import PySide2  # noqa: F401
+        except ImportError:
+            sys.path.insert(0, REPO_ROOT)
+            import tests  # noqa: F401 — installs PySide6 stubs
+    spec = importlib.util.spec_from_file_location(
+        '_bench_tabtabtab', os.path.join(REPO_ROOT, 'tabtabtab.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_items(count, seed=0):
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        name = '_'.join(rng.choice(WORDS) for _ in range(3)) + str(i)
+        items.append({'menupath': 'Anchors/' + name, 'menuobj': i})
+    return items
+
+
+def time_keystroke(index, needle):
+    start = time.perf_counter()
+    matched = sum(len(chunk) for chunk in index.scored_chunks(needle))
+    return (time.perf_counter() - start) * 1000.0, matched
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--anchors', type=int, default=10000)
+    parser.add_argument('--budget-ms', type=float, default=5.0)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    tabtabtab = _load_tabtabtab()
+    items = make_items(args.anchors)
+    start = time.perf_counter()
+    index = tabtabtab.SearchIndex(items)
+    build_ms = (time.perf_counter() - start) * 1000.0
+    print('index build: %.1f ms for %d items' % (build_ms, len(items)))
+
+    medians = []
+    for needle in NEEDLES:
+        timings = []
+        for _ in range(args.repeat):
+            elapsed, matched = time_keystroke(index, needle)
+            timings.append(elapsed)
+        median = statistics.median(timings)
+        medians.append(median)
+        print('%-10r %6d matches  %7.2f ms' % (needle, matched, median))
+
+    worst = max(medians)
+    overall = statistics.median(medians)
+    print('median keystroke: %.2f ms, worst: %.2f ms (budget %.1f ms)' % (
+        overall, worst, args.budget_ms))
+    return 0 if overall <= args.budget_ms else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
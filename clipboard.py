@@ -0,0 +1,121 @@
+"""Clipboard sidecar: what copy_hidden() knew about the references it stored.
+
+Nuke's clipboard only carries the copied nodes, so cross-script paste used to
+work out intent from the stored FQNN strings alone.  copy_hidden() now also
+writes a compact JSON sidecar to CLIPBOARD_SIDECAR_PATH, keyed by the stored
+FQNNs, recording for each reference the anchor display name (None for a plain
+node), its tile color, the upstream file path and the dot type of the Dots
+that store it.  paste_hidden() reads it back and looks each pasted node's
+reference up by its stored FQNN.
+
+Each copy overwrites the sidecar, but the clipboard can also be filled by a
+plain Nuke copy or another session.  The sidecar therefore lists every stored
+FQNN the copy left on its nodes, and is only used when the pasted nodes carry
+exactly those, all from its source script (see matching_references()).
+"""
+
+import contextlib
+import json
+import os
+
+from constants import CLIPBOARD_SIDECAR_PATH
+
+SIDECAR_VERSION = 1
+
+# Read at call time so tests can point it elsewhere
+SIDECAR_PATH = CLIPBOARD_SIDECAR_PATH
+
+
+def describe_reference(node, dot_type=None):
+    """Return the sidecar entry for the node a stored FQNN names.
+
+    *dot_type* is 'link' or 'local' when the FQNN is stored on hidden-input Dots.
+    """
+    from anchor import anchor_display_name
+    from link import is_anchor
+
+    knobs = node.knobs()
+    file_node = node if 'file' in knobs else node.input(0)
+    if file_node is not None and 'file' in file_node.knobs():
+        file_path = file_node['file'].value()
+    else:
+        file_path = ''
+    return {
+        'anchor': anchor_display_name(node) if is_anchor(node) else None,
+        'color': int(knobs['tile_color'].value()) if 'tile_color' in knobs else 0,
+        'file': file_path,
+        'dot_type': dot_type,
+    }
+
+
+def build_sidecar(source_stem, references, stored_fqnns):
+    """Return the sidecar dict for one copy.
+
+    *references* maps each stored FQNN the copy planned to (node, dot type);
+    *stored_fqnns* are the stored FQNNs on all copied nodes, links included.
+
+    Shape::
+
+        {
+            'version': 1,
+            'source_stem': <script stem>,
+            'stored_fqnns': [<stored FQNN>, ...],
+            'references': {<stored FQNN>: {'anchor': <display name or None>,
+                                           'color': <tile color>, 'file': <path>,
+                                           'dot_type': <'link', 'local' or None>}, ...},
+        }
+    """
+    return {
+        'version': SIDECAR_VERSION,
+        'source_stem': source_stem,
+        'stored_fqnns': sorted(set(stored_fqnns)),
+        'references': {
+            fqnn: describe_reference(node, dot_type)
+            for fqnn, (node, dot_type) in references.items()
+        },
+    }
+
+
+def write_sidecar(sidecar):
+    """Store *sidecar* as compact JSON; a failed write only costs the extra paste info."""
+    with contextlib.suppress(OSError):
+        os.makedirs(os.path.dirname(SIDECAR_PATH), exist_ok=True)
+        with open(SIDECAR_PATH, 'w') as file_handle:
+            json.dump(sidecar, file_handle, separators=(',', ':'))
+
+
+def read_sidecar():
+    """Return the sidecar dict, or None.
+
+    Returns None when the file is missing, unparsable, or written by an
+    unknown sidecar version — paste then falls back to the stored FQNNs alone.
+    """
+    try:
+        with open(SIDECAR_PATH) as file_handle:
+            sidecar = json.load(file_handle)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(sidecar, dict) or sidecar.get('version') != SIDECAR_VERSION:
+        return None
+    if (not isinstance(sidecar.get('references'), dict)
+            or not isinstance(sidecar.get('stored_fqnns'), list)):
+        return None
+    return sidecar
+
+
+def matching_references(sidecar, stored_fqnns):
+    """Return the sidecar's references if it describes the pasted nodes, else None.
+
+    *stored_fqnns* are the non-empty stored FQNNs on the pasted nodes.  They
+    must be exactly the ones the sidecar's copy stored, all from its source
+    script; otherwise the clipboard came from some other copy.
+    """
+    if sidecar is None:
+        return None
+    stored_fqnns = set(stored_fqnns)
+    if not stored_fqnns or stored_fqnns != set(sidecar['stored_fqnns']):
+        return None
+    source_stem = sidecar.get('source_stem')
+    if any(fqnn.split('.')[0] != source_stem for fqnn in stored_fqnns):
+        return None
+    return sidecar['references']
@@ -1,7 +1,16 @@
 """Color palette dialog for the anchor color system."""
 
+import bisect
+
 import nuke
 
+from constants import BACKDROP_COLOR_MERGE_DISTANCE
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 try:
     if hasattr(nuke, 'NUKE_VERSION_MAJOR') and nuke.NUKE_VERSION_MAJOR >= 16:
         from PySide6 import QtCore, QtGui, QtWidgets
@@ -36,24 +45,99 @@ def _get_nuke_pref_colors():
     return colors
 
 
+# (script name, raw backdrop colors) -> clustered colors, for the last script seen
+_backdrop_color_cache = None
+
+
 def _get_script_backdrop_colors():
-    """Return list of unique backdrop tile_color ints from the current script.
+    """Return representative backdrop tile_color ints from the current script.
 
-    Returns an empty list when called outside a Nuke session.
+    Near-identical shades are merged by _cluster_colors() so large comps do not
+    flood the palette.  The result is cached per script and recomputed only when
+    the set of backdrop colors changes.  Returns an empty list when called
+    outside a Nuke session.
     """
-    seen = set()
-    colors = []
-    for backdrop_node in nuke.allNodes('BackdropNode'):
-        color = backdrop_node['tile_color'].value()
-        if color and color not in seen:
-            seen.add(color)
-            colors.append(color)
-    return colors
+    global _backdrop_color_cache
+    raw_colors = tuple(
+        color for color in (
+            backdrop_node['tile_color'].value() for backdrop_node in nuke.allNodes('BackdropNode')
+        )
+        if color
+    )
+    cache_key = (nuke.root().name(), raw_colors)
+    if _backdrop_color_cache is None or _backdrop_color_cache[0] != cache_key:
+        _backdrop_color_cache = (cache_key, _cluster_colors(raw_colors))
+    return list(_backdrop_color_cache[1])
+
+
+def _srgb_to_lab(red, green, blue):
+    """Convert 8-bit sRGB to CIE L*a*b* (D65).
+
+    Euclidean distance in L*a*b* approximates perceived color difference.
+    """
+    linear = []
+    for channel in (red, green, blue):
+        value = channel / 255.0
+        linear.append(value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4)
+    lin_r, lin_g, lin_b = linear
+    x = (0.4124 * lin_r + 0.3576 * lin_g + 0.1805 * lin_b) / 0.95047
+    y = 0.2126 * lin_r + 0.7152 * lin_g + 0.0722 * lin_b
+    z = (0.0193 * lin_r + 0.1192 * lin_g + 0.9505 * lin_b) / 1.08883
 
+    def _f(t):
+        return t ** (1.0 / 3.0) if t > 0.008856 else 7.787 * t + 16.0 / 116.0
+
+    f_x, f_y, f_z = _f(x), _f(y), _f(z)
+    return 116.0 * f_y - 16.0, 500.0 * (f_x - f_y), 200.0 * (f_y - f_z)
+
+
+def _cluster_colors(colors, threshold=BACKDROP_COLOR_MERGE_DISTANCE):
+    """Collapse perceptually near-identical colors to representative swatches.
+
+    Greedy leader clustering in L*a*b*: unique colors are visited most-used
+    first, and each color not yet absorbed becomes a representative that absorbs
+    every remaining color within *threshold* (CIE76 delta E).  Representatives
+    are returned in order of first appearance in *colors*, so the palette keeps
+    the script's ordering.  Alpha is ignored, as the swatches ignore it.
+
+    The distance pass is vectorized with NumPy when it is installed.
+
+    >>> _cluster_colors([0xFF0000FF, 0x00FF00FF, 0xFE0101FF, 0xFF0000FF])
+    [4278190335, 16711935]
+    """
+    counts = {}
+    for color in colors:
+        counts[color] = counts.get(color, 0) + 1
+    unique_colors = list(counts)  # first-appearance order
+    if len(unique_colors) < 2:
+        return unique_colors
+    by_usage = sorted(range(len(unique_colors)), key=lambda i: -counts[unique_colors[i]])
+    labs = [_srgb_to_lab(*_color_int_to_rgb(unique_colors[i])) for i in by_usage]
+
+    leaders = []
+    if numpy is not None:
+        lab_array = numpy.array(labs)
+        unassigned = numpy.ones(len(labs), dtype=bool)
+        limit = threshold * threshold
+        for position in range(len(labs)):
+            if not unassigned[position]:
+                continue
+            leaders.append(by_usage[position])
+            deltas = lab_array - lab_array[position]
+            unassigned &= numpy.einsum('ij,ij->i', deltas, deltas) > limit
+    else:
+        leader_labs = []
+        limit = threshold * threshold
+        for position, lab in enumerate(labs):
+            if all(
+                (lab[0] - other[0]) ** 2 + (lab[1] - other[1]) ** 2 + (lab[2] - other[2]) ** 2
+                > limit
+                for other in leader_labs
+            ):
+                leader_labs.append(lab)
+                leaders.append(by_usage[position])
+    return [unique_colors[i] for i in sorted(leaders)]
 
-# ---------------------------------------------------------------------------
-# Qt color palette dialog — only defined when Qt is available
-# ---------------------------------------------------------------------------
 
 def _color_int_to_rgb(color_int):
     """Unpack a 0xRRGGBBAA int into (r, g, b) tuple."""
@@ -63,15 +147,246 @@ def _color_int_to_rgb(color_int):
     return red, green, blue
 
 
+# ---------------------------------------------------------------------------
+# Swatch grid geometry — plain Python so it can be tested without Qt
+# ---------------------------------------------------------------------------
+
+# Column addresses: 1-9, 0 (10 columns max)
+_COLUMN_KEYS = '1234567890'
+# Row addresses: a-z (26 rows max)
+_ROW_KEYS = 'abcdefghijklmnopqrstuvwxyz'
+_SWATCHES_PER_ROW = 8
+_SWATCH_SIZE = 24
+_SWATCH_SPACING = 2
+_GROUP_HEADER_HEIGHT = 18
+_MAX_VISIBLE_GRID_HEIGHT = 480
+
+
+def _hint_label(group_col, logical_row):
+    """Return the hint-mode address of a swatch, letter (row) first: "a1", "b2".
+
+    Letter-first matches the two-keypress navigation order: letter (row) then
+    number (column).  Rows or columns beyond the key ranges show '?'.
+    """
+    row_label = _ROW_KEYS[logical_row] if logical_row < len(_ROW_KEYS) else '?'
+    col_label = _COLUMN_KEYS[group_col] if group_col < len(_COLUMN_KEYS) else '?'
+    return f"{row_label}{col_label}"
+
+
+def _swatch_border_style(color_int, logical_row, selected_color, hint_row, hovered):
+    """Return (role, width) for a swatch border.
+
+    role is 'selected' (palette Highlight), 'hint' (the row picked by a hint
+    letter), 'hover' or 'default'.  Uses `is not None` for the selected color so
+    that color int 0 (black) is recognised — `if not selected_color` would treat
+    it as unselected.
+    """
+    if selected_color is not None and color_int == selected_color:
+        return 'selected', 2
+    if hint_row is not None and logical_row == hint_row:
+        return 'hint', 2
+    if hovered:
+        return 'hover', 1
+    return 'default', 1
+
+
+class _SwatchLayout:
+    """Positions of the color palette's group headers and swatches.
+
+    Groups are stacked top to bottom, each under a header, wrapping at
+    _SWATCHES_PER_ROW.  Every swatch gets a (group_col, logical_row) hint
+    address; logical rows count swatch rows only, so hint letters start at 'a'
+    for the first swatch row regardless of how many headers sit above it.
+    Cells are kept in paint order, so their tops never decrease and the cells
+    overlapping a vertical band are found by bisection.
+
+    Parameters
+    ----------
+    groups : list of (str, list of int)
+        (header label, 0xRRGGBBAA colors) pairs.  Empty groups are not shown.
+        The first group is the one append_color() grows.
+    """
+
+    def __init__(self, groups, columns=_SWATCHES_PER_ROW):
+        self._groups = [(label, list(colors)) for label, colors in groups]
+        self.columns = columns
+        self._relayout()
+
+    def _relayout(self):
+        pitch = _SWATCH_SIZE + _SWATCH_SPACING
+        self.headers = []  # (label, top)
+        self.cells = []  # (group_col, logical_row, color_int, left, top)
+        self._cell_tops = []
+        self._cell_by_address = {}
+        top = 0
+        logical_row = 0
+        for label, colors in self._groups:
+            if not colors:
+                continue
+            self.headers.append((label, top))
+            top += _GROUP_HEADER_HEIGHT
+            for offset, color_int in enumerate(colors):
+                group_col = offset % self.columns
+                group_row = offset // self.columns
+                cell_top = top + group_row * pitch
+                address = (group_col, logical_row + group_row)
+                self._cell_by_address[address] = len(self.cells)
+                self.cells.append((group_col, address[1], color_int, group_col * pitch, cell_top))
+                self._cell_tops.append(cell_top)
+            group_rows = (len(colors) + self.columns - 1) // self.columns
+            logical_row += group_rows
+            top += group_rows * pitch
+        self.width = self.columns * pitch - _SWATCH_SPACING
+        self.height = top
+
+    def append_color(self, color_int):
+        """Add *color_int* to the end of the first group and recompute positions."""
+        self._groups[0][1].append(color_int)
+        self._relayout()
+
+    def color_at(self, group_col, logical_row):
+        """Return the color at a hint address, or None if no swatch is there."""
+        index = self._cell_by_address.get((group_col, logical_row))
+        return None if index is None else self.cells[index][2]
+
+    def row_top(self, logical_row):
+        """Return the y coordinate of a logical row, or None if it does not exist."""
+        index = self._cell_by_address.get((0, logical_row))
+        return None if index is None else self.cells[index][4]
+
+    def indices_between(self, top, bottom):
+        """Return the range of cell indices whose swatches overlap rows [top, bottom)."""
+        first = bisect.bisect_right(self._cell_tops, top - _SWATCH_SIZE)
+        last = bisect.bisect_left(self._cell_tops, bottom)
+        return range(first, last)
+
+    def index_at(self, x, y):
+        """Return the index of the swatch under (x, y), or None for gaps and headers."""
+        for index in self.indices_between(y, y + 1):
+            _group_col, _logical_row, _color_int, left, cell_top = self.cells[index]
+            if left <= x < left + _SWATCH_SIZE and cell_top <= y < cell_top + _SWATCH_SIZE:
+                return index
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Qt color palette dialog — only defined when Qt is available
+# ---------------------------------------------------------------------------
+
 if QtWidgets is None:
     ColorPaletteDialog = None
     PrefsDialog = None
 else:
-    # Column addresses: 1-9, 0 (10 columns max)
-    _COLUMN_KEYS = '1234567890'
-    # Row addresses: a-z (26 rows max)
-    _ROW_KEYS = 'abcdefghijklmnopqrstuvwxyz'
-    _SWATCHES_PER_ROW = 8
+    class _SwatchGrid(QtWidgets.QWidget):
+        """One custom-painted widget holding every swatch of a ColorPaletteDialog.
+
+        Paints group headers, swatches, selection/hint/hover borders and hint
+        addresses directly with QPainter, only for the swatches inside the exposed
+        rect.  Clicks are hit-tested against the _SwatchLayout, so no per-swatch
+        widgets or stylesheets are created.
+        """
+
+        # 0xRRGGBBAA values overflow a C++ int, so the color travels as a Python object.
+        swatch_clicked = QtCore.Signal(object)
+
+        def __init__(self, swatch_layout, parent=None):
+            super().__init__(parent)
+            self._swatch_layout = swatch_layout
+            self.selected_color = None
+            self.hint_mode = False
+            self.hint_row = None
+            self._hover_index = None
+            self.setMouseTracking(True)
+            self.setFocusPolicy(Qt.NoFocus)
+            self.setFixedSize(swatch_layout.width, swatch_layout.height)
+
+        def set_selected_color(self, color_int):
+            self.selected_color = color_int
+            self.update()
+
+        def set_hint_state(self, hint_mode, hint_row):
+            self.hint_mode = hint_mode
+            self.hint_row = hint_row
+            self.update()
+
+        def append_color(self, color_int):
+            self._swatch_layout.append_color(color_int)
+            self.setFixedSize(self._swatch_layout.width, self._swatch_layout.height)
+            self.update()
+
+        def color_at(self, group_col, logical_row):
+            return self._swatch_layout.color_at(group_col, logical_row)
+
+        def row_top(self, logical_row):
+            return self._swatch_layout.row_top(logical_row)
+
+        def mouseMoveEvent(self, event):
+            position = event.pos()
+            index = self._swatch_layout.index_at(position.x(), position.y())
+            if index != self._hover_index:
+                self._hover_index = index
+                self.update()
+            super().mouseMoveEvent(event)
+
+        def leaveEvent(self, event):
+            if self._hover_index is not None:
+                self._hover_index = None
+                self.update()
+            super().leaveEvent(event)
+
+        def mouseReleaseEvent(self, event):
+            if event.button() != Qt.LeftButton:
+                super().mouseReleaseEvent(event)
+                return
+            position = event.pos()
+            index = self._swatch_layout.index_at(position.x(), position.y())
+            if index is not None:
+                self.swatch_clicked.emit(self._swatch_layout.cells[index][2])
+            event.accept()
+
+        def paintEvent(self, event):
+            exposed = event.rect()
+            top = exposed.top()
+            bottom = exposed.bottom() + 1
+            swatch_layout = self._swatch_layout
+            widget_palette = self.palette()
+            border_colors = {
+                'selected': widget_palette.color(QtGui.QPalette.Highlight),
+                'hint': QtGui.QColor('yellow'),
+                'hover': widget_palette.color(QtGui.QPalette.Light),
+                'default': QtGui.QColor('#555555'),
+            }
+
+            painter = QtGui.QPainter(self)
+            painter.setRenderHint(QtGui.QPainter.Antialiasing)
+            painter.setPen(widget_palette.color(QtGui.QPalette.WindowText))
+            for label, header_top in swatch_layout.headers:
+                if header_top < bottom and header_top + _GROUP_HEADER_HEIGHT > top:
+                    painter.drawText(
+                        QtCore.QRect(0, header_top, swatch_layout.width, _GROUP_HEADER_HEIGHT),
+                        int(Qt.AlignLeft | Qt.AlignVCenter),
+                        label,
+                    )
+
+            for index in swatch_layout.indices_between(top, bottom):
+                group_col, logical_row, color_int, left, cell_top = swatch_layout.cells[index]
+                role, width = _swatch_border_style(
+                    color_int, logical_row, self.selected_color, self.hint_row,
+                    index == self._hover_index,
+                )
+                red, green, blue = _color_int_to_rgb(color_int)
+                inset = width / 2.0
+                swatch_rect = QtCore.QRectF(left, cell_top, _SWATCH_SIZE, _SWATCH_SIZE)
+                painter.setPen(QtGui.QPen(border_colors[role], width))
+                painter.setBrush(QtGui.QColor(red, green, blue))
+                painter.drawRoundedRect(swatch_rect.adjusted(inset, inset, -inset, -inset), 2, 2)
+                if self.hint_mode:
+                    luma = 0.299 * red + 0.587 * green + 0.114 * blue
+                    painter.setPen(QtGui.QColor('black' if luma > 128 else 'white'))
+                    painter.drawText(
+                        swatch_rect, int(Qt.AlignCenter), _hint_label(group_col, logical_row)
+                    )
+            painter.end()
 
     class ColorPaletteDialog(QtWidgets.QDialog):
         """Color palette dialog showing swatches from Nuke prefs, backdrop colors, and user palette.
@@ -98,7 +413,6 @@ else:
             self._selected_color = initial_color
             self._hint_mode = False
             self._hint_row = None  # stores logical row index after letter keypress
-            self._swatch_cells = []  # list of (group_col, logical_row, color_int, button)
             self.chosen_name = initial_name
             self._custom_colors = custom_colors if custom_colors is not None else []
             # Dialog-local working copy for staging newly added custom colors.
@@ -106,9 +420,6 @@ else:
             # On reject, staged colors are discarded (never written to prefs).
             self._staged_custom_colors = list(self._custom_colors)
 
-            # Map from (col_index, row_index) to button for hint navigation
-            self._cell_map = {}
-
             self._build_ui(show_name_field, initial_name)
 
         def _build_ui(self, show_name_field, initial_name):
@@ -122,110 +433,30 @@ else:
                 self._name_edit = QtWidgets.QLineEdit(initial_name)
                 outer_layout.addWidget(self._name_edit)
 
-            # Swatch grid
-            grid_widget = QtWidgets.QWidget()
-            self._grid_layout = QtWidgets.QGridLayout()
-            self._grid_layout.setSpacing(2)
-            grid_widget.setLayout(self._grid_layout)
-            outer_layout.addWidget(grid_widget)
-
-            # Collect all color sources
-            nuke_pref_colors = _get_nuke_pref_colors()
-            backdrop_colors = _get_script_backdrop_colors()
-            user_palette_colors = self._custom_colors
-
+            # Swatch grid — a single painted widget, scrolled when it grows tall.
             # Order: custom colors first, then backdrop colors, then Nuke defaults.
-            # This matches PICKER-04: user's own colors appear at the top.
-            # Each group is paired with a human-readable label shown above its swatches.
-            _GROUP_LABELS = {
-                id(user_palette_colors): "Custom Colors",
-                id(backdrop_colors): "Backdrop Colors",
-                id(nuke_pref_colors): "Nuke Defaults",
-            }
-            all_color_groups = [
-                group for group in [user_palette_colors, backdrop_colors, nuke_pref_colors]
-                if group
-            ]
-
-            grid_row = 0
-            # logical_row counts only rows of swatches, ignoring section-label rows.
-            # This ensures hint-mode row letters always start at 'a' for the first
-            # swatch row regardless of how many label rows appear above it.
-            logical_row = 0
-
-            # Initialise the custom colors next-slot tracker.  If
-            # user_palette_colors is non-empty, it will be the first group in
-            # all_color_groups and we update these counters after that group.
-            # If user_palette_colors is empty (filtered out by `if group`), we
-            # pre-set them to (0, 0) so dynamically appended swatches start at
-            # the top of the grid — before all other groups.
-            self._custom_group_next_col = 0
-            self._custom_group_next_row = 0
-            self._custom_group_next_logical_row = 0
-            custom_group_tracker_set = False
-
-            for color_group in all_color_groups:
-                # Section label spanning all swatch columns
-                group_label_text = _GROUP_LABELS.get(id(color_group), "")
-                if group_label_text:
-                    section_label = QtWidgets.QLabel(group_label_text)
-                    section_label.setFocusPolicy(Qt.NoFocus)
-                    self._grid_layout.addWidget(
-                        section_label, grid_row, 0, 1, _SWATCHES_PER_ROW
-                    )
-                    grid_row += 1
-                    # logical_row does NOT increment for label rows
-
-                group_col = 0
-                for color_int in color_group:
-                    button = QtWidgets.QPushButton()
-                    button.setFixedSize(24, 24)
-                    button.setFocusPolicy(Qt.NoFocus)
-                    # Prevent button from intercepting Enter key — dialog-level
-                    # keyPressEvent handles Enter to confirm swatch selection.
-                    button.setAutoDefault(False)
-
-                    red, green, blue = _color_int_to_rgb(color_int)
-                    button.setStyleSheet(
-                        f"background-color: rgb({red},{green},{blue}); "
-                        "border: 1px solid #555; "
-                        "border-radius: 2px;"
-                    )
-
-                    # Pre-highlight is applied after all groups are built via
-                    # _refresh_swatch_borders(), which uses the palette Highlight
-                    # color.  The initial stylesheet here is the default (no
-                    # selection) — _refresh_swatch_borders() corrects it at the
-                    # end of _build_ui.
-
-                    color_to_capture = color_int
-                    button.clicked.connect(
-                        lambda checked=False, c=color_to_capture: self._on_swatch_clicked(c)
-                    )
-
-                    self._grid_layout.addWidget(button, grid_row, group_col)
-                    cell = (group_col, logical_row, color_int, button)
-                    self._swatch_cells.append(cell)
-                    self._cell_map[(group_col, logical_row)] = (color_int, button)
-
-                    group_col += 1
-                    if group_col >= _SWATCHES_PER_ROW:
-                        group_col = 0
-                        grid_row += 1
-                        logical_row += 1
-
-                if not custom_group_tracker_set and color_group is user_palette_colors:
-                    # Record the next available slot in the custom colors group
-                    # for dynamic swatch appending via _append_swatch_to_custom_group.
-                    self._custom_group_next_col = group_col
-                    self._custom_group_next_row = grid_row
-                    self._custom_group_next_logical_row = logical_row
-                    custom_group_tracker_set = True
-
-                # Move to next group row (creates a blank-row gap between groups)
-                if group_col > 0:
-                    grid_row += 1
-                    logical_row += 1
+            # This matches PICKER-04: user's own colors appear at the top.  Custom
+            # colors stay first even when empty so "Custom Color..." additions
+            # appear at the top of the grid, before all other groups.
+            swatch_layout = _SwatchLayout([
+                ("Custom Colors", self._custom_colors),
+                ("Backdrop Colors", _get_script_backdrop_colors()),
+                ("Nuke Defaults", _get_nuke_pref_colors()),
+            ])
+            self._swatch_grid = _SwatchGrid(swatch_layout)
+            self._swatch_grid.swatch_clicked.connect(self._on_swatch_clicked)
+
+            self._swatch_scroll_area = QtWidgets.QScrollArea()
+            self._swatch_scroll_area.setFocusPolicy(Qt.NoFocus)
+            self._swatch_scroll_area.setFrameShape(QtWidgets.QFrame.NoFrame)
+            self._swatch_scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+            self._swatch_scroll_area.setWidget(self._swatch_grid)
+            scroll_bar_width = self._swatch_scroll_area.verticalScrollBar().sizeHint().width()
+            self._swatch_scroll_area.setMinimumWidth(swatch_layout.width + scroll_bar_width)
+            self._swatch_scroll_area.setMinimumHeight(
+                min(swatch_layout.height, _MAX_VISIBLE_GRID_HEIGHT)
+            )
+            outer_layout.addWidget(self._swatch_scroll_area)
 
             # "Custom Color..." button — opens nuke.getColor(), stages result
             custom_button = QtWidgets.QPushButton("Custom Color...")
@@ -251,8 +482,7 @@ else:
             ok_cancel_layout.addWidget(cancel_button)  # Cancel on right
             outer_layout.addLayout(ok_cancel_layout)
 
-            # Apply pre-highlight using palette Highlight color now that all
-            # swatch cells are populated and the widget has a palette context.
+            # Apply the pre-highlight for initial_color.
             self._refresh_swatch_borders()
 
         def _on_swatch_clicked(self, color_int):
@@ -260,38 +490,9 @@ else:
             self._refresh_swatch_borders()
             self.accept()
 
-        def _highlight_color_name(self):
-            """Return the CSS color name to use for the selected swatch border.
-
-            Uses the widget's QPalette Highlight color so the selection indicator
-            matches the user's Qt theme, rather than a hardcoded white.
-            """
-            highlight_qcolor = self.palette().color(QtGui.QPalette.Highlight)
-            return highlight_qcolor.name()
-
         def _refresh_swatch_borders(self):
-            """Re-apply swatch border stylesheets: palette Highlight border for selected,
-            default for others.
-
-            Uses `is not None` comparison for the selected color so that color
-            int 0 (black) is recognised correctly — `if not self._selected_color`
-            would incorrectly treat 0 as unselected.
-            """
-            highlight_color = self._highlight_color_name()
-            for _group_col, _logical_row, color_int, button in self._swatch_cells:
-                red, green, blue = _color_int_to_rgb(color_int)
-                if self._selected_color is not None and color_int == self._selected_color:
-                    button.setStyleSheet(
-                        f"background-color: rgb({red},{green},{blue}); "
-                        f"border: 2px solid {highlight_color}; "
-                        "border-radius: 2px;"
-                    )
-                else:
-                    button.setStyleSheet(
-                        f"background-color: rgb({red},{green},{blue}); "
-                        "border: 1px solid #555; "
-                        "border-radius: 2px;"
-                    )
+            """Repaint the swatch grid so the selected color gets the palette Highlight border."""
+            self._swatch_grid.set_selected_color(self._selected_color)
 
         def _on_custom_color_clicked(self):
             result = nuke.getColor()
@@ -365,9 +566,8 @@ else:
                     return True
                 if key_text in _COLUMN_KEYS and self._hint_row is not None:
                     col_index = _COLUMN_KEYS.index(key_text)
-                    target_cell = self._cell_map.get((col_index, self._hint_row))
-                    if target_cell is not None:
-                        color_int, button = target_cell
+                    color_int = self._swatch_grid.color_at(col_index, self._hint_row)
+                    if color_int is not None:
                         self._selected_color = color_int
                         if self._name_edit is not None:
                             self.chosen_name = self._name_edit.text()
@@ -414,9 +614,8 @@ else:
                 # Second keypress: number selects the column and confirms
                 if key_text in _COLUMN_KEYS and self._hint_row is not None:
                     col_index = _COLUMN_KEYS.index(key_text)
-                    target_cell = self._cell_map.get((col_index, self._hint_row))
-                    if target_cell is not None:
-                        color_int, button = target_cell
+                    color_int = self._swatch_grid.color_at(col_index, self._hint_row)
+                    if color_int is not None:
                         self._selected_color = color_int
                         if self._name_edit is not None:
                             self.chosen_name = self._name_edit.text()
@@ -431,98 +630,23 @@ else:
             super().keyPressEvent(event)
 
         def _update_hint_overlays(self):
-            """Show or hide row/column address labels on swatches in hint mode.
-
-            Display format is "{row_letter}{col_number}" e.g. "a1", "a2", "b1".
-            Letter-first matches the two-keypress navigation order: letter (row)
-            then number (column).
-            """
-            for group_col, logical_row, _color_int, button in self._swatch_cells:
-                if self._hint_mode:
-                    row_label = _ROW_KEYS[logical_row] if logical_row < len(_ROW_KEYS) else '?'
-                    col_label = _COLUMN_KEYS[group_col] if group_col < len(_COLUMN_KEYS) else '?'
-                    button.setText(f"{row_label}{col_label}")  # letter-number: "a1", "b2"
-                else:
-                    button.setText("")
-
-        def _highlight_hint_column(self, column_index):
-            """Highlight swatches in the given column when column key pressed in hint mode."""
-            for group_col, _logical_row, color_int, button in self._swatch_cells:
-                red, green, blue = _color_int_to_rgb(color_int)
-                if group_col == column_index:
-                    button.setStyleSheet(
-                        f"background-color: rgb({red},{green},{blue}); "
-                        "border: 2px solid yellow; "
-                        "border-radius: 2px;"
-                    )
-                else:
-                    button.setStyleSheet(
-                        f"background-color: rgb({red},{green},{blue}); "
-                        "border: 1px solid #555; "
-                        "border-radius: 2px;"
-                    )
+            """Show or hide the painted row/column addresses (see _hint_label) on the swatches."""
+            self._swatch_grid.set_hint_state(self._hint_mode, self._hint_row)
 
         def _highlight_hint_row(self, row_index):
             """Highlight swatches in the given logical row when row letter pressed in hint mode."""
-            for _group_col, logical_row, color_int, button in self._swatch_cells:
-                red, green, blue = _color_int_to_rgb(color_int)
-                if logical_row == row_index:
-                    button.setStyleSheet(
-                        f"background-color: rgb({red},{green},{blue}); "
-                        "border: 2px solid yellow; "
-                        "border-radius: 2px;"
-                    )
-                else:
-                    button.setStyleSheet(
-                        f"background-color: rgb({red},{green},{blue}); "
-                        "border: 1px solid #555; "
-                        "border-radius: 2px;"
-                    )
+            self._swatch_grid.set_hint_state(self._hint_mode, row_index)
+            row_top = self._swatch_grid.row_top(row_index)
+            if row_top is not None:
+                self._swatch_scroll_area.ensureVisible(0, row_top, 0, _SWATCH_SIZE)
 
         def _append_swatch_to_custom_group(self, color_int):
-            """Add a new swatch button to the custom colors group at the next available slot.
+            """Add a new swatch to the end of the custom colors group.
 
-            Called by _on_custom_color_clicked to dynamically grow the custom
-            colors section of the grid without rebuilding the entire dialog.
-            Updates self._swatch_cells and self._cell_map so hint mode keeps
-            working correctly.
+            Called by _on_custom_color_clicked to grow the custom colors section
+            of the grid without rebuilding the dialog; hint addresses follow.
             """
-            button = QtWidgets.QPushButton()
-            button.setFixedSize(24, 24)
-            button.setFocusPolicy(Qt.NoFocus)
-            button.setAutoDefault(False)
-
-            red, green, blue = _color_int_to_rgb(color_int)
-            button.setStyleSheet(
-                f"background-color: rgb({red},{green},{blue}); "
-                "border: 1px solid #555; "
-                "border-radius: 2px;"
-            )
-
-            color_to_capture = color_int
-            button.clicked.connect(
-                lambda checked=False, c=color_to_capture: self._on_swatch_clicked(c)
-            )
-
-            self._grid_layout.addWidget(
-                button,
-                self._custom_group_next_row,
-                self._custom_group_next_col,
-            )
-            cell = (
-                self._custom_group_next_col, self._custom_group_next_logical_row, color_int, button
-            )
-            self._swatch_cells.append(cell)
-            self._cell_map[(self._custom_group_next_col, self._custom_group_next_logical_row)] = (
-                color_int, button
-            )
-
-            # Advance column counter; wrap to the next row at _SWATCHES_PER_ROW
-            self._custom_group_next_col += 1
-            if self._custom_group_next_col >= _SWATCHES_PER_ROW:
-                self._custom_group_next_col = 0
-                self._custom_group_next_row += 1
-                self._custom_group_next_logical_row += 1
+            self._swatch_grid.append_color(color_int)
 
         def chosen_custom_colors(self):
             """Return a copy of the staged custom colors list.
@@ -551,6 +675,10 @@ else:
             # Seed local working copies — never mutate prefs module vars until accept
             self._local_plugin_enabled = prefs_module.plugin_enabled
             self._local_link_mode = prefs_module.link_classes_paste_mode
+            self._local_anchor_manifest_enabled = prefs_module.anchor_manifest_enabled
+            self._local_prewarm_ui_enabled = prefs_module.prewarm_ui_enabled
+            self._local_expression_link_labels = prefs_module.expression_link_labels
+            self._local_legacy_dot_anchors = prefs_module.legacy_dot_anchors
             self._local_custom_colors = list(prefs_module.custom_colors)
             # Snapshot of custom colors at open time so _on_accept can detect changes
             # and recolor any anchor nodes using the old color values.
@@ -574,6 +702,34 @@ else:
             self._link_mode_checkbox.setChecked(self._local_link_mode == "create_link")
             outer_layout.addWidget(self._link_mode_checkbox)
 
+            # Checkbox: anchor manifest stored on the Root node at save time
+            self._manifest_checkbox = QtWidgets.QCheckBox(
+                "Store anchor manifest in script (faster anchor lookup after open)"
+            )
+            self._manifest_checkbox.setChecked(self._local_anchor_manifest_enabled)
+            outer_layout.addWidget(self._manifest_checkbox)
+
+            # Checkbox: build pickers and the color dialog during idle time
+            self._prewarm_checkbox = QtWidgets.QCheckBox(
+                "Prepare pickers and color dialog in the background (faster first use)"
+            )
+            self._prewarm_checkbox.setChecked(self._local_prewarm_ui_enabled)
+            outer_layout.addWidget(self._prewarm_checkbox)
+
+            # Checkbox: new links get a label expression that follows the anchor's label
+            self._expression_labels_checkbox = QtWidgets.QCheckBox(
+                "Link labels follow anchor renames (expression labels on new links)"
+            )
+            self._expression_labels_checkbox.setChecked(self._local_expression_link_labels)
+            outer_layout.addWidget(self._expression_labels_checkbox)
+
+            # Checkbox: unmarked labelled Dots count as anchors (off after migrating)
+            self._legacy_dot_anchors_checkbox = QtWidgets.QCheckBox(
+                "Treat unmarked labelled Dots as anchors (legacy scripts)"
+            )
+            self._legacy_dot_anchors_checkbox.setChecked(self._local_legacy_dot_anchors)
+            outer_layout.addWidget(self._legacy_dot_anchors_checkbox)
+
             # Horizontal separator
             separator_top = QtWidgets.QFrame()
             separator_top.setFrameShape(QtWidgets.QFrame.HLine)
@@ -680,7 +836,8 @@ else:
             if not self._swatch_buttons:
                 return
             # Chain from the last focusable checkbox down to the first swatch button
-            QtWidgets.QWidget.setTabOrder(self._link_mode_checkbox, self._swatch_buttons[0])
+            QtWidgets.QWidget.setTabOrder(
+                self._legacy_dot_anchors_checkbox, self._swatch_buttons[0])
             # Chain each swatch button to the next one
             for swatch_index in range(len(self._swatch_buttons) - 1):
                 QtWidgets.QWidget.setTabOrder(
@@ -781,9 +938,10 @@ else:
             """Recolor anchor nodes in the current script whose tile_color matches
             a changed custom color.
 
-            For each index where old_colors[i] != new_colors[i], iterates all
-            NoOp anchor nodes and calls anchor.propagate_anchor_color() for any
-            node whose current tile_color equals the old color value.
+            Builds an {old: new} remap from every index where old_colors[i] !=
+            new_colors[i] and applies it with anchor.recolor_anchors(), which
+            recolors the matching anchors and their links in one pass over the
+            script, as one undo step.
 
             Parameters
             ----------
@@ -792,19 +950,19 @@ else:
             new_colors : list of int
                 Custom color ints after the user's edits (from _local_custom_colors).
             """
+            # No strict=: it only exists from Python 3.10.
+            color_remap = {
+                old_color_int: new_color_int
+                for old_color_int, new_color_int in zip(old_colors, new_colors)  # noqa: B905
+                if old_color_int != new_color_int
+            }
+            if not color_remap:
+                return
             try:
                 import anchor as anchor_module
             except ImportError:
                 return
-
-            for index in range(min(len(old_colors), len(new_colors))):
-                old_color_int = old_colors[index]
-                new_color_int = new_colors[index]
-                if old_color_int == new_color_int:
-                    continue
-                for anchor_node in anchor_module.all_anchors():
-                    if int(anchor_node['tile_color'].value()) == old_color_int:
-                        anchor_module.propagate_anchor_color(anchor_node, new_color_int)
+            anchor_module.recolor_anchors(color_remap)
 
         def _on_accept(self):
             """Flush local working copies to prefs module, persist, and close."""
@@ -814,9 +972,20 @@ else:
             self._local_link_mode = (
                 "create_link" if self._link_mode_checkbox.isChecked() else "passthrough"
             )
+            self._local_anchor_manifest_enabled = self._manifest_checkbox.isChecked()
+            self._local_prewarm_ui_enabled = self._prewarm_checkbox.isChecked()
+            self._local_expression_link_labels = self._expression_labels_checkbox.isChecked()
+            legacy_dot_anchors_changed = (
+                self._legacy_dot_anchors_checkbox.isChecked() != prefs_module.legacy_dot_anchors
+            )
+            self._local_legacy_dot_anchors = self._legacy_dot_anchors_checkbox.isChecked()
             # Flush local working copies to prefs module-level variables
             prefs_module.plugin_enabled = self._local_plugin_enabled
             prefs_module.link_classes_paste_mode = self._local_link_mode
+            prefs_module.anchor_manifest_enabled = self._local_anchor_manifest_enabled
+            prefs_module.prewarm_ui_enabled = self._local_prewarm_ui_enabled
+            prefs_module.expression_link_labels = self._local_expression_link_labels
+            prefs_module.legacy_dot_anchors = self._local_legacy_dot_anchors
             prefs_module.custom_colors = list(self._local_custom_colors)
             # Persist to disk
             prefs_module.save()
@@ -826,6 +995,10 @@ else:
             set_menu_enabled = getattr(prefs_module, 'set_anchors_menu_enabled', None)
             if set_menu_enabled is not None:
                 set_menu_enabled(prefs_module.plugin_enabled)
+            if legacy_dot_anchors_changed:
+                # Which Dots are anchors just changed: rebuild the pickers and indexes.
+                import link as link_module
+                link_module.bump_anchor_generation()
             # Recolor is applied immediately in _on_edit_color (on color picker confirm),
             # not here on OK — so no recolor call needed at accept time.
             self.accept()
@@ -27,6 +27,14 @@ DOT_LABEL_FONT_SIZE_MEDIUM = 66
 NODE_LABEL_FONT_SIZE_LARGE = 33
 DOT_LINK_LABEL_FONT_SIZE = 33
 
+# Link label that reads the anchor's label when drawn (prefs.expression_link_labels),
+# so renaming or relabelling an anchor needs no writes to its links
+LINK_LABEL_EXPRESSION = 'Link: [value input0.label]'
+
+# Links created together from one picker session are laid out in a grid this wide
+LINK_GRID_COLUMNS = 8
+LINK_GRID_SPACING = 20
+
 # FROZEN: value stored in .nk files — do not rename
 DOT_ANCHOR_KNOB_NAME = 'paste_hidden_dot_anchor'
 
@@ -37,5 +45,17 @@ LOCAL_DOT_COLOR = 0x7A3A00FF
 
 # FROZEN: value stored in .nk files — do not rename
 ANCHOR_SET_COLOR_KNOB_NAME = "set_anchor_color"
+# FROZEN: value stored in .nk files — do not rename
+MANIFEST_KNOB_NAME = 'paste_hidden_manifest'
+# FROZEN: value stored in .nk files — do not rename
+ANCHOR_ID_KNOB_NAME = 'paste_hidden_anchor_id'
+# FROZEN: value stored in .nk files — do not rename
+LINK_ANCHOR_ID_KNOB_NAME = 'paste_hidden_link_anchor_id'
+
+# Backdrop colors closer than this CIE76 delta E share one swatch in the color palette
+BACKDROP_COLOR_MERGE_DISTANCE = 6.0
+
 USER_PALETTE_PATH = os.path.expanduser('~/.nuke/paste_hidden_user_palette.json')
 PREFS_PATH = os.path.expanduser('~/.nuke/paste_hidden_prefs.json')
+# Written by copy_hidden() beside Nuke's clipboard; see clipboard.py
+CLIPBOARD_SIDECAR_PATH = os.path.expanduser('~/.nuke/paste_hidden_clipboard.json')
@@ -0,0 +1,268 @@
+"""Nuke-free planning for copy_hidden() and paste_hidden().
+
+Planning reads NodeDescriptor objects (plain data describing each node) and
+returns a list of step tuples; paste_hidden.py describes the live nodes,
+plans, then applies the steps.  Because nothing here imports nuke, plans can
+be built, tested and benchmarked on synthetic graphs.
+
+Nodes are identified by a key: any hashable unique within the script.  In
+Nuke it is the node's fullName().
+
+Copy steps:
+    (REFRESH_FQNN, key)                      rewrite a link's FQNN from its anchor ID
+    (MAKE_LINK_DOT, key, input_key, stored_fqnn)
+                                             make a hidden-input Dot a Link Dot
+    (MAKE_LOCAL_DOT, key, input_key, stored_fqnn, label)
+                                             make a hidden-input Dot a Local Dot
+    (STAMP, key, stored_fqnn, source_key)    add the hidden knobs and store stored_fqnn,
+                                             the FQNN of source_key ('' and None when the
+                                             paste should not reconnect)
+
+Paste steps:
+    (REPLACE_WITH_LINK, key, source_key, link_class, xpos, ypos)
+                                             delete the node, put a link_class link to
+                                             source_key at (xpos, ypos)
+    (REWIRE, key, input_index, replaced_key) feed input_index from replaced_key's new link
+    (RELINK, key, source_key, dot_type)      make the node a link to source_key
+                                             ('local' restores the Local Dot look)
+    (RECREATE_ANCHOR, key, display_name, file_path, color)
+                                             no anchor of that name here, but the
+                                             clipboard sidecar knows its file: offer to
+                                             recreate it and link the node to it
+
+Paste can also read the clipboard sidecar's references (see clipboard.py):
+{stored FQNN: {'anchor': display name or None, 'color': int, 'file': path,
+'dot_type': 'link', 'local' or None}}.
+"""
+
+from constants import ANCHOR_PREFIX, HIDDEN_INPUT_CLASSES, LINK_SOURCE_CLASSES
+
+REFRESH_FQNN = 'refresh_fqnn'
+MAKE_LINK_DOT = 'make_link_dot'
+MAKE_LOCAL_DOT = 'make_local_dot'
+STAMP = 'stamp'
+
+REPLACE_WITH_LINK = 'replace_with_link'
+REWIRE = 'rewire'
+RELINK = 'relink'
+RECREATE_ANCHOR = 'recreate_anchor'
+
+
+class NodeDescriptor:
+    """What planning needs to know about one node.
+
+    inputs holds the key of each input, None for an empty one.  stored_fqnn
+    and dot_type are the values of the hidden knobs, None when absent.
+    """
+
+    def __init__(self, key, node_class, name='', label='', fqnn='', xpos=0, ypos=0,
+                 inputs=(), is_anchor=False, is_link=False, hide_input=False,
+                 stored_fqnn=None, dot_type=None):
+        self.key = key
+        self.node_class = node_class
+        self.name = name
+        self.label = label
+        self.fqnn = fqnn
+        self.xpos = xpos
+        self.ypos = ypos
+        self.inputs = tuple(inputs)
+        self.is_anchor = is_anchor
+        self.is_link = is_link
+        self.hide_input = hide_input
+        self.stored_fqnn = stored_fqnn
+        self.dot_type = dot_type
+
+    def __repr__(self):
+        return f"NodeDescriptor({self.key!r}, {self.node_class!r})"
+
+
+def display_name_from_fqnn(stored_fqnn):
+    """Extract the anchor display name from a stored FQNN for cross-script lookup.
+
+    Returns the display name string (with ANCHOR_PREFIX stripped) if the last
+    segment of the FQNN starts with ANCHOR_PREFIX, or None otherwise.
+    Returns None for empty or blank FQNNs.
+    """
+    if not stored_fqnn:
+        return None
+    node_full_name = stored_fqnn.split('.')[-1]
+    if node_full_name.startswith(ANCHOR_PREFIX):
+        return node_full_name[len(ANCHOR_PREFIX):]
+    return None
+
+
+def link_class_for(source):
+    """Return the link class for *source*, as link.get_link_class_for_source() does."""
+    return 'Dot' if source.node_class == 'Dot' else 'NoOp'
+
+
+def plan_copy(selection, graph, cut=False, passthrough=False, anchor_for_input=None):
+    """Return the steps that prepare *selection* for copying.
+
+    *graph* maps keys to descriptors and must hold the input of every selected
+    hidden-input node.  *anchor_for_input* maps a node key to the descriptor of
+    an anchor fed by that node, or None; it is only called for LINK_SOURCE_CLASSES
+    nodes when neither *cut* nor *passthrough* is set.
+
+    Setting cut stores no name on LINK_SOURCE_CLASSES nodes and anchors, so the
+    paste is a plain paste: the originals will have been deleted.  Setting
+    passthrough (prefs.link_classes_paste_mode) leaves LINK_SOURCE_CLASSES nodes
+    unstamped.
+    """
+    selected_keys = {node.key for node in selection}
+    plan = []
+    for node in selection:
+        if node.is_link:
+            if not cut:
+                plan.append((REFRESH_FQNN, node.key))
+            continue
+
+        # Path A — LINK_SOURCE_CLASSES file node: store the FQNN of an anchor fed by
+        # this node so paste can link to the anchor, or the node's own FQNN when no
+        # anchor points at it (legacy direct-file-node path).
+        if node.node_class in LINK_SOURCE_CLASSES:
+            if passthrough:
+                continue
+            if cut:
+                plan.append((STAMP, node.key, "", None))
+            else:
+                source = anchor_for_input(node.key) or node
+                plan.append((STAMP, node.key, source.fqnn, source.key))
+
+        # Path B — hidden-input Dot (or PostageStamp/NoOp with hide_input set):
+        # split on whether the upstream input is an anchor (Link Dot) or a plain node
+        # (Local Dot).
+        elif node.node_class in HIDDEN_INPUT_CLASSES and node.hide_input:
+            plan.append(_plan_hidden_input_copy(node, graph, selected_keys))
+
+        # Path C — existing anchor node (e.g. a NoOp named Anchor_*) being copied.
+        elif node.is_anchor:
+            if cut:
+                plan.append((STAMP, node.key, "", None))
+            else:
+                plan.append((STAMP, node.key, node.fqnn, node.key))
+    return plan
+
+
+def _plan_hidden_input_copy(node, graph, selected_keys):
+    """Return plan_copy()'s step for one hidden-input node."""
+    input_key = node.inputs[0] if node.inputs else None
+    if input_key is None or input_key in selected_keys:
+        # The input travels with the copy (or there is none): nothing to reconnect to.
+        return (STAMP, node.key, "", None)
+    input_node = graph[input_key]
+    if input_node.is_anchor:
+        return (MAKE_LINK_DOT, node.key, input_key, input_node.fqnn)
+    return (MAKE_LOCAL_DOT, node.key, input_key, input_node.fqnn,
+            input_node.label or input_node.name)
+
+
+_DOT_TYPES = {MAKE_LINK_DOT: 'link', MAKE_LOCAL_DOT: 'local'}
+
+
+def plan_references(plan):
+    """Return {stored FQNN: (source key, dot type)} for every reference a plan_copy() plan stores.
+
+    The dot type is 'link' or 'local' for hidden-input Dots, None for stamped nodes.
+    """
+    references = {}
+    for step in plan:
+        if step[0] == STAMP and step[3] is not None:
+            references[step[2]] = (step[3], None)
+        elif step[0] in _DOT_TYPES:
+            references[step[3]] = (step[2], _DOT_TYPES[step[0]])
+    return references
+
+
+def plan_paste(pasted, current_stem, resolve, find_anchor_by_name, references=None):
+    """Return the steps that turn freshly pasted nodes into links and reconnections.
+
+    *current_stem* is the destination script's name without extension.
+    *resolve* maps a pasted descriptor to the descriptor of the node its stored
+    reference points at in this script, or None; *find_anchor_by_name* maps an
+    anchor display name to an anchor descriptor, or None.  *references* is the
+    clipboard sidecar's {stored FQNN: reference} dict, when one matches.
+    """
+    references = references or {}
+    replacements = []
+    relinks = []
+    replaced_keys = set()
+
+    for node in pasted:
+        if node.stored_fqnn is None:
+            # we haven't stored any info on this node, do nothing
+            continue
+
+        source = resolve(node)
+
+        if node.node_class in LINK_SOURCE_CLASSES or node.is_anchor:
+            # Path A/C: file node or anchor node pasted → replace with a link node.
+            # None means the stored FQNN is cross-script or deleted: leave the
+            # placeholder in place, even when a same-named anchor exists here
+            # (BUG-02 fix: anchor pasted cross-script stays an anchor).
+            if source is None:
+                continue
+            replacements.append((REPLACE_WITH_LINK, node.key, source.key,
+                                 link_class_for(source), node.xpos, node.ypos))
+            replaced_keys.add(node.key)
+
+        elif node.node_class in HIDDEN_INPUT_CLASSES:
+            step = _plan_hidden_input_paste(node, source, current_stem, find_anchor_by_name,
+                                            references.get(node.stored_fqnn))
+            if step is not None:
+                relinks.append(step)
+
+    return replacements + _plan_rewires(pasted, replaced_keys) + relinks
+
+
+def _plan_rewires(pasted, replaced_keys):
+    """Return REWIRE steps so pasted nodes fed by a replaced node are fed by its link."""
+    rewires = []
+    if not replaced_keys:
+        return rewires
+    for node in pasted:
+        if node.key in replaced_keys:
+            continue
+        for input_index, input_key in enumerate(node.inputs):
+            if input_key in replaced_keys:
+                rewires.append((REWIRE, node.key, input_index, input_key))
+    return rewires
+
+
+def _plan_hidden_input_paste(node, source, current_stem, find_anchor_by_name, reference):
+    """Return plan_paste()'s step for one hidden-input Dot (Link Dot or Local Dot), or None."""
+    # The sidecar names the anchor outright; without it, the anchor display name is
+    # read back from the FQNN's anchor-prefixed last segment.
+    if reference is not None:
+        display_name = reference.get('anchor')
+    else:
+        display_name = display_name_from_fqnn(node.stored_fqnn)
+    # Nodes from before the DOT_TYPE knob take it from the sidecar, or infer it:
+    # a reference to an anchor means 'link'.
+    dot_type = node.dot_type
+    if dot_type is None and reference is not None:
+        dot_type = reference.get('dot_type')
+    if dot_type is None:
+        dot_type = 'link' if display_name else 'local'
+
+    # Cross-script is decided on the FQNN's script stem, not on resolve(), which
+    # could return a same-named node from this script for a Local Dot.
+    fqnn_stem = node.stored_fqnn.split('.')[0] if node.stored_fqnn else ''
+    is_cross_script = bool(fqnn_stem) and (fqnn_stem != current_stem)
+
+    if is_cross_script or source is None:
+        # Link Dot: reconnect to the same-named anchor here, if any.
+        # Local Dot: never reconnect across scripts.
+        if dot_type != 'link' or not display_name:
+            return None
+        destination_anchor = find_anchor_by_name(display_name)
+        if destination_anchor is not None:
+            return (RELINK, node.key, destination_anchor.key, None)
+        if reference is not None and reference.get('file'):
+            return (RECREATE_ANCHOR, node.key, display_name, reference['file'],
+                    reference.get('color', 0))
+        return None
+
+    # Same-script: reconnect to the original source.  The raw knob value is
+    # carried so apply restores Local Dot appearance only where it was stored.
+    return (RELINK, node.key, source.key, node.dot_type)
@@ -7,28 +7,76 @@ from constants import (
     DOT_LABEL_FONT_SIZE_LARGE,
     DOT_LABEL_FONT_SIZE_MEDIUM,
     DOT_LINK_LABEL_FONT_SIZE,
-    KNOB_NAME,
+    LINK_LABEL_EXPRESSION,
     NODE_LABEL_FONT_SIZE_LARGE,
 )
 from link import (
+    anchor_id,
     get_fully_qualified_node_name,
+    group_index,
+    has_expression_label,
     is_anchor,
     is_link,
+    link_anchor_id,
     mark_dot_as_anchor,
+    parent_group_path,
     reconnect_link_node,
 )
+from util import undo_group
 
 
 def _update_dot_link_labels(dot_node, new_label):
-    """Set the label on every link node pointing at dot_node and reconnect each one."""
+    """Set the label on every link node pointing at dot_node and reconnect each one.
+
+    Links with an expression label already follow the new label, so only
+    their connection is refreshed; those that also carry the anchor's ID stay
+    connected too, so they are not written at all.
+    """
     dot_fqnn = get_fully_qualified_node_name(dot_node)
-    for candidate_node in nuke.allNodes():
-        if not is_link(candidate_node) or is_anchor(candidate_node):
+    links = group_index(parent_group_path(dot_node)).links_for(dot_fqnn, anchor_id(dot_node))
+    for candidate_node in links:
+        if is_anchor(candidate_node):
             continue
-        if candidate_node[KNOB_NAME].getText() == dot_fqnn:
-            candidate_node['label'].setValue(f"Link: {new_label}")
-            candidate_node['note_font_size'].setValue(DOT_LINK_LABEL_FONT_SIZE)
-            reconnect_link_node(candidate_node)
+        if has_expression_label(candidate_node):
+            if not link_anchor_id(candidate_node):
+                reconnect_link_node(candidate_node)
+            continue
+        candidate_node['label'].setValue(f"Link: {new_label}")
+        candidate_node['note_font_size'].setValue(DOT_LINK_LABEL_FONT_SIZE)
+        reconnect_link_node(candidate_node)
+
+
+def convert_link_labels_to_expressions():
+    """Give every anchor link in the script, Groups included, an expression label.
+
+    Replaces static "Link: <name>" labels with LINK_LABEL_EXPRESSION in one
+    pass over the script, recorded as a single undo step, so later renames
+    and relabels need no writes to these links.  Links whose input is not an
+    anchor (Local Dots, file-node links) keep their labels.  Returns the
+    number of links converted.
+    """
+    to_convert = []
+    for node in nuke.allNodes(recurseGroups=True):
+        if not is_link(node) or is_anchor(node) or has_expression_label(node):
+            continue
+        if not node['label'].getText().startswith('Link: '):
+            continue
+        input_node = node.input(0)
+        if input_node is not None and is_anchor(input_node):
+            to_convert.append(node)
+    if to_convert:
+        with undo_group("Convert Link Labels"):
+            for node in to_convert:
+                node['label'].setValue(LINK_LABEL_EXPRESSION)
+    return len(to_convert)
+
+
+def convert_link_labels_to_expressions_command():
+    """Menu entry point: convert existing link labels and report how many changed."""
+    if not prefs.plugin_enabled:
+        return
+    count = convert_link_labels_to_expressions()
+    nuke.message(f"Converted {count} link label(s) to expressions.")
 
 
 def _apply_label(node, text, dot_font_size=None, node_font_size=None):
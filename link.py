@@ -6,16 +6,21 @@ both pull what they need from here and from constants.py.
 
 import contextlib
 import re
+import uuid
 
 import nuke
 
+import prefs
 from constants import (
     ANCHOR_DEFAULT_COLOR,
+    ANCHOR_ID_KNOB_NAME,
     ANCHOR_PREFIX,
     DOT_ANCHOR_KNOB_NAME,
     DOT_LINK_LABEL_FONT_SIZE,
     DOT_TYPE_KNOB_NAME,
     KNOB_NAME,
+    LINK_ANCHOR_ID_KNOB_NAME,
+    LINK_LABEL_EXPRESSION,
     LINK_RECONNECT_KNOB_NAME,
     TAB_NAME,
 )
@@ -23,7 +28,100 @@ from constants import (
 
 def get_fully_qualified_node_name(node):
     """Return <script_stem>.<node.fullName()> so we can detect cross-script refs."""
-    return f"{nuke.root().name().split('.')[0]}.{node.fullName()}"
+    return f"{script_stem()}.{node.fullName()}"
+
+
+# ---------------------------------------------------------------------------
+# Script stem and FQNN parsing
+#
+# Every FQNN written or compared needs the script stem, and bulk operations
+# parse the same few stored FQNNs over and over.  The stem is cached once
+# enable_script_stem_cache() has been called (menu.py registers the callbacks
+# that invalidate it on script load, save and rename); parsed FQNNs are plain
+# strings and are memoized unconditionally.
+# ---------------------------------------------------------------------------
+
+_script_stem = None
+_script_stem_cache_enabled = False
+_parsed_fqnns = {}  # stored FQNN -> (script stem, group path, node name), or None
+_PARSED_FQNN_LIMIT = 10000
+_cross_script_fqnns = set()  # FQNNs known to name another script, until the stem changes
+
+
+def enable_script_stem_cache():
+    """Let script_stem() reuse its value until invalidate_script_stem() is called.
+
+    Only safe once the script load/save and Root name callbacks that call
+    invalidate_script_stem() are registered (menu.py does both).
+    """
+    global _script_stem_cache_enabled
+    _script_stem_cache_enabled = True
+
+
+def invalidate_script_stem():
+    """Forget the cached script stem, and the FQNNs found to be cross-script under it."""
+    global _script_stem
+    _script_stem = None
+    _cross_script_fqnns.clear()
+
+
+def on_root_knob_changed():
+    """knobChanged callback for the Root: Save As renames the script through its name knob."""
+    if nuke.thisKnob().name() == 'name':
+        invalidate_script_stem()
+
+
+def script_stem():
+    """Return the current script's name without directory or extension."""
+    global _script_stem
+    if _script_stem is not None and _script_stem_cache_enabled:
+        return _script_stem
+    stem = nuke.root().name().split('.')[0]
+    if _script_stem_cache_enabled:
+        _script_stem = stem
+    return stem
+
+
+def parse_fqnn(fqnn):
+    """Return (script stem, group path, node name) for a stored FQNN, or None if it has no stem.
+
+    The group path is '' for nodes at the Root, as in group_path().
+    """
+    try:
+        return _parsed_fqnns[fqnn]
+    except KeyError:
+        pass
+    stem, separator, full_name = fqnn.partition('.')
+    if separator:
+        path, _, name = full_name.rpartition('.')
+        parsed = (stem, path, name)
+    else:
+        parsed = None
+    if len(_parsed_fqnns) >= _PARSED_FQNN_LIMIT:
+        _parsed_fqnns.clear()
+    _parsed_fqnns[fqnn] = parsed
+    return parsed
+
+
+def _same_script_full_name(fqnn, path):
+    """Return the fullName() *fqnn* names if it is in this script and the group at *path*.
+
+    Returns None otherwise.  FQNNs naming another script are remembered while
+    the script stem is cached, so repeated lookups skip the comparison.
+    """
+    if fqnn in _cross_script_fqnns:
+        return None
+    parsed = parse_fqnn(fqnn)
+    if parsed is None:
+        return None
+    stem, fqnn_path, name = parsed
+    if stem != script_stem():
+        if _script_stem_cache_enabled:
+            _cross_script_fqnns.add(fqnn)
+        return None
+    if fqnn_path != path:
+        return None
+    return f"{path}.{name}" if path else name
 
 
 def find_node_default_color(node):
@@ -48,27 +146,420 @@ def find_node_default_color(node):
     return prefs["NodeColor"].value()
 
 
-def find_node_color(node):
+def find_node_color(node, default_colors=None):
+    """Return *node*'s tile color, falling back to the Preferences color for its class.
+
+    *default_colors* is an optional {node class: color} dict used to cache the
+    Preferences lookups when coloring many nodes.
+    """
     tile_color = node["tile_color"].value()
     if tile_color == 0:
-        tile_color = find_node_default_color(node)
+        if default_colors is None:
+            return find_node_default_color(node)
+        node_class = node.Class()
+        if node_class not in default_colors:
+            default_colors[node_class] = find_node_default_color(node)
+        tile_color = default_colors[node_class]
     return tile_color
 
 
-def find_smallest_containing_backdrop(node):
-    """Return the smallest BackdropNode that fully contains *node*, or None."""
+def backdrop_index():
+    """Return the script's backdrops as (x, y, width, height, node) tuples, smallest first.
+
+    Build it once and pass it to find_smallest_containing_backdrop() when
+    testing many nodes, instead of rescanning the script for each.
+    """
+    backdrops = [
+        (bd.xpos(), bd.ypos(), bd['bdwidth'].value(), bd['bdheight'].value(), bd)
+        for bd in nuke.allNodes('BackdropNode')
+    ]
+    backdrops.sort(key=lambda entry: entry[2] * entry[3])
+    return backdrops
+
+
+def find_smallest_containing_backdrop(node, backdrops=None):
+    """Return the smallest BackdropNode that fully contains *node*, or None.
+
+    *backdrops* is an optional backdrop_index() to search instead of the live script.
+    """
+    if backdrops is None:
+        backdrops = backdrop_index()
     nx, ny = node.xpos(), node.ypos()
-    containing = []
-    for bd in nuke.allNodes('BackdropNode'):
-        bx = bd.xpos()
-        by = bd.ypos()
-        bw = bd['bdwidth'].value()
-        bh = bd['bdheight'].value()
+    for bx, by, bw, bh, bd in backdrops:
         if bx <= nx < bx + bw and by <= ny < by + bh:
-            containing.append(bd)
-    if not containing:
+            return bd
+    return None
+
+
+_anchor_index_seed = None  # set of anchor full names seeded from the script manifest, or None
+_link_index_seed = None  # anchor full name -> [link full names] from the script manifest, or None
+_anchor_generation = 0  # bumped whenever anchors may have been added, removed or renamed
+
+
+def anchor_generation():
+    """Return a counter that changes whenever the script's anchors may have changed.
+
+    Anchor pickers compare it with the value they last saw and skip rebuilding
+    their item lists when it is unchanged.  It is bumped by the node callbacks
+    registered in menu.py and by every plugin path that creates or renames an
+    anchor, so it can only err towards an unneeded rebuild.
+    """
+    return _anchor_generation
+
+
+def bump_anchor_generation():
+    global _anchor_generation
+    _anchor_generation += 1
+
+
+def seed_anchor_index(anchor_full_names):
+    """Seed anchor lookups with anchor full names read from the script manifest.
+
+    Seeded names are verified lazily: seeded_anchors() resolves each one with
+    nuke.toNode() and keeps only nodes that are still anchors, so a stale
+    manifest can drop entries but never yields a non-anchor.  The seed stays in
+    effect until invalidate_anchor_index() is called.
+    """
+    global _anchor_index_seed
+    _anchor_index_seed = set(anchor_full_names)
+
+
+def seed_link_index(link_full_names_by_anchor):
+    """Seed link lookups with {anchor full name: [link full names]} read from the script manifest.
+
+    Like the anchor seed, entries are verified lazily by seeded_links_for().
+    Any link created or re-pointed afterwards drops the seed (see
+    invalidate_link_index()), since the manifest cannot list it.
+    """
+    global _link_index_seed
+    _link_index_seed = {
+        anchor_full_name: list(link_full_names)
+        for anchor_full_name, link_full_names in link_full_names_by_anchor.items()
+    }
+
+
+def invalidate_link_index():
+    """Drop the manifest's link seed so the next link lookup reads the group index."""
+    global _link_index_seed
+    _link_index_seed = None
+    bump_anchor_generation()
+
+
+def invalidate_anchor_index():
+    """Drop the manifest seeds so the next anchor or link lookup does a full scan."""
+    global _anchor_index_seed, _link_index_seed
+    _anchor_index_seed = None
+    _link_index_seed = None
+    bump_anchor_generation()
+
+
+def is_anchor_index_seeded():
+    return _anchor_index_seed is not None
+
+
+def register_anchor_in_index(anchor_node, old_full_name=None):
+    """Keep an active manifest seed in step with an anchor created or renamed.
+
+    Called by the plugin's own create and rename paths, and by the node
+    callbacks in menu.py for anchors made any other way (imported, natively
+    pasted, renamed by hand), which the saved manifest cannot list.  The seed
+    only covers the Root, so anchors inside Groups are left out of it.
+    """
+    bump_anchor_generation()
+    if _link_index_seed is not None and old_full_name in _link_index_seed:
+        # Renaming never re-points links, so the anchor keeps its seeded links.
+        _link_index_seed[anchor_node.fullName()] = _link_index_seed.pop(old_full_name)
+    if _anchor_index_seed is None:
+        return
+    if old_full_name is not None:
+        _anchor_index_seed.discard(old_full_name)
+    if not parent_group_path(anchor_node):
+        _anchor_index_seed.add(anchor_node.fullName())
+
+
+def seeded_anchors():
+    """Return the live anchor nodes named by the manifest seed, or None when unseeded."""
+    if _anchor_index_seed is None:
+        return None
+    anchors = []
+    for full_name in _anchor_index_seed:
+        node = nuke.toNode(full_name)
+        if node is not None and is_anchor(node):
+            anchors.append(node)
+    return anchors
+
+
+def seeded_links_for(anchor_node):
+    """Return the live links the manifest seed lists for *anchor_node*, or None.
+
+    None means the seed cannot answer — no seed, an anchor inside a Group, or
+    an anchor the manifest does not know — and callers read the group index.
+    Links are matched as _GroupIndex.links_for() does.
+    """
+    if _link_index_seed is None or parent_group_path(anchor_node):
+        return None
+    link_full_names = _link_index_seed.get(anchor_node.fullName())
+    if link_full_names is None:
         return None
-    return min(containing, key=lambda bd: bd['bdwidth'].value() * bd['bdheight'].value())
+    fqnn = get_fully_qualified_node_name(anchor_node)
+    anchor_id_value = anchor_id(anchor_node)
+    links = []
+    for full_name in link_full_names:
+        node = nuke.toNode(full_name)
+        if node is not None and is_link(node) and _references(node, fqnn, anchor_id_value):
+            links.append(node)
+    return links
+
+
+# ---------------------------------------------------------------------------
+# Per-group anchor/link index
+#
+# Anchors and their links always share a node graph level (find_anchor_node()
+# refuses cross-group references), so lookups are scoped to one Group — or the
+# Root — and cost only that group's size.  Groups are identified by their path:
+# '' for the Root, otherwise the Group's fullName().
+# ---------------------------------------------------------------------------
+
+_group_indexes = {}  # group path -> _GroupIndex
+_group_index_cache_enabled = False
+
+
+def enable_group_index_cache():
+    """Let group_index() reuse indexes until anchor_generation() moves.
+
+    Only safe once the onCreate/onDestroy/knobChanged callbacks that bump the
+    generation are registered (menu.py does both); until then every
+    group_index() call rescans its group.
+    """
+    global _group_index_cache_enabled
+    _group_index_cache_enabled = True
+
+
+def group_path(group):
+    """Return the path of *group*: '' for the Root, otherwise its fullName()."""
+    if group is None or group.Class() == 'Root':
+        return ''
+    return group.fullName()
+
+
+def current_group_path():
+    """Return the path of the Group whose node graph is the current context."""
+    return group_path(nuke.thisGroup())
+
+
+def parent_group_path(node):
+    """Return the path of the Group that contains *node*."""
+    return node.fullName().rpartition('.')[0]
+
+
+def group_node(path):
+    """Return the Group node (or the Root, for '') at *path*, or None if it no longer exists."""
+    if not path:
+        return nuke.root()
+    return nuke.toNode('root.' + path)
+
+
+def resolve_full_name(full_name):
+    """Return the node whose fullName() is *full_name*, whatever the current group context."""
+    return nuke.toNode('root.' + full_name)
+
+
+def _is_live(node):
+    """Return False for a node deleted since it was indexed (Nuke raises ValueError on use)."""
+    try:
+        node.name()
+    except ValueError:
+        return False
+    return True
+
+
+class _GroupIndex:
+    """Anchors and links directly inside one group, from a single allNodes() scan.
+
+    The onCreate/onDestroy callbacks in menu.py move the generation whenever a
+    node that can be an anchor or a link comes or goes; nodes deleted by any
+    other route are still dropped on read, so callers never touch a dead node.
+    """
+
+    def __init__(self, generation, anchors, links):
+        self.generation = generation
+        self._anchors = anchors
+        self._links = links
+        self._anchors_by_id = None
+        self._anchors_by_name = None
+
+    @property
+    def anchors(self):
+        return [node for node in self._anchors if _is_live(node)]
+
+    @property
+    def links(self):
+        return [node for node in self._links if _is_live(node)]
+
+    def anchors_with_id(self, anchor_id_value):
+        """Return the anchors in this group whose ID is *anchor_id_value* (normally at most one)."""
+        if self._anchors_by_id is None:
+            self._anchors_by_id = {}
+            for node in self.anchors:
+                node_id = anchor_id(node)
+                if node_id:
+                    self._anchors_by_id.setdefault(node_id, []).append(node)
+        return [node for node in self._anchors_by_id.get(anchor_id_value, []) if _is_live(node)]
+
+    def anchor_named(self, name):
+        """Return the anchor in this group whose node name is *name*, or None."""
+        if self._anchors_by_name is None:
+            self._anchors_by_name = {node.name(): node for node in self.anchors}
+        node = self._anchors_by_name.get(name)
+        return node if node is not None and _is_live(node) else None
+
+    def links_for(self, fqnn, anchor_id_value=''):
+        """Return the links in this group that reference an anchor.
+
+        Links carrying an anchor ID match on *anchor_id_value* alone; links
+        from before anchor IDs match on their stored FQNN.
+        """
+        return [node for node in self.links if _references(node, fqnn, anchor_id_value)]
+
+    def links_by_reference(self):
+        """Return links_by_reference() of this group's links."""
+        return links_by_reference(self.links)
+
+
+def _references(link_node, fqnn, anchor_id_value):
+    """Return True if *link_node* references the anchor with *fqnn* and *anchor_id_value*."""
+    link_id = link_anchor_id(link_node)
+    if link_id:
+        return link_id == anchor_id_value
+    return link_node[KNOB_NAME].getText() == fqnn
+
+
+def links_by_reference(link_nodes):
+    """Return {anchor ID or stored FQNN: [link nodes]} for *link_nodes*.
+
+    Links carrying an anchor ID are keyed on it, links from before anchor IDs
+    on their stored FQNN; read the map with links_to().
+    """
+    links = {}
+    for node in link_nodes:
+        links.setdefault(link_anchor_id(node) or node[KNOB_NAME].getText(), []).append(node)
+    return links
+
+
+def links_to(links, anchor_node):
+    """Return the links in a links_by_reference() map that reference *anchor_node*.
+
+    Matches as _GroupIndex.links_for() does, so links keep being found after
+    the anchor is renamed.
+    """
+    return (links.get(anchor_id(anchor_node), [])
+            + links.get(get_fully_qualified_node_name(anchor_node), []))
+
+
+def group_index(path=None):
+    """Return the anchor/link index for the group at *path* (default: the current group).
+
+    Built lazily from the group's own nodes — never the whole script — and,
+    once enable_group_index_cache() has been called, reused until
+    anchor_generation() moves.  Link FQNNs are read at lookup time, so
+    re-pointing an existing link never leaves the index stale.
+    """
+    if path is None:
+        path = current_group_path()
+    index = _group_indexes.get(path)
+    if (index is not None and _group_index_cache_enabled
+            and index.generation == _anchor_generation):
+        return index
+    group = group_node(path)
+    nodes = nuke.allNodes(group=group) if group is not None else []
+    index = _GroupIndex(
+        _anchor_generation,
+        [node for node in nodes if is_anchor(node)],
+        [node for node in nodes if is_link(node)],
+    )
+    _group_indexes[path] = index
+    return index
+
+
+def anchor_id(node):
+    """Return the persistent ID stored on anchor *node*, or '' if it has none yet."""
+    if ANCHOR_ID_KNOB_NAME not in node.knobs():
+        return ''
+    return node[ANCHOR_ID_KNOB_NAME].getText()
+
+
+def link_anchor_id(node):
+    """Return the anchor ID stored on link *node*, or '' for links that predate anchor IDs."""
+    if LINK_ANCHOR_ID_KNOB_NAME not in node.knobs():
+        return ''
+    return node[LINK_ANCHOR_ID_KNOB_NAME].getText()
+
+
+def assign_new_anchor_id(anchor_node):
+    """Give *anchor_node* a fresh unique ID, adding the hidden knob if needed; return the ID."""
+    new_id = uuid.uuid4().hex
+    _write_anchor_id(anchor_node, new_id)
+    bump_anchor_generation()
+    return new_id
+
+
+def _write_anchor_id(anchor_node, anchor_id_value):
+    if ANCHOR_ID_KNOB_NAME not in anchor_node.knobs():
+        knob = nuke.String_Knob(ANCHOR_ID_KNOB_NAME)
+        knob.setVisible(False)
+        anchor_node.addKnob(knob)
+    anchor_node[ANCHOR_ID_KNOB_NAME].setValue(anchor_id_value)
+
+
+def ensure_anchor_id(anchor_node):
+    """Return *anchor_node*'s ID, assigning one first if it is an anchor from an older script."""
+    return anchor_id(anchor_node) or assign_new_anchor_id(anchor_node)
+
+
+def uncollide_pasted_anchor_ids(pasted_nodes):
+    """Give pasted anchors that duplicate an existing anchor's ID a new ID.
+
+    A copy of an anchor pasted next to its original (or pasted twice) carries
+    the original's ID; left alone, links would resolve to whichever is found
+    first.  Anchors moved by cut and paste keep their ID, since the original
+    is gone.  Returns the anchors that were given a new ID.
+
+    Every check reads one snapshot of each group's index, and the anchor
+    generation moves once at the end, so a paste costs one scan per group
+    however many anchors it holds.
+    """
+    pasted_ids = {id(node) for node in pasted_nodes}
+    indexes = {}
+    used_ids = set()
+    renewed = []
+    for node in pasted_nodes:
+        node_id = anchor_id(node)
+        if not node_id or not is_anchor(node):
+            continue
+        path = parent_group_path(node)
+        if path not in indexes:
+            indexes[path] = group_index(path)
+        others = indexes[path].anchors_with_id(node_id)
+        if any(id(other) not in pasted_ids for other in others):
+            new_id = uuid.uuid4().hex
+            while new_id in used_ids or indexes[path].anchors_with_id(new_id):
+                new_id = uuid.uuid4().hex
+            used_ids.add(new_id)
+            _write_anchor_id(node, new_id)
+            renewed.append(node)
+    if renewed:
+        bump_anchor_generation()
+    return renewed
+
+
+def _set_link_anchor_id(link_node, anchor_id_value):
+    if LINK_ANCHOR_ID_KNOB_NAME not in link_node.knobs():
+        if not anchor_id_value:
+            return
+        knob = nuke.String_Knob(LINK_ANCHOR_ID_KNOB_NAME)
+        knob.setVisible(False)
+        link_node.addKnob(knob)
+    link_node[LINK_ANCHOR_ID_KNOB_NAME].setValue(anchor_id_value)
 
 
 def get_link_class_for_source(source_node):
@@ -81,6 +572,14 @@ def get_link_class_for_source(source_node):
     return 'NoOp'
 
 
+def add_dot_anchor_knob(dot_node):
+    """Add the hidden DOT_ANCHOR_KNOB_NAME marker, set, to a Dot that does not have it yet."""
+    knob = nuke.Boolean_Knob(DOT_ANCHOR_KNOB_NAME, 'Dot Anchor')
+    knob.setVisible(False)
+    knob.setValue(True)
+    dot_node.addKnob(knob)
+
+
 def mark_dot_as_anchor(dot_node):
     """Add the canonical anchor marker knob to a Dot node if not already present.
 
@@ -93,15 +592,15 @@ def mark_dot_as_anchor(dot_node):
     if DOT_ANCHOR_KNOB_NAME in dot_node.knobs():
         dot_node[DOT_ANCHOR_KNOB_NAME].setValue(True)
         return
-    knob = nuke.Boolean_Knob(DOT_ANCHOR_KNOB_NAME, 'Dot Anchor')
-    knob.setVisible(False)
-    knob.setValue(True)
-    dot_node.addKnob(knob)
+    add_dot_anchor_knob(dot_node)
 
+    old_full_name = dot_node.fullName()
     label = dot_node['label'].getValue().strip()
     sanitized_label = re.sub(r'[^A-Za-z0-9_]', '_', label)
     if sanitized_label:
         dot_node.setName(ANCHOR_PREFIX + sanitized_label)
+    ensure_anchor_id(dot_node)
+    register_anchor_in_index(dot_node, old_full_name)
 
     dot_node['tile_color'].setValue(ANCHOR_DEFAULT_COLOR)
 
@@ -114,16 +613,28 @@ def is_anchor(node):
             # Explicit anchor knob (set by mark_dot_as_anchor)
             if DOT_ANCHOR_KNOB_NAME in node.knobs():
                 return True
-            # Legacy: labelled dot that is not a link, not hidden-input, no "Link: " prefix
-            label = node['label'].getValue().strip()
-            if (label and not label.startswith('Link: ')
-                    and not is_link(node) and not node['hide_input'].getValue()):
-                return True
+            # Off once the script's legacy Dot anchors have been migrated
+            # (see migrate_dot_anchors.py): Dots are then one knob check.
+            return prefs.legacy_dot_anchors and is_legacy_dot_anchor(node)
         return False
     except Exception:
         return False
 
 
+def is_legacy_dot_anchor(node):
+    """Return True for a Dot anchor from before DOT_ANCHOR_KNOB_NAME existed.
+
+    That is a labelled Dot that is not a link, does not hide its input, and
+    whose label does not start with "Link: ".  Dots with the marker knob are
+    not legacy and return False.
+    """
+    if node.Class() != 'Dot' or DOT_ANCHOR_KNOB_NAME in node.knobs():
+        return False
+    label = node['label'].getValue().strip()
+    return bool(label and not label.startswith('Link: ')
+                and not is_link(node) and not node['hide_input'].getValue())
+
+
 def is_link(node):
     return KNOB_NAME in node.knobs()
 
@@ -166,12 +677,33 @@ def add_input_knob(node, dot_type=None):
         dot_type_knob.setValue(dot_type)
         node.addKnob(dot_type_knob)
 
+    # The node may have existed before it became a link; group indexes keyed
+    # on the generation must pick it up.
+    bump_anchor_generation()
+
+
+def has_expression_label(link_node):
+    """Return True if *link_node*'s label reads its anchor's label at draw time."""
+    return link_node['label'].getText() == LINK_LABEL_EXPRESSION
 
-def setup_link_node(input_node, link_node):
-    link_node["hide_input"].setValue(True)
-    link_node["tile_color"].setValue(find_node_color(input_node))
 
-    if input_node["label"].getText():
+def setup_link_node(input_node, link_node, tile_color=None, label=None, fqnn=None,
+                    dot_type=None):
+    """Make *link_node* a hidden-input link to *input_node*.
+
+    Batch callers that already know the outcome pass *tile_color*, *label* or
+    *fqnn* to skip the Preferences color lookup and FQNN computation, and
+    *dot_type* so add_input_knob() adds the Dot-type knob in the same pass.
+    """
+    link_node["hide_input"].setValue(True)
+    link_node["tile_color"].setValue(
+        find_node_color(input_node) if tile_color is None else tile_color)
+
+    if label is not None:
+        link_node["label"].setValue(label)
+    elif prefs.expression_link_labels and is_anchor(input_node):
+        link_node["label"].setValue(LINK_LABEL_EXPRESSION)
+    elif input_node["label"].getText():
         link_node["label"].setValue(f"Link: {input_node['label'].getText()}")
     else:
         link_node["label"].setValue(f"Link: {input_node.name()}")
@@ -179,30 +711,87 @@ def setup_link_node(input_node, link_node):
     if link_node.Class() == 'Dot':
         link_node["note_font_size"].setValue(DOT_LINK_LABEL_FONT_SIZE)
 
-    add_input_knob(link_node)
-    link_node[KNOB_NAME].setValue(get_fully_qualified_node_name(input_node))
+    add_input_knob(link_node, dot_type=dot_type)
+    link_node[KNOB_NAME].setValue(
+        get_fully_qualified_node_name(input_node) if fqnn is None else fqnn)
+    # Links to anchors resolve by the anchor's ID, so renaming or moving the
+    # anchor never requires rewriting them; the FQNN stays as the fallback.
+    _set_link_anchor_id(link_node, ensure_anchor_id(input_node) if is_anchor(input_node) else '')
     link_node.setInput(0, input_node)
+    if _link_index_seed is not None:
+        invalidate_link_index()
 
 
 def find_anchor_node(link_node):
-    fully_qualified_name_from_knob = link_node[KNOB_NAME].getText()
-    fqn_from_knob_split = fully_qualified_name_from_knob.split(".")
-
-    # strip off the script name to get Nuke's version of a full name
-    full_name_from_knob = ".".join(fqn_from_knob_split[1:])
-    fully_qualified_name_from_current = get_fully_qualified_node_name(link_node)
-    fqn_from_current_split = fully_qualified_name_from_current.split(".")
-    prefix_from_knob = fqn_from_knob_split[:-1]
-    prefix_from_current = fqn_from_current_split[:-1]
-    if prefix_from_knob != prefix_from_current:
-        # we are in a different script and/or Group, do nothing
+    link_id = link_anchor_id(link_node)
+    if link_id:
+        anchors = group_index(parent_group_path(link_node)).anchors_with_id(link_id)
+        if anchors:
+            return anchors[0]
+    # A stored FQNN only resolves within the same script and Group as the link.
+    full_name = _same_script_full_name(link_node[KNOB_NAME].getText(),
+                                       parent_group_path(link_node))
+    if full_name is None:
         return None
-    anchor_node = nuke.toNode(full_name_from_knob)
-    return anchor_node
+    return resolve_full_name(full_name)
+
 
+class FqnnResolver:
+    """Resolves the links of one bulk operation to their anchors.
 
-def reconnect_link_node(link_node):
+    Behaves like find_anchor_node(), but holds one group index per Group for
+    the whole batch, so anchor IDs and anchor names are looked up in per-group
+    maps instead of one nuke.toNode() call per link.  Stored FQNNs that name a
+    node other than an anchor (Local Dots) still fall back to nuke.toNode().
+    Create one per operation: it does not notice anchors changed meanwhile.
+    """
+
+    def __init__(self):
+        self._indexes = {}
+
+    def _index(self, path):
+        index = self._indexes.get(path)
+        if index is None:
+            index = self._indexes[path] = group_index(path)
+        return index
+
+    def find_anchor_node(self, link_node):
+        path = parent_group_path(link_node)
+        link_id = link_anchor_id(link_node)
+        if link_id:
+            anchors = self._index(path).anchors_with_id(link_id)
+            if anchors:
+                return anchors[0]
+        full_name = _same_script_full_name(link_node[KNOB_NAME].getText(), path)
+        if full_name is None:
+            return None
+        node = self._index(path).anchor_named(full_name.rpartition('.')[2])
+        return node if node is not None else resolve_full_name(full_name)
+
+
+def refresh_link_fqnn(link_node):
+    """Rewrite a link's stored FQNN if its anchor ID now resolves to a renamed or moved anchor.
+
+    Renames leave ID-carrying links untouched; copy calls this so the FQNN that
+    travels to other scripts (where the ID cannot resolve) names the anchor as
+    it is now.
+    """
+    if not link_anchor_id(link_node):
+        return
     anchor_node = find_anchor_node(link_node)
+    if anchor_node is None:
+        return
+    fqnn = get_fully_qualified_node_name(anchor_node)
+    if link_node[KNOB_NAME].getText() != fqnn:
+        link_node[KNOB_NAME].setValue(fqnn)
+
+
+def reconnect_link_node(link_node, resolver=None):
+    """Reconnect *link_node* to its anchor; pass a FqnnResolver when reconnecting many links."""
+    if resolver is not None:
+        anchor_node = resolver.find_anchor_node(link_node)
+    else:
+        anchor_node = find_anchor_node(link_node)
     if not anchor_node:
         return None
     link_node.setInput(0, anchor_node)
@@ -0,0 +1,134 @@
+"""Script-embedded anchor manifest for fast load-time anchor indexing.
+
+When prefs.anchor_manifest_enabled is True, an onScriptSave callback stores a
+compact JSON manifest on the Root node in a hidden knob.  The manifest maps
+each anchor's node full name to its display name, and lists the full names
+of the link nodes that reference each anchor.
+
+On script load the manifest seeds the anchor and link indexes in link.py, so
+the first picker open, or the first rename of an anchor, reads a handful of
+nodes by name instead of walking the whole graph.  Seeded entries are
+verified lazily (see link.seeded_anchors() and link.seeded_links_for()); a
+lookup miss falls back to a full scan.  Anchors created after the script
+loads join the seed through the node callbacks in menu.py, and links created
+after it drop the link lists.
+"""
+
+import json
+
+import nuke
+
+import prefs
+from constants import MANIFEST_KNOB_NAME
+from link import (
+    invalidate_anchor_index,
+    is_anchor,
+    is_link,
+    links_by_reference,
+    links_to,
+    seed_anchor_index,
+    seed_link_index,
+)
+
+# Version 1 keyed anchors by display name, which collapsed same-named anchors
+MANIFEST_VERSION = 2
+
+
+def build_manifest():
+    """Return the manifest dict for the current script, built in one pass over allNodes().
+
+    Shape::
+
+        {
+            'version': 2,
+            'anchors': {<anchor full name>: <display name>, ...},
+            'links': {<anchor full name>: [<link full name>, ...], ...},
+        }
+
+    Anchors are keyed by full name, so anchors sharing a display name each
+    keep their entry.  Anchors without any links are omitted from 'links'.
+    """
+    from anchor import anchor_display_name
+
+    anchors = {}
+    anchor_nodes = []
+    link_nodes = []
+    for node in nuke.allNodes():
+        if is_anchor(node):
+            anchors[node.fullName()] = anchor_display_name(node)
+            anchor_nodes.append(node)
+        elif is_link(node):
+            link_nodes.append(node)
+
+    # Links are matched on anchor ID first, as reconnecting them would, so
+    # links kept after an anchor rename are still listed under the anchor.
+    links_by_anchor = links_by_reference(link_nodes)
+    links = {}
+    for anchor_node in anchor_nodes:
+        link_names = [node.fullName() for node in links_to(links_by_anchor, anchor_node)]
+        if link_names:
+            links[anchor_node.fullName()] = sorted(link_names)
+
+    return {'version': MANIFEST_VERSION, 'anchors': anchors, 'links': links}
+
+
+def write_manifest(manifest):
+    """Store *manifest* as compact JSON in a hidden knob on the Root node."""
+    root = nuke.root()
+    if MANIFEST_KNOB_NAME not in root.knobs():
+        knob = nuke.String_Knob(MANIFEST_KNOB_NAME)
+        knob.setVisible(False)
+        root.addKnob(knob)
+    root[MANIFEST_KNOB_NAME].setValue(
+        json.dumps(manifest, separators=(',', ':'), sort_keys=True)
+    )
+
+
+def read_manifest():
+    """Return the manifest dict stored on the Root node, or None.
+
+    Returns None when the knob is absent, empty, unparsable, or written by an
+    unknown manifest version — callers then fall back to a full scan.
+    """
+    root = nuke.root()
+    if MANIFEST_KNOB_NAME not in root.knobs():
+        return None
+    text = root[MANIFEST_KNOB_NAME].getText()
+    if not text:
+        return None
+    try:
+        manifest = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+        return None
+    if not isinstance(manifest.get('anchors'), dict) or not isinstance(manifest.get('links'), dict):
+        return None
+    return manifest
+
+
+def on_script_save():
+    """onScriptSave callback: refresh the Root manifest when the preference is on."""
+    if not prefs.plugin_enabled or not prefs.anchor_manifest_enabled:
+        return
+    write_manifest(build_manifest())
+
+
+def on_script_load():
+    """onScriptLoad callback: seed the anchor and link indexes from the Root manifest, if any.
+
+    Always drops the previous script's seed first, so a script saved without a
+    manifest falls back to full scans.
+    """
+    invalidate_anchor_index()
+    if not prefs.plugin_enabled or not prefs.anchor_manifest_enabled:
+        return
+    manifest = read_manifest()
+    if manifest is None:
+        return
+    anchors = manifest['anchors']
+    seed_anchor_index(anchors)
+    seed_link_index({
+        anchor_full_name: manifest['links'].get(anchor_full_name, [])
+        for anchor_full_name in anchors
+    })
@@ -2,8 +2,12 @@ import nuke
 
 import anchor
 import labels
+import link
+import manifest
+import migrate_dot_anchors
 import paste_hidden
 import prefs
+from constants import LINK_SOURCE_CLASSES
 
 menu = nuke.menu("Nuke")
 edit_menu = menu.findItem("Edit")
@@ -45,6 +49,7 @@ def _add_gated_command(menu, name, command, shortcut=None):
 
 
 _add_gated_command(anchors_menu, "Create Anchor",       "anchor.create_anchor()")
+_add_gated_command(anchors_menu, "Anchor All Selected", "anchor.create_anchors_for_selected()")
 _add_gated_command(anchors_menu, "Rename Anchor",       "anchor.rename_selected_anchor()")
 _add_gated_command(anchors_menu, "Create Link",         "anchor.select_anchor_and_create()")
 _add_gated_command(anchors_menu, "Anchor",              "anchor.anchor_shortcut()",            "A")
@@ -57,6 +62,10 @@ anchors_menu.addSeparator()
 _add_gated_command(anchors_menu, "Label (Large)",  "labels.create_large_label()",  "+M")
 _add_gated_command(anchors_menu, "Label (Medium)", "labels.create_medium_label()", "+N")
 _add_gated_command(anchors_menu, "Append Label",   "labels.append_to_label()",     "^M")
+_add_gated_command(anchors_menu, "Convert Link Labels to Expressions",
+                   "labels.convert_link_labels_to_expressions_command()")
+_add_gated_command(anchors_menu, "Migrate Legacy Dot Anchors",
+                   "migrate_dot_anchors.migrate_legacy_dot_anchors_command()")
 
 anchors_menu.addSeparator()
 
@@ -93,3 +102,44 @@ prefs.set_anchors_menu_enabled = set_anchors_menu_enabled
 
 # Apply initial state at startup in case prefs loads plugin_enabled=False
 set_anchors_menu_enabled(prefs.plugin_enabled)
+
+# ---------------------------------------------------------------------------
+# Script callbacks — the anchor manifest (see manifest.py) is only written and
+# read when prefs.anchor_manifest_enabled is True; otherwise these are no-ops.
+# ---------------------------------------------------------------------------
+nuke.addOnScriptSave(manifest.on_script_save)
+nuke.addOnScriptLoad(manifest.on_script_load)
+
+# The cached script stem (link.script_stem) is dropped whenever the script's
+# name may change: on load, on save, on close, and when Save As renames the Root.
+nuke.addOnScriptLoad(link.invalidate_script_stem)
+nuke.addOnScriptSave(link.invalidate_script_stem)
+nuke.addOnScriptClose(link.invalidate_script_stem)
+nuke.addKnobChanged(link.on_root_knob_changed, nodeClass='Root')
+link.enable_script_stem_cache()
+
+# ---------------------------------------------------------------------------
+# Anchor picker invalidation — the Create Link / Anchor Find pickers and the
+# per-group anchor/link indexes (link.group_index) are only rebuilt when
+# link.anchor_generation() moves.  Anchors are NoOps or Dots, links may also be
+# PostageStamps, Anchor Find lists labelled backdrops, and creating, deleting
+# or renaming a Group moves every anchor inside it.  Nodes of other classes
+# can still be anchors (any Anchor_* node) or links (copied LINK_SOURCE_CLASSES
+# nodes carry a stored FQNN); an unfiltered callback checks those.
+# ---------------------------------------------------------------------------
+for _node_class in anchor.ANCHOR_CANDIDATE_CLASSES:
+    nuke.addOnCreate(anchor.on_anchor_candidates_changed, nodeClass=_node_class)
+    nuke.addOnDestroy(anchor.on_anchor_candidates_changed, nodeClass=_node_class)
+for _node_class in anchor.ANCHOR_CANDIDATE_CLASSES + tuple(sorted(LINK_SOURCE_CLASSES)):
+    nuke.addKnobChanged(anchor.on_anchor_candidate_knob_changed, nodeClass=_node_class)
+nuke.addOnCreate(anchor.on_node_created_or_destroyed)
+nuke.addOnDestroy(anchor.on_node_created_or_destroyed)
+nuke.addOnScriptClose(anchor.on_anchor_candidates_changed)
+link.enable_group_index_cache()
+
+# ---------------------------------------------------------------------------
+# Optional idle-time prewarm of the pickers and color dialog (see
+# anchor.prewarm_ui); a no-op unless prefs.prewarm_ui_enabled is True.
+# ---------------------------------------------------------------------------
+anchor.schedule_prewarm_ui()
+nuke.addOnScriptLoad(anchor.schedule_prewarm_ui)
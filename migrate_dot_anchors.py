@@ -0,0 +1,99 @@
+"""One-time migration of legacy labelled-Dot anchors to explicit anchor markers.
+
+Dot anchors made before DOT_ANCHOR_KNOB_NAME existed are only recognised by a
+heuristic (link.is_legacy_dot_anchor()), which reads labels and knobs on every
+Dot and also matches ordinary labelled Dots.  This migration stamps the marker
+on the legacy Dot anchors that some link resolves to, so that with
+prefs.legacy_dot_anchors turned off a Dot is an anchor exactly when it carries
+the marker.  Labelled Dots nothing links to are left alone; they can still be
+made anchors with Edit > Anchors > Anchor.
+
+Nodes are only given the hidden marker knob: names, labels and colors are
+unchanged, so existing links keep resolving by their stored FQNNs.
+
+Headless use, saving each script in place:
+
+    nuke -t migrate_dot_anchors.py shot_v001.nk [shot_v002.nk ...]
+"""
+
+import sys
+
+import nuke
+
+import prefs
+from link import (
+    FqnnResolver,
+    add_dot_anchor_knob,
+    bump_anchor_generation,
+    is_legacy_dot_anchor,
+    is_link,
+)
+from util import undo_group
+
+
+def find_legacy_dot_anchors(nodes=None):
+    """Return the legacy Dot anchors that at least one link resolves to.
+
+    *nodes* defaults to every node in the script, Groups included.  Links are
+    resolved as reconnecting them would (by anchor ID, then stored FQNN), so a
+    Dot is found whatever renames its links have been through.
+    """
+    if nodes is None:
+        nodes = nuke.allNodes(recurseGroups=True)
+    resolver = FqnnResolver()
+    dot_anchors = {}
+    for node in nodes:
+        if not is_link(node):
+            continue
+        target = resolver.find_anchor_node(node)
+        if target is not None and is_legacy_dot_anchor(target):
+            dot_anchors.setdefault(target.fullName(), target)
+    return list(dot_anchors.values())
+
+
+def migrate_legacy_dot_anchors():
+    """Mark every linked legacy Dot anchor in the script, as one undo step.
+
+    Returns the number of Dots marked.
+    """
+    dot_anchors = find_legacy_dot_anchors()
+    if dot_anchors:
+        with undo_group("Migrate Dot Anchors"):
+            for dot_node in dot_anchors:
+                add_dot_anchor_knob(dot_node)
+    return len(dot_anchors)
+
+
+def migrate_legacy_dot_anchors_command():
+    """Menu entry point: migrate, then offer to turn legacy Dot anchor detection off."""
+    if not prefs.plugin_enabled:
+        return
+    count = migrate_legacy_dot_anchors()
+    message = f"Marked {count} legacy Dot anchor(s)."
+    if not prefs.legacy_dot_anchors:
+        nuke.message(message)
+        return
+    if nuke.ask(message + "\n\nTurn off legacy Dot anchor detection?  Unmarked labelled "
+                "Dots, in this and every other script, will no longer count as anchors."):
+        prefs.legacy_dot_anchors = False
+        prefs.save()
+        bump_anchor_generation()
+
+
+def main(argv):
+    """Headless entry point: migrate and save each .nk script named in *argv*."""
+    if not argv:
+        print("usage: nuke -t migrate_dot_anchors.py SCRIPT.nk [SCRIPT.nk ...]")
+        return 2
+    for path in argv:
+        nuke.scriptClear()
+        nuke.scriptOpen(path)
+        count = migrate_legacy_dot_anchors()
+        if count:
+            nuke.scriptSave(path)
+        print(f"{path}: marked {count} legacy Dot anchor(s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -9,102 +9,129 @@ import nuke
 import nukescripts
 
 import prefs
-from anchor import find_anchor_by_name
+from anchor import anchors_by_display_name, create_anchor_named
+from clipboard import build_sidecar, matching_references, read_sidecar, write_sidecar
 from constants import (
     ANCHOR_DEFAULT_COLOR,
     DOT_TYPE_KNOB_NAME,
     HIDDEN_INPUT_CLASSES,
     KNOB_NAME,
-    LINK_SOURCE_CLASSES,
     LOCAL_DOT_COLOR,
 )
+from copy_paste_plan import (
+    MAKE_LINK_DOT,
+    MAKE_LOCAL_DOT,
+    RECREATE_ANCHOR,
+    REFRESH_FQNN,
+    REPLACE_WITH_LINK,
+    REWIRE,
+    NodeDescriptor,
+    plan_copy,
+    plan_paste,
+    plan_references,
+)
 from link import (
     add_input_knob,
     find_anchor_node,
     get_fully_qualified_node_name,
-    get_link_class_for_source,
+    invalidate_anchor_index,
     is_anchor,
+    is_anchor_index_seeded,
     is_link,
+    refresh_link_fqnn,
+    register_anchor_in_index,
+    script_stem,
     setup_link_node,
+    uncollide_pasted_anchor_ids,
 )
+from util import undo_group
+
+# Recreated anchors' Reads are placed this far above the first Link Dot naming them
+RECREATED_READ_OFFSET = 200
 
 
-def copy_hidden(cut=False):  # noqa: C901 — complexity is inherent: 3 node-class paths × same/cross-script gate
+def copy_hidden(cut=False):
     """Add a hidden knob storing the original name of the node/node's input. We
     can then, when pasting, replace the node or reconnect its inputs.
 
     Setting cut to True does not store the original name on nodes in LINK_SOURCE_CLASSES,
     causing our paste routine to do a normal paste without replacement. This is required
     for cuts, as the original node will have been deleted.
+
+    The selection is described and planned by copy_paste_plan.plan_copy(), then
+    the plan is applied here.  What the stored references point at is written
+    to the clipboard sidecar (clipboard.py) for the paste to read.
     """
     if not prefs.plugin_enabled:
         nuke.nodeCopy(nukescripts.cut_paste_file())
         return
-    selected_nodes = nuke.selectedNodes()
-    for node in selected_nodes:
-        if is_link(node):
-            continue
-
-        # Path A — LINK_SOURCE_CLASSES file node: scan for an anchor whose input is this
-        # node and store the anchor's FQNN so paste can read the correct link class
-        # from the anchor's hidden knob. Falls back to the file node's own FQNN when
-        # no anchor points at it (legacy direct-file-node path).
-        if node.Class() in LINK_SOURCE_CLASSES:
-            if prefs.link_classes_paste_mode == 'passthrough':
-                # skip stamping; node copies plainly via nuke.nodeCopy() at end of function
-                continue
-            if cut:
-                stored_fqnn = ""
-            else:
-                anchor_for_node = None
-                for candidate in nuke.allNodes():
-                    if is_anchor(candidate) and candidate.input(0) is node:
-                        anchor_for_node = candidate
-                        break
-                if anchor_for_node is not None:
-                    stored_fqnn = get_fully_qualified_node_name(anchor_for_node)
-                else:
-                    # Legacy fallback: no anchor found, store the file node's own FQNN
-                    stored_fqnn = get_fully_qualified_node_name(node)
-            add_input_knob(node)
-            node[KNOB_NAME].setText(stored_fqnn)
-
-        # Path B — hidden-input Dot (or PostageStamp/NoOp with hide_input set):
-        # split on whether the upstream input is an anchor (Link Dot) or a plain node (Local Dot).
-        elif node.Class() in HIDDEN_INPUT_CLASSES and node['hide_input'].getValue():
-            input_node = node.input(0)
-            if input_node is None or input_node in selected_nodes:
-                stored_fqnn = ""
-                add_input_knob(node)
-            elif is_anchor(input_node):
-                # Link Dot: anchor-backed, cross-script capable.
-                # Override tile_color to canonical purple — setup_link_node() may apply a
-                # custom anchor color via find_node_color(), which we do not want here.
-                stored_fqnn = get_fully_qualified_node_name(input_node)
-                setup_link_node(input_node, node)
-                node['tile_color'].setValue(ANCHOR_DEFAULT_COLOR)
-                add_input_knob(node, dot_type='link')
-            else:
-                # Local Dot: plain-node-backed, same-script only.
-                # Restore Local appearance after setup_link_node() overwrites label/color.
-                stored_fqnn = get_fully_qualified_node_name(input_node)
-                setup_link_node(input_node, node)
-                source_label = input_node['label'].getText() or input_node.name()
-                node['label'].setValue(f"Local: {source_label}")
-                node['tile_color'].setValue(LOCAL_DOT_COLOR)
-                add_input_knob(node, dot_type='local')
-            node[KNOB_NAME].setText(stored_fqnn)
-
-        # Path C — existing anchor node (e.g. a NoOp named Anchor_*) being copied.
-        elif is_anchor(node):
-            stored_fqnn = "" if cut else get_fully_qualified_node_name(node)
-            add_input_knob(node)
-            node[KNOB_NAME].setText(stored_fqnn)
+    nodes_by_key = {}
+    selection = _describe_nodes(nuke.selectedNodes(), nodes_by_key)
+    graph = {descriptor.key: descriptor for descriptor in selection}
+    # Hidden-input nodes are planned from their input, which may sit outside the selection.
+    upstream_nodes = [
+        nodes_by_key[descriptor.key].input(0)
+        for descriptor in selection
+        if descriptor.node_class in HIDDEN_INPUT_CLASSES and descriptor.hide_input
+        and descriptor.inputs and descriptor.inputs[0] is not None
+        and descriptor.inputs[0] not in graph
+    ]
+    for descriptor in _describe_nodes(upstream_nodes, nodes_by_key):
+        graph[descriptor.key] = descriptor
+
+    plan = plan_copy(
+        selection,
+        graph,
+        cut=cut,
+        passthrough=prefs.link_classes_paste_mode == 'passthrough',
+        anchor_for_input=_anchor_for_input_lookup(nodes_by_key),
+    )
+    _apply_copy_plan(plan, nodes_by_key)
+    write_sidecar(build_sidecar(
+        script_stem(),
+        {fqnn: (nodes_by_key[key], dot_type)
+         for fqnn, (key, dot_type) in plan_references(plan).items()},
+        _stored_fqnns(nodes_by_key[descriptor.key] for descriptor in selection),
+    ))
 
     # now that we've stored the info we need on the nodes, do a regular copy
     nuke.nodeCopy(nukescripts.cut_paste_file())
 
 
+def _stored_fqnns(nodes):
+    """Return the non-empty stored FQNNs on *nodes*, as the clipboard will carry them."""
+    return [node[KNOB_NAME].getText() for node in nodes
+            if KNOB_NAME in node.knobs() and node[KNOB_NAME].getText()]
+
+
+def _apply_copy_plan(plan, nodes_by_key):
+    """Carry out a plan_copy() plan on the nodes in *nodes_by_key*.
+
+    Hidden-input Dots are set up in one setup_link_node() call each, with the
+    color, label and FQNN the plan already knows, so no Preferences color
+    lookup or FQNN computation is repeated per Dot.
+    """
+    for step in plan:
+        action, node = step[0], nodes_by_key[step[1]]
+        if action == REFRESH_FQNN:
+            refresh_link_fqnn(node)
+        elif action == MAKE_LINK_DOT:
+            # Link Dot: anchor-backed, cross-script capable, in canonical purple rather
+            # than a custom anchor color.
+            _action, _key, input_key, stored_fqnn = step
+            setup_link_node(nodes_by_key[input_key], node, tile_color=ANCHOR_DEFAULT_COLOR,
+                            fqnn=stored_fqnn, dot_type='link')
+        elif action == MAKE_LOCAL_DOT:
+            # Local Dot: plain-node-backed, same-script only.
+            _action, _key, input_key, stored_fqnn, source_label = step
+            setup_link_node(nodes_by_key[input_key], node, tile_color=LOCAL_DOT_COLOR,
+                            label=f"Local: {source_label}", fqnn=stored_fqnn,
+                            dot_type='local')
+        else:
+            add_input_knob(node)
+            node[KNOB_NAME].setText(step[2])
+
+
 def cut_hidden():
     """Cut selected nodes (i.e. copy then delete). Do not store the original
     name in KNOB_NAME. This will disable replacement on paste.
@@ -121,115 +148,185 @@ def cut_hidden():
         nuke.delete(node)
 
 
-def _extract_display_name_from_fqnn(stored_fqnn):
-    """Extract the anchor display name from a stored FQNN for cross-script lookup.
-
-    Returns the display name string (with ANCHOR_PREFIX stripped) if the last
-    segment of the FQNN starts with ANCHOR_PREFIX, or None otherwise.
-    Returns None for empty or blank FQNNs.
+def describe_node(node):
+    """Return the copy_paste_plan.NodeDescriptor for *node*, keyed on its fullName()."""
+    knobs = node.knobs()
+    input_nodes = [node.input(index) for index in range(node.inputs())]
+    return NodeDescriptor(
+        node.fullName(),
+        node.Class(),
+        name=node.name(),
+        label=node['label'].getText() if 'label' in knobs else '',
+        fqnn=get_fully_qualified_node_name(node),
+        xpos=node.xpos(),
+        ypos=node.ypos(),
+        inputs=[None if input_node is None else input_node.fullName()
+                for input_node in input_nodes],
+        is_anchor=is_anchor(node),
+        is_link=is_link(node),
+        hide_input='hide_input' in knobs and bool(node['hide_input'].getValue()),
+        stored_fqnn=node[KNOB_NAME].getText() if KNOB_NAME in knobs else None,
+        dot_type=node[DOT_TYPE_KNOB_NAME].getValue() if DOT_TYPE_KNOB_NAME in knobs else None,
+    )
+
+
+def _describe_nodes(nodes, nodes_by_key):
+    """Return descriptors for *nodes*, recording each node under its key in *nodes_by_key*."""
+    descriptors = []
+    for node in nodes:
+        descriptor = describe_node(node)
+        nodes_by_key[descriptor.key] = node
+        descriptors.append(descriptor)
+    return descriptors
+
+
+def _describing(lookup, nodes_by_key):
+    """Wrap a node *lookup* so it returns a descriptor (or None) for planning."""
+    def describing_lookup(value):
+        node = lookup(value)
+        if not node:
+            return None
+        return _describe_nodes([node], nodes_by_key)[0]
+    return describing_lookup
+
+
+def _anchor_for_input_lookup(nodes_by_key):
+    """Return plan_copy()'s anchor_for_input lookup, scanning allNodes() once on first use."""
+    anchors_by_input_key = None
+
+    def anchor_by_input_key(key):
+        nonlocal anchors_by_input_key
+        if anchors_by_input_key is None:
+            anchors_by_input_key = {}
+            for candidate in nuke.allNodes():
+                input_node = candidate.input(0)
+                if input_node is not None and is_anchor(candidate):
+                    anchors_by_input_key.setdefault(input_node.fullName(), candidate)
+        return anchors_by_input_key.get(key)
+
+    return _describing(anchor_by_input_key, nodes_by_key)
+
+
+def _anchor_by_name_lookup(nodes_by_key):
+    """Return plan_paste()'s find_anchor_by_name, resolving every name against one scan."""
+    anchors_by_name = None
+
+    def anchor_by_name(display_name):
+        nonlocal anchors_by_name
+        if anchors_by_name is None:
+            anchors_by_name = anchors_by_display_name()
+        anchor = anchors_by_name.get(display_name)
+        if anchor is None and is_anchor_index_seeded():
+            # As in find_anchor_by_name(): a seeded miss earns one full rescan.
+            invalidate_anchor_index()
+            anchors_by_name = anchors_by_display_name()
+            anchor = anchors_by_name.get(display_name)
+        return anchor
+
+    return _describing(anchor_by_name, nodes_by_key)
+
+
+def _sidecar_references(pasted):
+    """Return the clipboard sidecar's references, or None unless it was written for *pasted*."""
+    return matching_references(
+        read_sidecar(),
+        [descriptor.stored_fqnn for descriptor in pasted if descriptor.stored_fqnn],
+    )
+
+
+def _offer_to_recreate_anchors(missing_anchors):
+    """Ask whether to recreate anchors the pasted Link Dots name but this script lacks.
+
+    *missing_anchors* maps each display name to (file path, color, Link Dots).
+    Each accepted anchor gets a Read of the sidecar's file path, placed above
+    its first Dot, and the Dots are linked to it.  Nothing is asked or created
+    without a GUI.
     """
-    from constants import ANCHOR_PREFIX
-    if not stored_fqnn:
-        return None
-    node_full_name = stored_fqnn.split('.')[-1]
-    if node_full_name.startswith(ANCHOR_PREFIX):
-        return node_full_name[len(ANCHOR_PREFIX):]
-    return None
+    if not nuke.GUI or not nuke.ask(
+            f"Recreate {len(missing_anchors)} missing anchor(s) from the copied script?"):
+        return
+    for display_name, (file_path, color, link_dots) in missing_anchors.items():
+        read_node = nuke.nodes.Read(file=file_path)
+        read_node.setXYpos(link_dots[0].xpos(), link_dots[0].ypos() - RECREATED_READ_OFFSET)
+        anchor_node = create_anchor_named(display_name, input_node=read_node, color=color or None)
+        for link_dot in link_dots:
+            setup_link_node(anchor_node, link_dot)
 
 
-def paste_hidden():  # noqa: C901 — complexity is inherent: anchor/link/dot paths × same/cross-script gate
-    if not prefs.plugin_enabled:
-        return nuke.nodePaste(nukescripts.cut_paste_file())
-    last_pasted_node = nuke.nodePaste(nukescripts.cut_paste_file())
-    selected_nodes = nuke.selectedNodes()
+def _apply_paste_plan(plan, pasted, nodes_by_key):
+    """Carry out a plan_paste() plan and select the result once; return the new selection.
 
-    for node in selected_nodes:
-        if KNOB_NAME not in node.knobs():
-            # we haven't stored any info on this node, do nothing
-            continue
-
-        input_node = find_anchor_node(node)
-
-        if node.Class() in LINK_SOURCE_CLASSES or is_anchor(node):
-            # Path A/C: file node or anchor node pasted → replace with a link node.
-            # find_anchor_node() resolves the stored FQNN; None means cross-script or
-            # deleted.
-            if not input_node:
-                # Cross-script case: find_anchor_node() returned None because the
-                # stored FQNN belongs to a different script. Dot anchors and file
-                # nodes are left disconnected as placeholders.
-                # BUG-02 fix: anchor pasted cross-script stays an anchor.
-                # Do not attempt replacement regardless of whether a same-named anchor
-                # exists in the destination. Leave the placeholder in place.
-                continue
-            nukescripts.clear_selection_recursive()
-            node["selected"].setValue(True)
-            link_node = nuke.createNode(get_link_class_for_source(input_node))
-            setup_link_node(input_node, link_node)
-            link_node.setXYpos(node.xpos(), node.ypos())
-            selected_nodes.remove(node)
-            selected_nodes.append(link_node)
+    Links are created with nuke.nodes, so there is no per-node selection
+    juggling or autoplace; the caller wraps this in one undo group.
+    """
+    links_by_replaced_key = {}
+    missing_anchors = {}
+    for step in plan:
+        action, node = step[0], nodes_by_key[step[1]]
+        if action == REPLACE_WITH_LINK:
+            _action, key, source_key, link_class, xpos, ypos = step
+            link_node = getattr(nuke.nodes, link_class)()
+            setup_link_node(nodes_by_key[source_key], link_node)
+            link_node.setXYpos(xpos, ypos)
+            links_by_replaced_key[key] = link_node
             nuke.delete(node)
-
-        elif node.Class() in HIDDEN_INPUT_CLASSES:
-            # Path B: hidden-input Dot (Link Dot or Local Dot).
-            # Determine DOT_TYPE from the explicit knob if present; fall back to FQNN inspection
-            # for pre-Phase-5 nodes that lack the knob.
-            stored_fqnn = node[KNOB_NAME].getText()
-            if DOT_TYPE_KNOB_NAME in node.knobs():
-                dot_type = node[DOT_TYPE_KNOB_NAME].getValue()
-            else:
-                # Backward compat: infer from FQNN — anchor-prefix last segment → 'link',
-                # else → 'local'.
-                display_name_for_compat = _extract_display_name_from_fqnn(stored_fqnn)
-                dot_type = 'link' if display_name_for_compat is not None else 'local'
-
-            # Detect cross-script: compare stored FQNN script stem against current script stem.
-            # Using FQNN stem comparison (not find_anchor_node() return value) as the cross-script
-            # gate prevents same-stem false positives where find_anchor_node() returns a same-named
-            # node from the destination script for a Local Dot.
-            current_stem = nuke.root().name().split('.')[0]
-            fqnn_stem = stored_fqnn.split('.')[0] if stored_fqnn else ''
-            is_cross_script = bool(fqnn_stem) and (fqnn_stem != current_stem)
-
-            if is_cross_script or not input_node:
-                # Cross-script (or unresolvable FQNN): gate on DOT_TYPE.
-                if dot_type == 'link':
-                    # Link Dot: attempt name-based reconnect to same-named anchor in destination.
-                    display_name = _extract_display_name_from_fqnn(stored_fqnn)
-                    if display_name:
-                        destination_anchor = find_anchor_by_name(display_name)
-                        if destination_anchor:
-                            setup_link_node(destination_anchor, node)
-                            # BUG-01 fix: removed ANCHOR_DEFAULT_COLOR overwrite;
-                            # setup_link_node() already applies the anchor's real tile_color
-                            # via find_node_color().
-                # Local Dot: silent no-op — do not reconnect under any circumstances.
-                continue
-
-            # Same-script: reconnect to the original source by identity.
-            # Read dot_type before calling setup_link_node() because setup_link_node()
-            # calls add_input_knob() without dot_type, which strips the DOT_TYPE_KNOB_NAME
-            # knob. Saving the value here makes the restoration guard reliable regardless
-            # of whether the knob survives setup_link_node().
-            saved_dot_type = (
-                node[DOT_TYPE_KNOB_NAME].getValue()
-                if DOT_TYPE_KNOB_NAME in node.knobs()
-                else None
-            )
-            setup_link_node(input_node, node)
-            if saved_dot_type == 'local':
+        elif action == REWIRE:
+            _action, _key, input_index, replaced_key = step
+            node.setInput(input_index, links_by_replaced_key[replaced_key])
+        elif action == RECREATE_ANCHOR:
+            _action, _key, display_name, file_path, color = step
+            missing_anchors.setdefault(display_name, (file_path, color, []))[2].append(node)
+        else:
+            _action, _key, source_key, dot_type = step
+            source = nodes_by_key[source_key]
+            setup_link_node(source, node)
+            if dot_type == 'local':
                 # Re-add the DOT_TYPE knob that setup_link_node stripped, then restore
                 # Local Dot appearance (label and color overwritten by setup_link_node).
                 add_input_knob(node, dot_type='local')
-                source_label = input_node['label'].getText() or input_node.name()
+                source_label = source['label'].getText() or source.name()
                 node['label'].setValue(f"Local: {source_label}")
                 node['tile_color'].setValue(LOCAL_DOT_COLOR)
+    if missing_anchors:
+        _offer_to_recreate_anchors(missing_anchors)
 
-    # it's possible we changed selection, reset it
+    selection = [links_by_replaced_key.get(descriptor.key) or nodes_by_key[descriptor.key]
+                 for descriptor in pasted]
     nukescripts.clear_selection_recursive()
-    for node in selected_nodes:
+    for node in selection:
         node['selected'].setValue(True)
+        if is_anchor(node):
+            # A pasted anchor is new to this script; register it so a manifest-seeded
+            # anchor index keeps listing it.
+            register_anchor_in_index(node)
+    return selection
+
+
+def paste_hidden():
+    """Paste, then replace and reconnect the pasted nodes as one undo step.
+
+    The pasted nodes are described and planned by copy_paste_plan.plan_paste(),
+    then changed by _apply_paste_plan() with a single selection update at the
+    end, so the cost is linear in the number of pasted nodes.
+    """
+    if not prefs.plugin_enabled:
+        return nuke.nodePaste(nukescripts.cut_paste_file())
+    with undo_group("Paste"):
+        last_pasted_node = nuke.nodePaste(nukescripts.cut_paste_file())
+        pasted_nodes = nuke.selectedNodes()
+        # Copies of anchors pasted beside their originals must not share their IDs.
+        uncollide_pasted_anchor_ids(pasted_nodes)
+        nodes_by_key = {}
+        pasted = _describe_nodes(pasted_nodes, nodes_by_key)
+        plan = plan_paste(
+            pasted,
+            script_stem(),
+            _describing(lambda descriptor: find_anchor_node(nodes_by_key[descriptor.key]),
+                        nodes_by_key),
+            _anchor_by_name_lookup(nodes_by_key),
+            _sidecar_references(pasted),
+        )
+        _apply_paste_plan(plan, pasted, nodes_by_key)
 
     # same return as nuke.nodePaste()
     return last_pasted_node
@@ -7,6 +7,10 @@ Module-level variables (read these directly after import):
     plugin_enabled          bool  — True if the plugin is active
     link_classes_paste_mode str   — 'create_link' or 'passthrough'
     custom_colors           list  — list of 0xRRGGBBAA color ints
+    anchor_manifest_enabled bool  — True to store an anchor manifest on the Root node on save
+    prewarm_ui_enabled      bool  — True to build pickers and the color dialog during idle time
+    expression_link_labels  bool  — True to label new links with an expression reading the anchor
+    legacy_dot_anchors      bool  — True to treat unmarked labelled Dots as anchors
 """
 
 import json
@@ -20,6 +24,10 @@ from constants import PREFS_PATH, USER_PALETTE_PATH
 plugin_enabled = True
 link_classes_paste_mode = "create_link"
 custom_colors = []
+anchor_manifest_enabled = False
+prewarm_ui_enabled = False
+expression_link_labels = False
+legacy_dot_anchors = True
 
 
 def _migrate_from_old_palette():
@@ -46,7 +54,8 @@ def _load():
     back to defaults. Per-key type validation ensures corrupt individual values
     do not poison valid ones.
     """
-    global plugin_enabled, link_classes_paste_mode, custom_colors
+    global plugin_enabled, link_classes_paste_mode, custom_colors, anchor_manifest_enabled, \
+        prewarm_ui_enabled, expression_link_labels, legacy_dot_anchors
     if not os.path.exists(PREFS_PATH):
         _migrate_from_old_palette()
         save()
@@ -61,6 +70,14 @@ def _load():
         if isinstance(data.get('custom_colors'), list):
             custom_colors = [int(color_value) for color_value in data['custom_colors']
                              if isinstance(color_value, (int, float))]
+        if isinstance(data.get('anchor_manifest_enabled'), bool):
+            anchor_manifest_enabled = data['anchor_manifest_enabled']
+        if isinstance(data.get('prewarm_ui_enabled'), bool):
+            prewarm_ui_enabled = data['prewarm_ui_enabled']
+        if isinstance(data.get('expression_link_labels'), bool):
+            expression_link_labels = data['expression_link_labels']
+        if isinstance(data.get('legacy_dot_anchors'), bool):
+            legacy_dot_anchors = data['legacy_dot_anchors']
     except (OSError, ValueError, json.JSONDecodeError):
         pass  # silent fallback — module-level defaults remain
 
@@ -78,6 +95,10 @@ def save():
                 'plugin_enabled': plugin_enabled,
                 'link_classes_paste_mode': link_classes_paste_mode,
                 'custom_colors': custom_colors,
+                'anchor_manifest_enabled': anchor_manifest_enabled,
+                'prewarm_ui_enabled': prewarm_ui_enabled,
+                'expression_link_labels': expression_link_labels,
+                'legacy_dot_anchors': legacy_dot_anchors,
             },
             file_handle,
         )
@@ -6,8 +6,12 @@ license: http://unlicense.org/
 
 __version__ = "2.0"
 
+import contextlib
+import heapq
 import os
 import re
+import threading
+import time
 
 try:
     from PySide6 import QtCore, QtGui, QtWidgets
@@ -16,8 +20,21 @@ except ImportError:
     from PySide2 import QtCore, QtGui, QtWidgets
     from PySide2.QtCore import Qt
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Item data role carrying the matched character positions for highlighting
+MATCH_POSITIONS_ROLE = Qt.UserRole + 1
+
 
 class TabTabTabPlugin:
+    # Set True to let Ctrl+Enter build a pick list for invoke_many(); while
+    # False, Ctrl+Enter acts as Enter
+    supports_multi_select = False
+
     def get_items(self):
         """Return list of {'menuobj': ..., 'menupath': str} dicts."""
         raise NotImplementedError
@@ -26,10 +43,28 @@ class TabTabTabPlugin:
         """Return path to JSON weights file, or None to skip persistence."""
         raise NotImplementedError
 
+    def get_change_token(self):
+        """Return a cheap value that changes whenever get_items() would change.
+
+        While the token is unchanged, a persistent picker skips get_items()
+        when it is shown again. The default, None, means "unknown": items are
+        fetched on every show.
+        """
+        return None
+
     def invoke(self, thing):
         """Trigger the selected menu item."""
         raise NotImplementedError
 
+    def invoke_many(self, things):
+        """Trigger several items picked in one session (Ctrl+Enter), in picking order.
+
+        Only called when supports_multi_select is True. Plugins can override
+        this to batch the work.
+        """
+        for thing in things:
+            self.invoke(thing)
+
     def get_icon(self, menuobj):
         """Return a QIcon for menuobj, or None.
         Default works for any Qt object whose .icon() returns a QIcon."""
@@ -53,10 +88,13 @@ class TabTabTabPlugin:
         return (None, None)
 
 
+_MENU_NUMBER_PREFIX = re.compile(r'^\s*\d+ \s*')
+
+
 def _normalize_qt_item_name(item):
     item_name = item.text()
     item_name = item_name.replace("&", "")
-    item_name = re.sub(r'^\s*\d+ \s*', '', item_name).strip()
+    item_name = _MENU_NUMBER_PREFIX.sub('', item_name).strip()
     return item_name
 
 
@@ -112,16 +150,7 @@ def consec_find(needle, haystack, anchored=False):
     if "[" not in needle:
         haystack = haystack.rpartition(" [")[0]
 
-    stripped_haystack = haystack.replace(' ', '').replace('-', '').replace('_', '')
-
-    if anchored:
-        if haystack.startswith(needle) or stripped_haystack.startswith(needle):
-            return True
-
-    else:
-        if needle in haystack or needle in stripped_haystack:
-            return True
-    return False
+    return _consec_match(needle, haystack, _strip_separators(haystack), anchored)
 
 
 def nonconsec_find(needle, haystack, anchored=False):
@@ -159,67 +188,500 @@ def nonconsec_find(needle, haystack, anchored=False):
     if "[" not in needle:
         haystack = haystack.rpartition(" [")[0]
 
-    if len(haystack) == 0 and len(needle) > 0:
-        # "a" is not in ""
-        return False
+    return _nonconsec_match(needle, haystack, anchored)
 
-    elif len(needle) == 0 and len(haystack) > 0:
-        # "" is in "blah"
-        return True
 
-    elif len(needle) == 0 and len(haystack) == 0:
-        # ..?
-        return True
+def _strip_separators(text):
+    return text.replace(' ', '').replace('-', '').replace('_', '')
+
+
+def _char_mask(text):
+    """Return a 64-bit mask with one bit set per distinct character of *text*.
+
+    Characters share bits modulo 64, so the mask can only prove a miss: if
+    needle_mask & ~haystack_mask is non-zero, some needle character is absent.
+    """
+    mask = 0
+    for char in set(text):
+        mask |= 1 << (ord(char) & 63)
+    return mask
+
+
+def _consec_match(needle, haystack, stripped_haystack, anchored):
+    """consec_find() on a haystack that already had the " [...]" suffix handled."""
+    if anchored:
+        return haystack.startswith(needle) or stripped_haystack.startswith(needle)
+    return needle in haystack or needle in stripped_haystack
 
-    # Turn haystack into list of characters (as strings are immutable)
-    haystack = [hay for hay in str(haystack)]
+
+def _nonconsec_match(needle, haystack, anchored):
+    """nonconsec_find() on a haystack that already had the " [...]" suffix handled.
+
+    Walks the haystack with str.find instead of copying it into a list, so a
+    match allocates nothing.
+    """
+    if not haystack:
+        # "a" is not in "", but "" is
+        return not needle
+    if not needle:
+        return True
 
     if needle.startswith(" "):
         # "[space]abc" does consecutive search for "abc" in "abcdef"
-        if anchored:
-            if "".join(haystack).startswith(needle.lstrip(" ")):
-                return True
-        else:
-            if needle.lstrip(" ") in "".join(haystack):
-                return True
+        bare = needle.lstrip(" ")
+        if haystack.startswith(bare) if anchored else bare in haystack:
+            return True
 
+    pos = 0
     if anchored:
         if needle[0] != haystack[0]:
             return False
-        else:
-            # First letter matches, remove it for further matches
-            needle = needle[1:]
-            del haystack[0]
+        # First letter matches, continue after it
+        needle = needle[1:]
+        pos = 1
 
+    find = haystack.find
     for needle_atom in needle:
-        try:
-            needle_pos = haystack.index(needle_atom)
-        except ValueError:
+        pos = find(needle_atom, pos)
+        if pos < 0:
             return False
-        else:
-            # Dont find string in same pos or backwards again
-            del haystack[:needle_pos + 1]
+        # Dont find string in same pos or backwards again
+        pos += 1
     return True
 
 
+# Scoring constants for fuzzy_match(), modelled on fzf's v1 algorithm
+SCORE_MATCH = 16
+SCORE_GAP_START = -3
+SCORE_GAP_EXTENSION = -1
+BONUS_BOUNDARY = 8
+BONUS_CAMEL = 7
+BONUS_CONSECUTIVE = 4
+BONUS_FIRST_CHAR_MULTIPLIER = 2
+_WORD_SEPARATORS = frozenset(" _-/[.")
+
+
+def _char_bonus(haystack, original, pos):
+    """Bonus for a match at *pos*: word start, camelCase hump or letter-to-digit step."""
+    if pos == 0:
+        return BONUS_BOUNDARY
+    prev = haystack[pos - 1]
+    if prev in _WORD_SEPARATORS:
+        return BONUS_BOUNDARY
+    if original is not None and original[pos - 1].islower() and original[pos].isupper():
+        return BONUS_CAMEL
+    if haystack[pos].isdigit() and not prev.isdigit():
+        return BONUS_CAMEL
+    return 0
+
+
+def fuzzy_match(needle, haystack, original=None):
+    """Score *needle* as a subsequence of *haystack*, returning (score, positions) or None.
+
+    Both strings are expected lowercased; *original* is the same text in its
+    original case (same length) and enables camelCase bonuses.
+
+    Like fzf's v1 matcher: a forward scan finds where the first complete
+    match ends, then a backward scan from there picks the tightest window
+    and scores it. Matches at word boundaries (after " _-/[." or at the
+    start), camelCase humps and runs of consecutive characters score higher;
+    gaps between matched characters cost a little.
+
+    >>> fuzzy_match("pm", "plate_main")
+    (49, [0, 6])
+    >>> fuzzy_match("pm", "plate") is None
+    True
+    """
+    if not needle:
+        return 0, []
+
+    pos = -1
+    find = haystack.find
+    for char in needle:
+        pos = find(char, pos + 1)
+        if pos < 0:
+            return None
+
+    positions = [0] * len(needle)
+    rfind = haystack.rfind
+    for i in range(len(needle) - 1, -1, -1):
+        pos = rfind(needle[i], 0, pos + 1)
+        positions[i] = pos
+        pos -= 1
+
+    if original is not None and len(original) != len(haystack):
+        original = None
+
+    score = 0
+    prev = None
+    chunk_bonus = 0
+    for i, pos in enumerate(positions):
+        bonus = _char_bonus(haystack, original, pos)
+        if prev is not None and pos == prev + 1:
+            # A run keeps the bonus of the character that started it
+            bonus = max(bonus, chunk_bonus, BONUS_CONSECUTIVE)
+        else:
+            if prev is not None:
+                score += SCORE_GAP_START + SCORE_GAP_EXTENSION * (pos - prev - 2)
+            chunk_bonus = bonus
+        if i == 0:
+            bonus *= BONUS_FIRST_CHAR_MULTIPLIER
+        score += SCORE_MATCH + bonus
+        prev = pos
+    return score, positions
+
+
+# How many match points a fully-weighted (most used) item is worth when ranking
+WEIGHT_SCALE = 48
+
+
+def rank_score(match_score, weight):
+    """Combine a fuzzy_match() score with a 0..1 usage weight into one sort key."""
+    return match_score + weight * WEIGHT_SCALE
+
+
+def bold_runs(text, positions):
+    """Split *text* into [(chunk, is_matched), ...] runs for highlighted painting."""
+    matched = set(positions)
+    runs = []
+    for i, char in enumerate(text):
+        is_matched = i in matched
+        if runs and runs[-1][1] == is_matched:
+            runs[-1][0] += char
+        else:
+            runs.append([char, is_matched])
+    return [tuple(run) for run in runs]
+
+
+class _SearchEntry(object):
+    """One picker item with its search strings and character masks precomputed."""
+
+    __slots__ = (
+        'item', 'text', 'search', 'name', 'search_stripped', 'name_stripped',
+        'search_mask', 'name_mask',
+    )
+
+    def __init__(self, item, text, search):
+        self.item = item
+        self.text = text
+        self.search = search
+        self.name = search.rpartition(" [")[0]
+        self.search_stripped = _strip_separators(search)
+        self.name_stripped = _strip_separators(self.name)
+        self.search_mask = _char_mask(search)
+        self.name_mask = _char_mask(self.name)
+
+    def with_item(self, item):
+        """Return a copy of this entry bound to *item* (same menupath, new object)."""
+        entry = _SearchEntry.__new__(_SearchEntry)
+        for slot in self.__slots__:
+            setattr(entry, slot, getattr(self, slot))
+        entry.item = item
+        return entry
+
+
+class SearchIndex(object):
+    """Precomputed search data for a list of {'menuobj', 'menupath'} items.
+
+    Building the index does all per-item string work once, so each keystroke
+    only runs a bitmask prefilter and then matches the surviving entries with
+    plain str operations. With NumPy available, the prefilter runs vectorised
+    over all masks for large lists (NUMPY_MIN_ITEMS and up).
+
+    Passing the *previous* index reuses its entries for unchanged menupaths,
+    so refreshing a list where only a few items changed is cheap.
+    """
+
+    NUMPY_MIN_ITEMS = 2000
+
+    def __init__(self, mlist, drop_first_char=False, previous=None):
+        reusable = {}
+        if previous is not None and previous._text_offset == (1 if drop_first_char else 0):
+            reusable = {entry.item['menupath']: entry for entry in previous.entries}
+
+        self.entries = []
+        for n in mlist:
+            cached = reusable.get(n['menupath'])
+            if cached is not None:
+                self.entries.append(cached if cached.item is n else cached.with_item(n))
+                continue
+            # Turn "3D/Shader/Phong" into "Phong [3D/Shader]"
+            menupath = n['menupath'].replace("&", "")
+            head, _, tail = menupath.rpartition("/")
+            uiname = "%s [%s]" % (tail, head)
+            search = uiname.lower()
+            if drop_first_char:
+                search = search[1:]
+            self.entries.append(_SearchEntry(n, uiname, search))
+        self._text_offset = 1 if drop_first_char else 0
+        self._mask_arrays = None
+        self._first_char_buckets = [None, None]  # [search, name] -> {char: [entry, ...]}
+
+    def _first_char_bucket(self, char, use_name):
+        """Entries whose haystack, or its separator-stripped form, starts with *char*."""
+        key = 1 if use_name else 0
+        buckets = self._first_char_buckets[key]
+        if buckets is None:
+            buckets = self._first_char_buckets[key] = {}
+            for entry in self.entries:
+                if use_name:
+                    first, stripped_first = entry.name[:1], entry.name_stripped[:1]
+                else:
+                    first, stripped_first = entry.search[:1], entry.search_stripped[:1]
+                buckets.setdefault(first, []).append(entry)
+                if stripped_first != first:
+                    buckets.setdefault(stripped_first, []).append(entry)
+        return buckets.get(char, [])
+
+    def _candidates(self, entries, needle_mask, use_name):
+        if not needle_mask:
+            return entries
+        if entries is self.entries and numpy is not None and len(entries) >= self.NUMPY_MIN_ITEMS:
+            if self._mask_arrays is None:
+                self._mask_arrays = (
+                    numpy.array([e.search_mask for e in entries], dtype=numpy.uint64),
+                    numpy.array([e.name_mask for e in entries], dtype=numpy.uint64),
+                )
+            masks = self._mask_arrays[1 if use_name else 0]
+            hits = numpy.flatnonzero((masks & numpy.uint64(needle_mask)) == numpy.uint64(needle_mask))
+            return [entries[i] for i in hits.tolist()]
+        if use_name:
+            return [e for e in entries if not needle_mask & ~e.name_mask]
+        return [e for e in entries if not needle_mask & ~e.search_mask]
+
+    def scored_chunks(self, needle, anchored=True, force_consecutive=False, chunk_size=None):
+        """Yield [(entry, score, positions), ...] per *chunk_size* candidates.
+
+        Entries match as consec_find() and then nonconsec_find() would on each
+        item's lowercased "Name [Menu/Path]" string, with consecutive matches
+        first in each chunk; positions index entry.text. Chunks let a caller
+        publish partial results or stop early.
+
+        Matching and scoring share one pass, as in fzf: without spaces in
+        *needle*, fuzzy_match()'s forward scan is itself the non-consecutive
+        match test, so each candidate is walked once rather than matched and
+        then scored.
+        """
+        use_name = "[" not in needle
+        if anchored and needle and needle[0] != " ":
+            # An anchored match must start on the needle's first character
+            entries = self._first_char_bucket(needle[0], use_name)
+        else:
+            entries = self.entries
+        # Every match path needs all non-space needle characters in the haystack
+        bare_needle = needle.replace(" ", "")
+        candidates = self._candidates(entries, _char_mask(bare_needle), use_name)
+        if not chunk_size:
+            chunk_size = max(1, len(candidates))
+        # Spaces select search modes that fuzzy_match() does not model
+        scan_is_match = bare_needle == needle
+
+        for start in range(0, len(candidates), chunk_size):
+            consecutive = []
+            non_consecutive = []
+            for entry in candidates[start:start + chunk_size]:
+                if use_name:
+                    haystack, stripped = entry.name, entry.name_stripped
+                else:
+                    haystack, stripped = entry.search, entry.search_stripped
+                if _consec_match(needle, haystack, stripped, anchored):
+                    matches = consecutive
+                    scored = None
+                elif force_consecutive:
+                    continue
+                elif scan_is_match:
+                    if anchored and haystack[:1] != needle[:1]:
+                        continue
+                    scored = self._fuzzy_match(entry, bare_needle, haystack)
+                    if scored is None:
+                        continue
+                    matches = non_consecutive
+                elif _nonconsec_match(needle, haystack, anchored):
+                    matches = non_consecutive
+                    scored = None
+                else:
+                    continue
+                if scored is None:
+                    # Only a stripped-separator match leaves the scorer unable to place it
+                    scored = self._fuzzy_match(entry, bare_needle, haystack) or (0, [])
+                matches.append((entry,) + self._display_positions(scored))
+            yield consecutive + non_consecutive
+
+    def _fuzzy_match(self, entry, needle, haystack):
+        offset = self._text_offset
+        return fuzzy_match(needle, haystack, entry.text[offset:offset + len(haystack)])
+
+    def _display_positions(self, scored):
+        """Shift fuzzy_match() positions from the haystack onto entry.text."""
+        score, positions = scored
+        if self._text_offset:
+            positions = [pos + self._text_offset for pos in positions]
+        return score, positions
+
+
+def parse_filter(filtertext):
+    """Split picker input into (needle, anchored, force_consecutive, force_non_anchored).
+
+    Two leading spaces search for a consecutive substring anywhere, one
+    leading space searches fuzzily anywhere, and "*" / "[" are the legacy
+    non-anchored shortcuts. Anything else is an anchored fuzzy search.
+    """
+    filtertext = filtertext.lower()
+
+    anchored = True
+    force_non_anchored = False
+    force_consecutive = False
+
+    # Two leading spaces: non-fuzzy (consecutive substring) search, non-anchored
+    if filtertext.startswith('  '):
+        anchored = False
+        force_consecutive = True
+        filtertext = filtertext[2:]
+    # One leading space: non-anchored fuzzy search
+    elif filtertext.startswith(' '):
+        anchored = False
+        filtertext = filtertext[1:]
+    # * or [ prefix: non-anchored fuzzy (legacy shortcuts, unchanged)
+    elif filtertext.startswith('*') or filtertext.startswith('['):
+        anchored = False
+        filtertext = filtertext.replace("*", "", 1)
+        if filtertext.startswith('*'):
+            force_non_anchored = True
+        filtertext = filtertext.replace("*", "")
+
+    return filtertext, anchored, force_consecutive, force_non_anchored
+
+
+def _result_sort_key(item):
+    # Match quality plus usage weight (descending), then alphabetically
+    return (-item['rank'], item['text'])
+
+
+class ScoringJob(object):
+    """Match and rank every picker item against one filter string.
+
+    Only plain data is touched (the SearchIndex, a weights dict), never Qt or
+    plugin objects, so a job can run on a worker thread. Result items are
+    the model's item dicts minus 'color', which the model fills in lazily on
+    the UI thread for the rows it actually shows.
+    """
+
+    def __init__(self, index, mlist, filtertext, weights, num_items):
+        self.needle, self.anchored, self.force_consecutive, self.force_non_anchored = (
+            parse_filter(filtertext))
+        self._index = index
+        self._mlist = mlist
+        self._weights = weights
+        self._num_items = num_items
+
+    def run(self, chunk_size=None, on_partial=None, is_cancelled=None):
+        """Return the sorted result items, or None when *is_cancelled()* turns True.
+
+        After each chunk of *chunk_size* candidates, *on_partial* (if given)
+        receives the best num_items results found so far. Only the previous
+        best and the new chunk are ranked for it, never everything so far.
+        """
+        if self.force_non_anchored:
+            index = SearchIndex(self._mlist, drop_first_char=True)
+        else:
+            index = self._index
+
+        scored = []
+        best = []
+        chunks = index.scored_chunks(self.needle, self.anchored, self.force_consecutive, chunk_size)
+        for chunk in chunks:
+            if is_cancelled is not None and is_cancelled():
+                return None
+            chunk_items = [self._scored_item(entry, match_score, positions)
+                           for entry, match_score, positions in chunk]
+            scored.extend(chunk_items)
+            if on_partial is not None:
+                best = heapq.nsmallest(self._num_items, best + chunk_items, key=_result_sort_key)
+                on_partial(best)
+
+        scored.sort(key=_result_sort_key)
+        return scored
+
+    def _scored_item(self, entry, match_score, positions):
+        n = entry.item
+        weight = self._weights.get(n['menupath'], 0)
+        return {
+            'text': entry.text,
+            'menupath': n['menupath'],
+            'menuobj': n['menuobj'],
+            'score': weight,
+            'rank': rank_score(match_score, weight),
+            'positions': positions}
+
+
 class NodeWeights(object):
+    """Frecency weights for picker items, persisted as JSON.
+
+    Each use adds 1 to an item's score, and scores halve every HALF_LIFE
+    seconds, so recently *and* frequently used items rank highest. Stored
+    entries are [score, last_used] pairs, with score valid as of last_used.
+
+    The file is kept small: at most MAX_ITEMS entries are stored (least
+    recently used are evicted first), and entries whose decayed score falls
+    below MIN_SCORE are dropped when saving. Legacy files holding plain
+    {key: count} dicts are converted on load.
+
+    load() only re-reads the file when its mtime or size changed, and save()
+    hands the write to a background thread (see save()), so opening and
+    closing the picker does not block on slow home directories.
+    """
+
+    FORMAT_VERSION = 2
+    HALF_LIFE = 14 * 24 * 60 * 60  # two weeks, in seconds
+    MAX_ITEMS = 500
+    MIN_SCORE = 0.01
+    # Decayed scores are cached between increments; the cache is refreshed
+    # when older than this, so long-lived widgets still see decay.
+    CACHE_SECONDS = 60
+
     def __init__(self, fname=None):
         self.fname = fname
-        self._weights = {}
+        self._weights = {}  # key -> [score, last_used]
         self._successful_load = False
+        self._decayed = None  # key -> decayed score, see _decayed_scores()
+        self._decayed_max = 1.0
+        self._decayed_time = None
+        self._file_stamp = None  # (mtime_ns, size) of the file as last loaded/saved
+        self._lock = threading.Lock()
+        self._pending = None  # JSON payload waiting for the writer thread
+        self._writer = None
 
     def load(self):
+        """Read the weights file, skipping the read when it is unchanged on disk.
+
+        The file's (mtime, size) is compared with the last load or save by this
+        instance, so repeated picker opens only stat the file. A save still
+        queued on the writer thread is newer than the file, so load is skipped
+        until it lands.
+        """
         if self.fname is None:
             return
 
         def _load_internal():
             import json
-            if not os.path.isfile(self.fname):
+            stamp = self._stat()
+            with self._lock:
+                if self._pending is not None:
+                    return
+                if self._successful_load and stamp == self._file_stamp:
+                    return
+            if stamp is None:
                 print("Weight file does not exist")
+                self._file_stamp = None
                 return
             f = open(self.fname)
-            self._weights = json.load(f)
+            data = json.load(f)
             f.close()
+            self._weights = self._parse(data)
+            self._decayed = None
+            self._file_stamp = stamp
+            if len(self._weights) > self.MAX_ITEMS:
+                self._compact()
 
         # Catch any errors, print traceback and continue
         try:
@@ -231,7 +693,57 @@ class NodeWeights(object):
             traceback.print_exc()
             self._successful_load = False
 
+    def _stat(self):
+        """Return (mtime_ns, size) of the weights file, or None if it does not exist."""
+        try:
+            st = os.stat(self.fname)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _parse(self, data):
+        """Return {key: [score, last_used]} from the current or legacy file format."""
+        now = time.time()
+        if isinstance(data, dict) and data.get("version") == self.FORMAT_VERSION:
+            weights = {}
+            for key, entry in data.get("items", {}).items():
+                try:
+                    score, last_used = float(entry[0]), float(entry[1])
+                except (TypeError, ValueError, IndexError):
+                    continue
+                weights[key] = [score, last_used]
+            return weights
+
+        # Legacy format: {key: use_count}. Treat every count as used now, so
+        # existing rankings carry over and then decay naturally.
+        weights = {}
+        for key, count in data.items():
+            if isinstance(count, (int, float)) and count > 0:
+                weights[key] = [float(count), now]
+        return weights
+
+    def _compact(self):
+        """Drop fully-decayed entries and evict least recently used ones past MAX_ITEMS."""
+        now = time.time()
+        compacted = {
+            key: entry for key, entry in self._weights.items()
+            if self._decay(entry[0], entry[1], now) >= self.MIN_SCORE
+        }
+
+        if len(compacted) > self.MAX_ITEMS:
+            keep = sorted(compacted, key=lambda k: compacted[k][1], reverse=True)
+            compacted = {k: compacted[k] for k in keep[:self.MAX_ITEMS]}
+
+        self._weights = compacted
+        self._decayed = None
+
     def save(self):
+        """Queue the weights for writing on a background thread.
+
+        The JSON payload is built here, so later increments do not race the
+        writer. Saves made while a write is in flight are coalesced: only the
+        newest payload is written next. Use flush() to wait for the write.
+        """
         if self.fname is None:
             print("Not saving node weights, no file specified")
             return
@@ -242,45 +754,133 @@ class NodeWeights(object):
                 self.fname)))
             return
 
-        def _save_internal():
-            import json
-            ndir = os.path.dirname(self.fname)
-            if not os.path.isdir(ndir):
-                try:
-                    os.makedirs(ndir)
-                except OSError as e:
-                    if e.errno != 17:  # errno 17 is "already exists"
-                        raise
-
-            f = open(self.fname, "w")
-            # TODO: Limit number of saved items to some sane number
-            json.dump(self._weights, fp=f)
-            f.close()
-
-        # Catch any errors, print traceback and continue
+        import json
+        self._compact()
+        payload = json.dumps({"version": self.FORMAT_VERSION, "items": self._weights},
+                             separators=(",", ":"))
+        with self._lock:
+            self._pending = payload
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(
+                    target=self._writer_loop, name="tabtabtab-weights-writer")
+                self._writer.start()
+
+    def flush(self, timeout=None):
+        """Block until any queued save has been written."""
+        writer = self._writer
+        if writer is not None:
+            writer.join(timeout)
+
+    def _writer_loop(self):
+        while True:
+            with self._lock:
+                payload = self._pending
+                self._pending = None
+                if payload is None:
+                    self._writer = None
+                    return
+            # Catch any errors, print traceback and continue
+            try:
+                self._write_file(payload)
+            except Exception:
+                print("Error saving node weights")
+                import traceback
+                traceback.print_exc()
+
+    def _write_file(self, payload):
+        """Atomically replace the weights file with *payload* (temp file + rename)."""
+        import tempfile
+        ndir = os.path.dirname(self.fname)
+        if not os.path.isdir(ndir):
+            try:
+                os.makedirs(ndir)
+            except OSError as e:
+                if e.errno != 17:  # errno 17 is "already exists"
+                    raise
+
+        fd, tmp_name = tempfile.mkstemp(
+            dir=ndir, prefix="." + os.path.basename(self.fname), suffix=".tmp")
         try:
-            _save_internal()
-        except Exception:
-            print("Error saving node weights")
-            import traceback
-            traceback.print_exc()
+            with os.fdopen(fd, "w") as f:
+                f.write(payload)
+            os.replace(tmp_name, self.fname)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_name)
+            raise
+        # Our own write must not trigger a reload on the next show()
+        self._file_stamp = self._stat()
+
+    def _decay(self, score, last_used, now):
+        return score * 0.5 ** (max(0.0, now - last_used) / self.HALF_LIFE)
+
+    def _decayed_scores(self):
+        """Return {key: decayed score}, recomputed at most every CACHE_SECONDS."""
+        now = time.time()
+        if self._decayed is None or now - self._decayed_time > self.CACHE_SECONDS:
+            self._decayed = {
+                key: self._decay(score, last_used, now)
+                for key, (score, last_used) in self._weights.items()
+            }
+            self._decayed_max = max(1.0, max(self._decayed.values(), default=0.0))
+            self._decayed_time = now
+        return self._decayed
 
     def get(self, k, default=0):
-        if len(list(self._weights.values())) == 0:
-            maxval = 1.0
-        else:
-            maxval = max(self._weights.values())
-            maxval = max(1, maxval)
-            maxval = float(maxval)
+        """Return the frecency of *k* normalised to 0..1 against the top item."""
+        decayed = self._decayed_scores()
+        return decayed.get(k, default) / self._decayed_max
 
-        return self._weights.get(k, default) / maxval
+    def snapshot(self):
+        """Return {key: get(key)} as a plain dict, safe to read from another thread."""
+        decayed = self._decayed_scores()
+        maxval = self._decayed_max
+        return {key: value / maxval for key, value in decayed.items()}
 
     def increment(self, key):
-        self._weights.setdefault(key, 0)
-        self._weights[key] += 1
+        now = time.time()
+        score, last_used = self._weights.get(key, (0.0, now))
+        self._weights[key] = [self._decay(score, last_used, now) + 1.0, now]
+        self._decayed = None
+        if len(self._weights) > self.MAX_ITEMS:
+            self._compact()
+
+
+class _ScoringSignals(QtCore.QObject):
+    """Carries _ScoringTask results back to the model on the UI thread."""
+    partial = QtCore.Signal(int, object)
+    finished = QtCore.Signal(int, object)
+
+
+class _ScoringTask(QtCore.QRunnable):
+    """Runs a ScoringJob on a QThreadPool thread, tagged with its request id."""
+
+    def __init__(self, job, request_id, signals, chunk_size, is_cancelled):
+        super(_ScoringTask, self).__init__()
+        self._job = job
+        self._request_id = request_id
+        self._signals = signals
+        self._chunk_size = chunk_size
+        self._is_cancelled = is_cancelled
+
+    def run(self):
+        if self._is_cancelled():
+            return
+        results = self._job.run(
+            chunk_size=self._chunk_size,
+            on_partial=lambda items: self._signals.partial.emit(self._request_id, items),
+            is_cancelled=self._is_cancelled)
+        if results is not None:
+            self._signals.finished.emit(self._request_id, results)
 
 
 class NodeModel(QtCore.QAbstractListModel):
+    # Lists at least this long are scored on a worker thread, so typing never
+    # waits on scoring; shorter lists are scored synchronously.
+    ASYNC_MIN_ITEMS = 5000
+    # Candidates scored between partial-result updates and cancellation checks
+    CHUNK_SIZE = 2000
+
     def __init__(self, mlist, weights, num_items=18, filtertext="", icon_fn=None, color_fn=None):
         super(NodeModel, self).__init__()
 
@@ -288,10 +888,20 @@ class NodeModel(QtCore.QAbstractListModel):
         self.num_items = num_items
 
         self._all = mlist
+        self._index = SearchIndex(mlist)
         self._filtertext = filtertext
         self._icon_fn = icon_fn if icon_fn is not None else (lambda obj: None)
         self._color_fn = color_fn if color_fn is not None else (lambda obj: (None, None))
 
+        # Background scoring: one worker thread, newest request wins
+        self._request_id = 0
+        self._pending_job = None
+        self._pool = QtCore.QThreadPool()
+        self._pool.setMaxThreadCount(1)
+        self._signals = _ScoringSignals()
+        self._signals.partial.connect(self._on_results)
+        self._signals.finished.connect(self._on_finished)
+
         # _items is the list of objects to be shown, update sets this
         self._items = []
         self.update()
@@ -302,73 +912,64 @@ class NodeModel(QtCore.QAbstractListModel):
 
     def refresh_items(self, mlist):
         self._all = mlist
+        # Reuse search data for items whose menupath is unchanged
+        self._index = SearchIndex(mlist, previous=self._index)
         self.update()
 
     def update(self):
-        filtertext = self._filtertext.lower()
-
-        anchored = True
-        force_non_anchored = False
-        force_consecutive = False
-
-        # Two leading spaces: non-fuzzy (consecutive substring) search, non-anchored
-        if filtertext.startswith('  '):
-            anchored = False
-            force_consecutive = True
-            filtertext = filtertext[2:]
-        # One leading space: non-anchored fuzzy search
-        elif filtertext.startswith(' '):
-            anchored = False
-            filtertext = filtertext[1:]
-        # * or [ prefix: non-anchored fuzzy (legacy shortcuts, unchanged)
-        elif filtertext.startswith('*') or filtertext.startswith('['):
-            anchored = False
-            filtertext = filtertext.replace("*", "", 1)
-            if filtertext.startswith('*'):
-                force_non_anchored = True
-            filtertext = filtertext.replace("*", "")
-
-        scored_a = []
-        scored_b = []
-        for n in self._all:
-            # Turn "3D/Shader/Phong" into "Phong [3D/Shader]"
-            menupath = n['menupath'].replace("&", "")
-            uiname = "%s [%s]" % (menupath.rpartition("/")[2], menupath.rpartition("/")[0])
-            search_string = uiname.lower()
-
-            if force_non_anchored:
-                search_string = search_string[1:]
-
-            if consec_find(filtertext, search_string, anchored):
-                # Matches, get weighting and add to list of stuff
-                score = self.weights.get(n['menupath'])
-
-                scored_a.append({
-                    'text': uiname,
-                    'menupath': n['menupath'],
-                    'menuobj': n['menuobj'],
-                    'score': score,
-                    'color': self._color_fn(n['menuobj'])})
-
-            elif not force_consecutive and nonconsec_find(filtertext, search_string, anchored):
-                # Matches, get weighting and add to list of stuff
-                score = self.weights.get(n['menupath'])
-
-                scored_b.append({
-                    'text': uiname,
-                    'menupath': n['menupath'],
-                    'menuobj': n['menuobj'],
-                    'score': score,
-                    'color': self._color_fn(n['menuobj'])})
-
-        # Sort based on scores (descending), then alphabetically
-        sort_a = sorted(scored_a, key=lambda k: (-k['score'], k['text']))
-        sort_b = sorted(scored_b, key=lambda k: (-k['score'], k['text']))
-        s = sort_a + sort_b
-
-        self._items = s
+        self._request_id += 1
+        job = ScoringJob(self._index, self._all, self._filtertext,
+                         self.weights.snapshot(), self.num_items)
+
+        if len(self._all) < self.ASYNC_MIN_ITEMS:
+            self._pending_job = None
+            self._set_items(job.run())
+            return
+
+        self._pending_job = job
+        # Drop queued work for older keystrokes; a running task stops at its
+        # next chunk boundary once it sees a newer request id.
+        self._pool.clear()
+        request_id = self._request_id
+        self._pool.start(_ScoringTask(
+            job, request_id, self._signals, self.CHUNK_SIZE,
+            is_cancelled=lambda: self._request_id != request_id))
+
+    def finish_pending(self):
+        """Score the latest request now if its final results have not arrived yet.
+
+        Lets Enter act on the final ranking rather than on partial results.
+        """
+        job = self._pending_job
+        if job is None:
+            return
+        self._pending_job = None
+        # Stop the running task at its next chunk and drop its late signals
+        self._request_id += 1
+        self._pool.clear()
+        self._pool.waitForDone()
+        self._set_items(job.run())
+
+    def _on_results(self, request_id, items):
+        # Results for anything but the latest keystroke are stale
+        if request_id == self._request_id:
+            self._set_items(items)
+
+    def _on_finished(self, request_id, items):
+        if request_id == self._request_id:
+            self._pending_job = None
+        self._on_results(request_id, items)
+
+    def _set_items(self, items):
+        self._items = items
         self.modelReset.emit()
 
+    def _item_color(self, item):
+        color = item.get('color')
+        if color is None:
+            color = item['color'] = self._color_fn(item['menuobj'])
+        return color
+
     def rowCount(self, parent=QtCore.QModelIndex()):
         return min(self.num_items, len(self._items))
 
@@ -385,14 +986,14 @@ class NodeModel(QtCore.QAbstractListModel):
             return None
 
         elif role == Qt.BackgroundRole:
-            left_block_color, text_tint_color = self._items[index.row()]['color']
+            left_block_color, text_tint_color = self._item_color(self._items[index.row()])
             if text_tint_color is None:
                 return None
             tinted = QtGui.QColor(text_tint_color.red(), text_tint_color.green(), text_tint_color.blue(), 80)  # 31% opacity
             return QtGui.QBrush(tinted)
 
         elif role == Qt.ForegroundRole:
-            _, text_tint_color = self._items[index.row()]['color']
+            _, text_tint_color = self._item_color(self._items[index.row()])
             if text_tint_color is None:
                 return None
             luminance = 0.299 * text_tint_color.red() + 0.587 * text_tint_color.green() + 0.114 * text_tint_color.blue()
@@ -402,9 +1003,12 @@ class NodeModel(QtCore.QAbstractListModel):
                 return QtGui.QBrush(QtGui.QColor(220, 220, 220))
 
         elif role == Qt.UserRole:
-            left_block_color, _ = self._items[index.row()]['color']
+            left_block_color, _ = self._item_color(self._items[index.row()])
             return left_block_color
 
+        elif role == MATCH_POSITIONS_ROLE:
+            return self._items[index.row()]['positions']
+
         else:
             return None
 
@@ -425,19 +1029,71 @@ class NodeModel(QtCore.QAbstractListModel):
         return selected_data
 
 
+class _PickList:
+    """Items accumulated with Ctrl+Enter during one picker session, in picking order."""
+
+    def __init__(self):
+        self._things = []
+        # menupaths toggled either way this session
+        self._toggled = set()
+
+    def __len__(self):
+        return len(self._things)
+
+    def _position(self, thing):
+        for position, picked in enumerate(self._things):
+            if picked['menupath'] == thing['menupath']:
+                return position
+        return None
+
+    def toggle(self, thing):
+        """Add *thing*, or remove it if it is already picked. Returns True if added."""
+        self._toggled.add(thing['menupath'])
+        position = self._position(thing)
+        if position is None:
+            self._things.append(thing)
+            return True
+        del self._things[position]
+        return False
+
+    def things_with(self, thing):
+        """Return the picked items, plus *thing* (the current row) unless it was ever toggled.
+
+        A row the user picked and then unpicked stays out, even when it is
+        still highlighted on Enter.
+        """
+        things = list(self._things)
+        if thing is not None and thing['menupath'] not in self._toggled:
+            things.append(thing)
+        return things
+
+    def clear(self):
+        self._things = []
+        self._toggled = set()
+
+    def summary(self):
+        return "%d picked - Enter creates all, Ctrl+Enter picks more" % len(self._things)
+
+
 class TabyLineEdit(QtWidgets.QLineEdit):
     pressed_arrow = QtCore.Signal(str)
     cancelled = QtCore.Signal()
+    accumulated = QtCore.Signal()
 
     def event(self, event):
         """Make tab trigger returnPressed
 
-        Also emit signals for the up/down arrows, and escape.
+        Also emit signals for the up/down arrows, escape, and Ctrl+Enter.
         """
 
         is_keypress = event.type() == QtCore.QEvent.KeyPress
 
-        if is_keypress and event.key() == QtCore.Qt.Key_Tab:
+        if (is_keypress and event.key() in (QtCore.Qt.Key_Return, QtCore.Qt.Key_Enter)
+                and event.modifiers() & QtCore.Qt.ControlModifier):
+            self.accumulated.emit()
+            return True
+
+        elif is_keypress and event.key() == QtCore.Qt.Key_Tab:
             # Can't access tab key in keyPressedEvent
             self.returnPressed.emit()
             return True
@@ -514,7 +1170,21 @@ class _ItemDelegate(QtWidgets.QStyledItemDelegate):
         fg = index.data(Qt.ForegroundRole)
         painter.setPen(fg.color() if fg else option.palette.text().color())
         text = index.data(Qt.DisplayRole) or ""
-        painter.drawText(text_rect, Qt.AlignVCenter | Qt.AlignLeft, text)
+        positions = index.data(MATCH_POSITIONS_ROLE)
+        if not positions:
+            painter.drawText(text_rect, Qt.AlignVCenter | Qt.AlignLeft, text)
+        else:
+            # Draw matched characters in bold, run by run
+            normal_font = QtGui.QFont(option.font)
+            bold_font = QtGui.QFont(option.font)
+            bold_font.setBold(True)
+            x = text_rect.left()
+            for chunk, is_matched in bold_runs(text, positions):
+                font = bold_font if is_matched else normal_font
+                painter.setFont(font)
+                chunk_rect = QtCore.QRect(x, text_rect.top(), text_rect.right() - x, text_rect.height())
+                painter.drawText(chunk_rect, Qt.AlignVCenter | Qt.AlignLeft, chunk)
+                x += QtGui.QFontMetrics(font).horizontalAdvance(chunk)
 
         painter.restore()
 
@@ -534,11 +1204,16 @@ class TabTabTabWidget(QtWidgets.QDialog):
         self.weights = NodeWeights(plugin.get_weights_file())
         self.weights.load()  # weights.save() called in close method
 
+        # Token first: a change made while get_items() runs then still
+        # triggers a refresh on the next show()
+        self._items_token = plugin.get_change_token()
         items = plugin.get_items()
 
         # List of stuff, and associated model
         self.things_model = NodeModel(items, weights=self.weights, icon_fn=plugin.get_icon, color_fn=plugin.get_color)
         self.things = QtWidgets.QListView()
+        # Row selected since the text last changed, kept across result updates
+        self._selected_row = 0
         self.things.setModel(self.things_model)
         self.things.setUniformItemSizes(True)
         self.input.setFont(self.things.font())
@@ -549,10 +1224,16 @@ class TabTabTabWidget(QtWidgets.QDialog):
         self.things.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.input.setTextMargins(2, _font_h // 2, 2, _font_h // 2)
 
+        # Items picked with Ctrl+Enter, and the line summarising them
+        self._picks = _PickList()
+        self._picks_label = QtWidgets.QLabel()
+        self._picks_label.hide()
+
         # Add input and items to layout
         layout = QtWidgets.QVBoxLayout()
         layout.addWidget(self.input)
         layout.addWidget(self.things)
+        layout.addWidget(self._picks_label)
 
         self.setLayout(layout)
 
@@ -561,12 +1242,19 @@ class TabTabTabWidget(QtWidgets.QDialog):
 
         # Reset selection on text change
         self.input.textChanged.connect(lambda: self.move_selection(where="first"))
+        # Large lists are scored in the background, so results can arrive
+        # after textChanged; a reset clears the view's selection, so put back
+        # the row chosen since the text last changed
+        self.things_model.modelReset.connect(self._restore_selection)
         self.move_selection(where="first")  # Set initial selection
 
         # Create node when enter/tab is pressed, or item is clicked
         self.input.returnPressed.connect(self.create)
         self.things.clicked.connect(self.create)
 
+        # Ctrl+Enter picks the current item and keeps the picker open
+        self.input.accumulated.connect(self.accumulate)
+
         # When esc pressed, close
         self.input.cancelled.connect(self.close)
 
@@ -622,6 +1310,7 @@ class TabTabTabWidget(QtWidgets.QDialog):
         down = where == "down"
 
         if first:
+            self._selected_row = 0
             self.things.setCurrentIndex(self.things_model.index(0))
             return
 
@@ -636,8 +1325,14 @@ class TabTabTabWidget(QtWidgets.QDialog):
             if new > count - 1:
                 new = 0
 
+        self._selected_row = new
         self.things.setCurrentIndex(self.things_model.index(new))
 
+    def _restore_selection(self):
+        """Select the remembered row again after the model's results change."""
+        row = min(self._selected_row, self.things_model.rowCount() - 1)
+        self.things.setCurrentIndex(self.things_model.index(max(row, 0)))
+
     def event(self, event):
         """Close when window becomes inactive (click outside of window)"""
         if event.type() == QtCore.QEvent.WindowDeactivate:
@@ -648,7 +1343,7 @@ class TabTabTabWidget(QtWidgets.QDialog):
 
     def update(self, text):
         """On text change, selects first item and updates filter text"""
-        self.things.setCurrentIndex(self.things_model.index(0))
+        self.move_selection(where="first")
         self.things_model.set_filter(text)
 
     def show(self):
@@ -659,12 +1354,7 @@ class TabTabTabWidget(QtWidgets.QDialog):
         create previously created node (instead of the most popular)
         """
 
-        # Load the weights everytime the panel is shown, to prevent
-        # overwritting weights from other instances
-        self.weights.load()
-
-        # Refresh items from the plugin so additions/removals are reflected
-        self.things_model.refresh_items(self.plugin.get_items())
+        self._sync_with_plugin()
 
         # Restore selection to the first item, since modelReset clears it
         self.move_selection(where="first")
@@ -675,14 +1365,63 @@ class TabTabTabWidget(QtWidgets.QDialog):
 
         super(TabTabTabWidget, self).show()
 
+    def prewarm(self):
+        """Bring weights and items up to date without showing the widget.
+
+        Lets a host do the work of the next show() during idle time, so the
+        picker opens instantly; show() then finds nothing left to refresh.
+        """
+        self._sync_with_plugin()
+
+    def _sync_with_plugin(self):
+        # Load the weights everytime the panel is shown, to prevent
+        # overwritting weights from other instances
+        self.weights.load()
+
+        # Refresh items from the plugin so additions/removals are reflected,
+        # unless the plugin's change token says nothing changed
+        token = self.plugin.get_change_token()
+        if token is None or token != self._items_token:
+            self._items_token = token
+            self.things_model.refresh_items(self.plugin.get_items())
+
     def close(self):
-        """Save weights when closing"""
+        """Save weights when closing, and drop any unused Ctrl+Enter picks"""
         self.weights.save()
+        self._picks.clear()
+        self._picks_label.hide()
         super(TabTabTabWidget, self).close()
 
+    def accumulate(self):
+        """Toggle the selected item in the multi-select pick list (Ctrl+Enter)."""
+        if not getattr(self.plugin, 'supports_multi_select', False):
+            self.create()
+            return
+        selected = self.things.selectedIndexes()
+        if len(selected) == 0:
+            return
+        self._picks.toggle(self.things_model.getorig(selected))
+        self._picks_label.setText(self._picks.summary())
+        self._picks_label.setVisible(len(self._picks) > 0)
+        # Ready for the next search
+        self.input.selectAll()
+
     def create(self):
+        # Background scoring may still be refining the list: act on the final
+        # results, keeping the row the user chose
+        self.things_model.finish_pending()
+
         # Get selected item
         selected = self.things.selectedIndexes()
+        if len(self._picks) > 0:
+            thing = self.things_model.getorig(selected) if len(selected) > 0 else None
+            things = self._picks.things_with(thing)
+            self.plugin.invoke_many(things)
+            for picked in things:
+                self.weights.increment(picked['menupath'])
+            self.close()
+            return
+
         if len(selected) == 0:
             return
 
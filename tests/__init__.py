@@ -47,3 +47,15 @@ if 'nuke' not in sys.modules:
 
     sys.modules['nuke'] = make_stub_nuke_module()
     sys.modules['nukescripts'] = make_stub_nukescripts_module()
+
+    # -------------------------------------------------------------------------
+    # Clipboard sidecar — keep what copy_hidden() writes out of the user's ~/.nuke
+    # (pytest gives each test its own directory instead; see conftest.py)
+    # -------------------------------------------------------------------------
+
+    import os
+    import tempfile
+
+    import clipboard
+    clipboard.SIDECAR_PATH = os.path.join(
+        tempfile.mkdtemp(prefix='paste_hidden_tests_'), 'paste_hidden_clipboard.json')
@@ -46,3 +46,16 @@ sys.modules['tabtabtab'] = _tabtabtab
 
 sys.modules['nuke'] = make_stub_nuke_module()
 sys.modules['nukescripts'] = make_stub_nukescripts_module()
+
+# ---------------------------------------------------------------------------
+# Clipboard sidecar — copy_hidden() writes it; keep each test's copy in its own
+# temporary directory instead of the user's ~/.nuke
+# ---------------------------------------------------------------------------
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _isolated_clipboard_sidecar(tmp_path, monkeypatch):
+    import clipboard
+    monkeypatch.setattr(clipboard, 'SIDECAR_PATH', str(tmp_path / 'paste_hidden_clipboard.json'))
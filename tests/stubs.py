@@ -92,6 +92,9 @@ class StubNode:
     def input(self, index):
         return self._input
 
+    def inputs(self):
+        return 0 if self._input is None else 1
+
     def setInput(self, index, node):
         self._input = node
 
@@ -130,7 +133,9 @@ def make_stub_nuke_module():
 
     root_obj = MagicMock()
     root_obj.name.return_value = 'destScript.nk'
+    root_obj.Class.return_value = 'Root'
     stub.root = MagicMock(return_value=root_obj)
+    stub.thisGroup = MagicMock(return_value=root_obj)  # node graph context: top level
 
     stub.allNodes = MagicMock(return_value=[])
     stub.toNode = MagicMock(return_value=None)
@@ -142,6 +147,7 @@ def make_stub_nuke_module():
     stub.delete = MagicMock()
     stub.INVISIBLE = 0
     stub.NUKE_VERSION_MAJOR = 16  # critical: forces PySide6 path in anchor.py; do NOT use 14
+    stub.GUI = True  # interactive session; prewarm and other UI paths check this
     stub.PyScript_Knob = MagicMock()
     stub.String_Knob = MagicMock(side_effect=lambda name, *args: StubKnob(knob_name=name))
     stub.Tab_Knob = MagicMock(side_effect=lambda name, *args: StubKnob(knob_name=name))
@@ -150,6 +156,7 @@ def make_stub_nuke_module():
     stub.center = MagicMock(return_value=[0.0, 0.0])
     stub.zoomToFitSelected = MagicMock()
     stub.getColor = MagicMock(return_value=0)
+    stub.Undo = MagicMock()
 
     return stub
 
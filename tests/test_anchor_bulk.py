@@ -0,0 +1,223 @@
+"""Tests for bulk anchor operations.
+
+Covers:
+- create_anchors_for_nodes() anchors many inputs in one pass and one undo step
+- Suggested names are made unique against existing node names without Nuke renaming
+- Anchors, links, backdrops and already-anchored inputs are skipped
+- Backdrop and Preferences color lookups are shared across the batch
+- create_links_for_anchors() links many anchors in one undo step, laid out in a grid
+- AnchorPlugin opts into multi-select and invoke_many() batches the picker's Ctrl+Enter picks;
+  the navigate picker keeps Ctrl+Enter as Enter
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import anchor
+import link
+
+
+def _make_read(name, filepath, xpos=0, ypos=0):
+    import nuke as _nuke
+    return _nuke.StubNode(
+        name=name,
+        node_class='Read',
+        xpos=xpos,
+        ypos=ypos,
+        knobs_dict={
+            'file': _nuke.StubKnob(filepath),
+            'tile_color': _nuke.StubKnob(0),
+            'label': _nuke.StubKnob(''),
+        },
+    )
+
+
+def _new_noop():
+    import nuke as _nuke
+    return _nuke.StubNode(
+        name='NoOp1',
+        node_class='NoOp',
+        knobs_dict={'label': _nuke.StubKnob(''), 'tile_color': _nuke.StubKnob(0)},
+    )
+
+
+class TestCreateAnchorsForNodes(unittest.TestCase):
+
+    def _run(self, nodes, existing=(), anchors=()):
+        import nuke as nuke_stub
+        created = []
+
+        def new_noop():
+            node = _new_noop()
+            created.append(node)
+            return node
+
+        def all_nodes(node_class=None):
+            if node_class == 'BackdropNode':
+                return []
+            return list(existing) + list(nodes) + created
+
+        with patch.object(nuke_stub, 'nodes', MagicMock(NoOp=MagicMock(side_effect=new_noop)),
+                          create=True), \
+             patch.object(nuke_stub, 'allNodes', side_effect=all_nodes) as all_nodes_mock, \
+             patch.object(nuke_stub, 'createNode') as create_node, \
+             patch.object(nuke_stub, 'Undo') as undo_class, \
+             patch.object(anchor, 'all_anchors', return_value=list(anchors)), \
+             patch.object(link, 'find_node_default_color',
+                          return_value=0x123456FF) as default_color:
+            result = anchor.create_anchors_for_nodes(nodes)
+        self.create_node = create_node
+        self.undo_class = undo_class
+        self.default_color = default_color
+        self.all_nodes = all_nodes_mock
+        return result
+
+    def test_creates_one_anchor_per_input_in_one_undo_step(self):
+        reads = [_make_read('Read%d' % i, '/shots/plate%d_v001.exr' % i, ypos=i * 100)
+                 for i in range(3)]
+        anchors = self._run(reads)
+        self.assertEqual([a.name() for a in anchors],
+                         ['Anchor_plate0', 'Anchor_plate1', 'Anchor_plate2'])
+        for read, new_anchor in zip(reads, anchors, strict=True):
+            self.assertIs(new_anchor.input(0), read)
+            self.assertEqual(new_anchor.ypos(), read.ypos() + read.screenHeight() + 20)
+        self.create_node.assert_not_called()
+        self.undo_class.return_value.begin.assert_called_once()
+        self.undo_class.return_value.end.assert_called_once()
+
+    def test_name_collisions_get_numbered_suffixes(self):
+        import nuke as _nuke
+        existing_anchor = _nuke.StubNode(name='Anchor_plate', node_class='NoOp')
+        reads = [_make_read('Read1', '/a/plate_v001.exr'), _make_read('Read2', '/b/plate_v002.exr')]
+        anchors = self._run(reads, existing=[existing_anchor])
+        self.assertEqual([a.name() for a in anchors], ['Anchor_plate_2', 'Anchor_plate_3'])
+        for new_anchor in anchors:
+            self.assertEqual(len(new_anchor._set_name_calls), 1)
+
+    def test_skips_anchors_and_already_anchored_inputs(self):
+        import nuke as _nuke
+        anchored_read = _make_read('Read1', '/a/bg_v001.exr')
+        existing_anchor = _nuke.StubNode(name='Anchor_bg', node_class='NoOp')
+        existing_anchor.setInput(0, anchored_read)
+        fresh_read = _make_read('Read2', '/a/fg_v001.exr')
+        anchors = self._run([anchored_read, existing_anchor, fresh_read],
+                            anchors=[existing_anchor])
+        self.assertEqual([a.name() for a in anchors], ['Anchor_fg'])
+
+    def test_nothing_to_anchor_makes_no_undo_step(self):
+        import nuke as _nuke
+        existing_anchor = _nuke.StubNode(name='Anchor_bg', node_class='NoOp')
+        self.assertEqual(self._run([existing_anchor]), [])
+        self.undo_class.assert_not_called()
+
+    def test_preferences_color_is_looked_up_once_per_class(self):
+        reads = [_make_read('Read%d' % i, '/a/p%d_v001.exr' % i) for i in range(5)]
+        anchors = self._run(reads)
+        self.assertEqual(self.default_color.call_count, 1)
+        for new_anchor in anchors:
+            self.assertEqual(new_anchor['tile_color'].getValue(), 0x123456FF)
+
+    def test_backdrops_are_listed_once_for_the_whole_batch(self):
+        reads = [_make_read('Read%d' % i, '/a/p%d_v001.exr' % i) for i in range(5)]
+        self._run(reads)
+        backdrop_scans = [call for call in self.all_nodes.call_args_list
+                          if call.args == ('BackdropNode',)]
+        self.assertEqual(len(backdrop_scans), 1)
+
+
+class TestCreateLinksForAnchors(unittest.TestCase):
+
+    def _anchor(self, name, node_class='NoOp'):
+        import nuke as _nuke
+        node = _nuke.StubNode(
+            name=name,
+            node_class=node_class,
+            knobs_dict={'label': _nuke.StubKnob(''), 'tile_color': _nuke.StubKnob(0x112233FF)},
+        )
+        node.setInput(0, _make_read('Read_' + name, '/a/%s_v001.exr' % name))
+        return node
+
+    def _run(self, anchors):
+        import nuke as nuke_stub
+        created = []
+
+        def factory(node_class):
+            def make():
+                node = nuke_stub.StubNode(
+                    name='%s%d' % (node_class, len(created) + 1),
+                    node_class=node_class,
+                    knobs_dict={name: nuke_stub.StubKnob('') for name in (
+                        'hide_input', 'tile_color', 'label', 'note_font_size', 'selected')},
+                )
+                created.append(node)
+                return node
+            return make
+
+        nodes_module = MagicMock(NoOp=MagicMock(side_effect=factory('NoOp')),
+                                 Dot=MagicMock(side_effect=factory('Dot')))
+        with patch.object(nuke_stub, 'nodes', nodes_module, create=True), \
+             patch.object(nuke_stub, 'createNode') as create_node, \
+             patch.object(nuke_stub, 'center', return_value=[1000.0, 500.0]), \
+             patch.object(nuke_stub, 'Undo') as undo_class, \
+             patch.object(link, 'add_input_knob',
+                          side_effect=lambda node, dot_type=None: node.addKnob(
+                              nuke_stub.StubKnob('', anchor.KNOB_NAME))), \
+             patch.object(link, 'get_fully_qualified_node_name',
+                          side_effect=lambda node: 'script.' + node.name()):
+            links = anchor.create_links_for_anchors(anchors)
+        self.create_node = create_node
+        self.undo_class = undo_class
+        return links
+
+    def test_creates_wired_links_in_one_undo_step_and_selects_them_once(self):
+        anchors = [self._anchor('plate%d' % i) for i in range(3)]
+        links = self._run(anchors)
+        self.assertEqual(len(links), 3)
+        for anchor_node, link_node in zip(anchors, links, strict=True):
+            self.assertIs(link_node.input(0), anchor_node)
+            self.assertEqual(link_node[anchor.KNOB_NAME].getText(), 'script.' + anchor_node.name())
+            self.assertTrue(link_node['selected'].getValue())
+        self.create_node.assert_not_called()
+        self.undo_class.return_value.begin.assert_called_once()
+        self.undo_class.return_value.end.assert_called_once()
+
+    def test_links_are_laid_out_in_a_grid_below_the_dag_center(self):
+        count = anchor.LINK_GRID_COLUMNS + 2
+        links = self._run([self._anchor('a%d' % i) for i in range(count)])
+        positions = [(node.xpos(), node.ypos()) for node in links]
+        self.assertEqual(len(set(positions)), count, "no two links overlap")
+        first_row = positions[:anchor.LINK_GRID_COLUMNS]
+        self.assertEqual({y for _x, y in first_row}, {500})
+        self.assertEqual(positions[anchor.LINK_GRID_COLUMNS][0], positions[0][0])
+        self.assertGreater(positions[anchor.LINK_GRID_COLUMNS][1], 500)
+        xs = [x for x, _y in first_row]
+        self.assertEqual(xs, sorted(xs))
+        self.assertLess(xs[0], 1000)
+        self.assertGreater(xs[-1], 1000)
+
+    def test_dot_anchor_gets_a_dot_link(self):
+        dot_anchor = self._anchor('dot', node_class='Dot')
+        links = self._run([dot_anchor])
+        self.assertEqual(links[0].Class(), 'Dot')
+
+    def test_empty_batch_makes_no_undo_step(self):
+        self.assertEqual(self._run([]), [])
+        self.undo_class.assert_not_called()
+
+    def test_plugin_invoke_many_skips_deleted_anchors(self):
+        import nuke as nuke_stub
+        alive = self._anchor('alive')
+        gone = self._anchor('gone')
+        things = [{'menuobj': alive}, {'menuobj': gone}]
+        with patch.object(nuke_stub, 'exists', side_effect=lambda name: name == 'alive'), \
+             patch.object(anchor, 'create_links_for_anchors') as create_links:
+            anchor.AnchorPlugin().invoke_many(things)
+        create_links.assert_called_once_with([alive])
+
+    def test_only_the_link_picker_opts_into_multi_select(self):
+        self.assertTrue(anchor.AnchorPlugin.supports_multi_select)
+        self.assertFalse(getattr(anchor.AnchorNavigatePlugin, 'supports_multi_select', False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,10 @@ Covers:
 - COLOR-03: rename_anchor_to() propagates color after rename
 - COLOR-04: add_set_color_anchor_knob() adds knob to NoOp anchors, not Dots
 - COLOR-05: propagate_anchor_color() sets anchor + all link tile_colors; skips Dots
+- Bulk recolor: recolor_anchors() remaps anchors and links in one pass and one undo step
 - Palette: load_user_palette() and save_user_palette() round-trip correctly
+- Swatch grid: _SwatchLayout geometry, hit-testing, hint labels and border styles
+- Backdrop colors: perceptual clustering of near-identical shades, cached per script
 """
 
 import json
@@ -117,8 +120,8 @@ class TestAnchorPickerColorReadsFromKnob(unittest.TestCase):
         # Color should NOT be derived from find_anchor_color's return value (0x000000FF)
         # It should be derived from tile_color.value() (0xAABBCCFF)
         # QColor is called with r=0xAA, g=0xBB, b=0xCC
-        import anchor as anchor_mod_check
-        qt_gui = anchor_mod_check.QtGui
+        # Qt is imported lazily by anchor, so read QtGui the same way it does.
+        qt_gui = self.anchor_mod._qt_modules()[1]
         expected_r = (expected_color_int >> 24) & 0xFF
         expected_g = (expected_color_int >> 16) & 0xFF
         expected_b = (expected_color_int >> 8) & 0xFF
@@ -484,16 +487,11 @@ class _PickerTestHarness:
         self._selected_color = initial_color
         self._hint_mode = False
         self._hint_row = None  # stores logical row index after letter keypress
-        self._swatch_cells = []
         self.chosen_name = ""
         self._custom_colors = list(custom_colors) if custom_colors else []
         self._staged_custom_colors = list(self._custom_colors)
         self._name_edit = None
-        self._cell_map = {}
-        self._grid_layout = MagicMock()
-        self._custom_group_next_col = 0
-        self._custom_group_next_row = 0
-        self._custom_group_next_logical_row = 0
+        self._swatch_grid = MagicMock()
         self.accept = MagicMock()
         self.reject = MagicMock()
 
@@ -572,7 +570,7 @@ class TestColorPaletteDialogClickToSelect(unittest.TestCase):
 
 
 class TestColorPaletteDialogRefreshSwatchBorders(unittest.TestCase):
-    """PICKER-01: _refresh_swatch_borders applies correct stylesheet to selected vs non-selected swatches."""
+    """PICKER-01: the selected swatch gets the palette highlight border, others the default."""
 
     def _get_refresh_swatch_borders(self):
         """Get the real _refresh_swatch_borders method from colors.py source."""
@@ -581,57 +579,151 @@ class TestColorPaletteDialogRefreshSwatchBorders(unittest.TestCase):
             self.fail("_refresh_swatch_borders not found in ColorPaletteDialog in colors.py")
         return method
 
-    def _make_dialog_with_swatches(self, selected_color, swatch_colors):
-        """Create a harness with _swatch_cells populated."""
-        dialog = _PickerTestHarness(initial_color=selected_color)
-        for col_index, color_int in enumerate(swatch_colors):
-            button = MagicMock()
-            dialog._swatch_cells.append((col_index, 0, color_int, button))
-        return dialog
-
-    def test_refresh_swatch_borders_applies_highlight_border_to_selected(self):
-        """_refresh_swatch_borders applies the palette highlight color as a 2px border to the selected swatch."""
+    def test_refresh_swatch_borders_forwards_selection_to_grid(self):
+        """_refresh_swatch_borders hands the selected color to the painted swatch grid."""
         refresh_swatch_borders = self._get_refresh_swatch_borders()
-        selected = 0xFF0000FF
-        non_selected = 0x00FF00FF
-
-        dialog = self._make_dialog_with_swatches(selected, [selected, non_selected])
+        dialog = _PickerTestHarness(initial_color=0xFF0000FF)
         refresh_swatch_borders(dialog)
+        dialog._swatch_grid.set_selected_color.assert_called_once_with(0xFF0000FF)
 
-        selected_button = dialog._swatch_cells[0][3]
-        stylesheet_call = selected_button.setStyleSheet.call_args[0][0]
-        expected_highlight = _PickerTestHarness.HARNESS_HIGHLIGHT_COLOR
-        self.assertIn(f"border: 2px solid {expected_highlight}", stylesheet_call,
-                      "Selected swatch must have a 2px border using the palette highlight color")
-
-    def test_refresh_swatch_borders_applies_default_border_to_non_selected(self):
-        """_refresh_swatch_borders applies 1px #555 border to non-selected swatches."""
-        refresh_swatch_borders = self._get_refresh_swatch_borders()
-        selected = 0xFF0000FF
-        non_selected = 0x00FF00FF
+    def test_selected_swatch_uses_highlight_border(self):
+        role, width = _real_colors_module._swatch_border_style(0xFF0000FF, 0, 0xFF0000FF, None, False)
+        self.assertEqual((role, width), ('selected', 2))
 
-        dialog = self._make_dialog_with_swatches(selected, [selected, non_selected])
-        refresh_swatch_borders(dialog)
+    def test_non_selected_swatch_uses_default_border(self):
+        role, width = _real_colors_module._swatch_border_style(0x00FF00FF, 0, 0xFF0000FF, None, False)
+        self.assertEqual((role, width), ('default', 1))
 
-        non_selected_button = dialog._swatch_cells[1][3]
-        stylesheet_call = non_selected_button.setStyleSheet.call_args[0][0]
-        self.assertIn("border: 1px solid #555", stylesheet_call,
-                      "Non-selected swatch must have 1px #555 border")
+    def test_zero_selected_color_is_selected(self):
+        """Color 0 (black) is a valid selection — the border check cannot use a falsy test."""
+        role, _width = _real_colors_module._swatch_border_style(0, 0, 0, None, False)
+        self.assertEqual(role, 'selected')
 
-    def test_refresh_swatch_borders_handles_zero_selected_color(self):
-        """_refresh_swatch_borders correctly identifies color 0 as selected (not falsy)."""
-        refresh_swatch_borders = self._get_refresh_swatch_borders()
-        black = 0  # valid color int
-        other = 0xFF0000FF
+    def test_hint_row_and_hover_borders(self):
+        border = _real_colors_module._swatch_border_style
+        self.assertEqual(border(0x00FF00FF, 2, None, 2, False), ('hint', 2))
+        self.assertEqual(border(0x00FF00FF, 1, None, 2, True), ('hover', 1))
 
-        dialog = self._make_dialog_with_swatches(black, [black, other])
-        refresh_swatch_borders(dialog)
+    def test_dialog_applies_no_per_swatch_stylesheets(self):
+        """ColorPaletteDialog paints its swatches; it must not set a stylesheet per swatch."""
+        with open(_REPO_ROOT / 'colors.py', 'r') as source_file:
+            tree = ast.parse(source_file.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ClassDef) and node.name == 'ColorPaletteDialog':
+                calls = [
+                    call.func.attr for call in ast.walk(node)
+                    if isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute)
+                ]
+                self.assertNotIn('setStyleSheet', calls)
+                self.assertLessEqual(calls.count('QPushButton'), 3,
+                                     "only Custom Color..., OK and Cancel are buttons")
+                return
+        self.fail("ColorPaletteDialog not found in colors.py")
+
+
+class TestSwatchLayout(unittest.TestCase):
+    """Geometry and hit-testing of the painted ColorPaletteDialog swatch grid."""
+
+    def _layout(self, custom=(), backdrop=(), defaults=()):
+        return _real_colors_module._SwatchLayout([
+            ("Custom Colors", list(custom)),
+            ("Backdrop Colors", list(backdrop)),
+            ("Nuke Defaults", list(defaults)),
+        ])
+
+    def test_empty_groups_have_no_header(self):
+        layout = self._layout(backdrop=[1, 2], defaults=[3])
+        self.assertEqual([label for label, _top in layout.headers],
+                         ["Backdrop Colors", "Nuke Defaults"])
+
+    def test_logical_rows_skip_headers_and_wrap_per_group(self):
+        layout = self._layout(custom=list(range(1, 10)), backdrop=[100])
+        addresses = [(cell[0], cell[1]) for cell in layout.cells]
+        self.assertEqual(addresses[:2], [(0, 0), (1, 0)])
+        self.assertEqual(addresses[8], (0, 1), "ninth custom color wraps to row b")
+        self.assertEqual(addresses[9], (0, 2), "next group starts on a fresh row")
+        self.assertEqual(layout.color_at(0, 2), 100)
+        self.assertIsNone(layout.color_at(5, 2))
+
+    def test_hit_test_finds_swatch_and_ignores_headers(self):
+        layout = self._layout(custom=[0xFF0000FF, 0x00FF00FF])
+        group_col, logical_row, color_int, left, top = layout.cells[1]
+        self.assertEqual(layout.index_at(left + 5, top + 5), 1)
+        self.assertIsNone(layout.index_at(left + 5, 2), "header band is not a swatch")
+        self.assertIsNone(layout.index_at(left - 1, top + 5), "spacing between swatches")
+
+    def test_indices_between_returns_only_visible_rows(self):
+        layout = self._layout(backdrop=list(range(1, 801)))
+        _col, _row, _color, _left, top = layout.cells[400]
+        visible = layout.indices_between(top, top + 1)
+        self.assertEqual(len(visible), layout.columns)
+        self.assertIn(400, visible)
+
+    def test_append_color_grows_first_group_and_shifts_later_groups(self):
+        source_colors = [1]
+        layout = self._layout(custom=source_colors, backdrop=[2])
+        layout.append_color(3)
+        self.assertEqual([cell[2] for cell in layout.cells], [1, 3, 2])
+        self.assertEqual(source_colors, [1], "layout must not mutate the caller's list")
+
+    def test_append_to_empty_custom_group_puts_it_first(self):
+        layout = self._layout(backdrop=[2])
+        layout.append_color(3)
+        self.assertEqual(layout.headers[0][0], "Custom Colors")
+        self.assertEqual(layout.color_at(0, 0), 3)
+
+
+class TestBackdropColorClustering(unittest.TestCase):
+    """Near-identical backdrop shades collapse to one swatch; results are cached per script."""
 
-        black_button = dialog._swatch_cells[0][3]
-        stylesheet_call = black_button.setStyleSheet.call_args[0][0]
-        expected_highlight = _PickerTestHarness.HARNESS_HIGHLIGHT_COLOR
-        self.assertIn(f"border: 2px solid {expected_highlight}", stylesheet_call,
-                      "Black swatch (color 0) must be selected with palette highlight — cannot use falsy test")
+    def setUp(self):
+        _real_colors_module._backdrop_color_cache = None
+
+    def test_near_duplicates_merge_and_distinct_colors_stay(self):
+        clustered = _real_colors_module._cluster_colors(
+            [0xFF0000FF, 0x00FF00FF, 0xFE0101FF, 0x0000FFFF])
+        self.assertEqual(clustered, [0xFF0000FF, 0x00FF00FF, 0x0000FFFF])
+
+    def test_most_used_shade_represents_its_cluster(self):
+        clustered = _real_colors_module._cluster_colors(
+            [0x404040FF, 0x414141FF, 0x414141FF, 0xC0C0C0FF])
+        self.assertEqual(clustered, [0x414141FF, 0xC0C0C0FF])
+
+    def test_zero_threshold_only_removes_exact_duplicates(self):
+        clustered = _real_colors_module._cluster_colors(
+            [0x404040FF, 0x414141FF, 0x404040FF], threshold=0.0)
+        self.assertEqual(clustered, [0x404040FF, 0x414141FF])
+
+    def test_srgb_to_lab_reference_points(self):
+        white = _real_colors_module._srgb_to_lab(255, 255, 255)
+        black = _real_colors_module._srgb_to_lab(0, 0, 0)
+        self.assertAlmostEqual(white[0], 100.0, places=1)
+        self.assertAlmostEqual(black[0], 0.0, places=1)
+
+    def _backdrops(self, colors):
+        nodes = []
+        for color in colors:
+            node = MagicMock()
+            node.__getitem__ = MagicMock(return_value=MagicMock(value=MagicMock(return_value=color)))
+            nodes.append(node)
+        return nodes
+
+    def test_script_backdrop_colors_are_cached_until_backdrops_change(self):
+        import nuke as nuke_stub
+        backdrops = self._backdrops([0xFF0000FF, 0xFE0101FF])
+        real_cluster = _real_colors_module._cluster_colors
+        with patch.object(nuke_stub, 'allNodes', return_value=backdrops), \
+             patch.object(_real_colors_module, '_cluster_colors',
+                          side_effect=real_cluster) as cluster:
+            first = _real_colors_module._get_script_backdrop_colors()
+            second = _real_colors_module._get_script_backdrop_colors()
+            self.assertEqual(first, [0xFF0000FF])
+            self.assertEqual(second, first)
+            self.assertEqual(cluster.call_count, 1)
+            backdrops.extend(self._backdrops([0x0000FFFF]))
+            third = _real_colors_module._get_script_backdrop_colors()
+        self.assertEqual(third, [0xFF0000FF, 0x0000FFFF])
+        self.assertEqual(cluster.call_count, 2)
 
 
 # ---------------------------------------------------------------------------
@@ -884,34 +976,17 @@ class TestColorPaletteDialogGroupLabels(unittest.TestCase):
     so the Custom Colors section is visually distinct from backdrop and Nuke defaults.
     """
 
-    def test_build_ui_source_adds_group_labels_via_qlabel(self):
-        """_build_ui must use QLabel for group section headers in the swatch grid."""
-        with open(_REPO_ROOT / 'colors.py', 'r') as source_file:
-            source_text = source_file.read()
-        tree = ast.parse(source_text)
-
-        build_ui_node = None
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef) and node.name == 'ColorPaletteDialog':
-                for item in node.body:
-                    if isinstance(item, ast.FunctionDef) and item.name == '_build_ui':
-                        build_ui_node = item
-                        break
-                break
-
-        self.assertIsNotNone(build_ui_node,
-                             "ColorPaletteDialog._build_ui not found in colors.py")
-
-        has_qlabel_call = False
-        for node in ast.walk(build_ui_node):
-            if (isinstance(node, ast.Call) and
-                    isinstance(node.func, ast.Attribute) and
-                    node.func.attr == 'QLabel'):
-                has_qlabel_call = True
-                break
-
-        self.assertTrue(has_qlabel_call,
-                        "ColorPaletteDialog._build_ui must use QLabel for group section headers")
+    def test_swatch_layout_places_a_header_above_each_group(self):
+        """Group section headers are painted by the swatch grid above each group's swatches."""
+        layout = _real_colors_module._SwatchLayout([
+            ("Custom Colors", [0xFF0000FF]),
+            ("Backdrop Colors", [0x00FF00FF]),
+        ])
+        (first_label, first_top), (second_label, second_top) = layout.headers
+        self.assertEqual((first_label, second_label), ("Custom Colors", "Backdrop Colors"))
+        self.assertLess(first_top, layout.cells[0][4])
+        self.assertLess(layout.cells[0][4], second_top)
+        self.assertLess(second_top, layout.cells[1][4])
 
     def test_group_label_texts_in_source(self):
         """_build_ui source must include 'Custom Colors', 'Backdrop Colors', and 'Nuke Defaults' labels."""
@@ -1297,6 +1372,14 @@ class TestMenuCallbackStoredOnPrefsModule(unittest.TestCase):
                 self._plugin_checkbox.isChecked.return_value = True
                 self._link_mode_checkbox = MagicMock()
                 self._link_mode_checkbox.isChecked.return_value = True
+                self._manifest_checkbox = MagicMock()
+                self._manifest_checkbox.isChecked.return_value = False
+                self._prewarm_checkbox = MagicMock()
+                self._prewarm_checkbox.isChecked.return_value = False
+                self._expression_labels_checkbox = MagicMock()
+                self._expression_labels_checkbox.isChecked.return_value = False
+                self._legacy_dot_anchors_checkbox = MagicMock()
+                self._legacy_dot_anchors_checkbox.isChecked.return_value = True
                 self._local_custom_colors = []
                 self._original_custom_colors = []
                 self.accept = MagicMock()
@@ -1381,105 +1464,112 @@ class TestPrefsDialogOriginalCustomColorsSnapshot(unittest.TestCase):
                         "PrefsDialog must define _recolor_anchors_for_changed_custom_colors() "
                         "to recolor anchor nodes when a custom color swatch is edited")
 
-    def test_recolor_helper_calls_propagate_anchor_color_on_matching_nodes(self):
-        """_recolor_anchors_for_changed_custom_colors calls propagate_anchor_color for matching nodes.
-
-        The implementation uses anchor.all_anchors() (not nuke.allNodes()) so that
-        anchor nodes are correctly identified regardless of knob structure.
-        """
+    def _run_recolor_helper(self, old_colors, new_colors):
         recolor_method = _extract_prefs_dialog_method_from_source(
             '_recolor_anchors_for_changed_custom_colors'
         )
         if recolor_method is None:
             self.fail("_recolor_anchors_for_changed_custom_colors not found in PrefsDialog")
 
-        old_color = 0xFF0000FF
-        new_color = 0x00FF00FF
-
-        # Build a matching anchor node stub — identified via all_anchors(), no knob check needed
-        tile_color_knob = MagicMock()
-        tile_color_knob.value.return_value = old_color
-
-        matching_anchor = MagicMock()
-        matching_anchor.__getitem__ = MagicMock(side_effect=lambda key: tile_color_knob if key == 'tile_color' else MagicMock())
-
-        # A second anchor whose tile_color does NOT match old_color
-        non_matching_tile_color = MagicMock()
-        non_matching_tile_color.value.return_value = 0xAABBCCFF
-        non_matching_anchor = MagicMock()
-        non_matching_anchor.__getitem__ = MagicMock(side_effect=lambda key: non_matching_tile_color if key == 'tile_color' else MagicMock())
-
-        propagate_calls = []
-
         class PrefsDialogHarness:
             pass
 
-        harness = PrefsDialogHarness()
-
         import anchor as anchor_module_real
-        original_propagate = anchor_module_real.propagate_anchor_color
-        original_all_anchors = anchor_module_real.all_anchors
-
-        try:
-            anchor_module_real.propagate_anchor_color = lambda node, color: propagate_calls.append((node, color))
-            anchor_module_real.all_anchors = lambda: [matching_anchor, non_matching_anchor]
-            # Patch the 'import anchor as anchor_module' that _recolor_anchors_for_changed_custom_colors uses
-            import sys
-            sys.modules['anchor'] = anchor_module_real
-            recolor_method(harness, [old_color], [new_color])
-        finally:
-            anchor_module_real.propagate_anchor_color = original_propagate
-            anchor_module_real.all_anchors = original_all_anchors
-
-        self.assertEqual(len(propagate_calls), 1,
-                         "_recolor_anchors_for_changed_custom_colors must call propagate_anchor_color "
-                         "exactly once for the anchor whose tile_color matched the old custom color")
-        called_node, called_color = propagate_calls[0]
-        self.assertIs(called_node, matching_anchor,
-                      "propagate_anchor_color must be called with the matching anchor node")
-        self.assertEqual(called_color, new_color,
-                         "propagate_anchor_color must be called with the new color value")
+        sys.modules['anchor'] = anchor_module_real
+        with patch.object(anchor_module_real, 'recolor_anchors') as recolor_anchors:
+            recolor_method(PrefsDialogHarness(), old_colors, new_colors)
+        return recolor_anchors
+
+    def test_recolor_helper_remaps_changed_colors_in_one_call(self):
+        """Every changed custom color goes to anchor.recolor_anchors() in a single remap."""
+        recolor_anchors = self._run_recolor_helper(
+            [0xFF0000FF, 0x00FF00FF, 0x0000FFFF],
+            [0xFF0000FF, 0x111111FF, 0x222222FF],
+        )
+        recolor_anchors.assert_called_once_with({0x00FF00FF: 0x111111FF, 0x0000FFFF: 0x222222FF})
 
     def test_recolor_helper_skips_unchanged_colors(self):
         """_recolor_anchors_for_changed_custom_colors does nothing when old and new colors are equal."""
-        recolor_method = _extract_prefs_dialog_method_from_source(
-            '_recolor_anchors_for_changed_custom_colors'
-        )
-        if recolor_method is None:
-            self.fail("_recolor_anchors_for_changed_custom_colors not found in PrefsDialog")
+        recolor_anchors = self._run_recolor_helper([0xFF0000FF], [0xFF0000FF])
+        recolor_anchors.assert_not_called()
 
-        same_color = 0xFF0000FF
 
-        tile_color_knob = MagicMock()
-        tile_color_knob.value.return_value = same_color
+class TestRecolorAnchors(unittest.TestCase):
+    """anchor.recolor_anchors() applies a color remap to anchors and links in one pass."""
 
-        anchor_node = MagicMock()
-        anchor_node.__getitem__ = MagicMock(return_value=tile_color_knob)
-
-        propagate_calls = []
-
-        class PrefsDialogHarness:
-            pass
-
-        harness = PrefsDialogHarness()
-
-        import anchor as anchor_module_real
-        original_propagate = anchor_module_real.propagate_anchor_color
-        original_all_anchors = anchor_module_real.all_anchors
-
-        try:
-            anchor_module_real.propagate_anchor_color = lambda n, c: propagate_calls.append((n, c))
-            anchor_module_real.all_anchors = lambda: [anchor_node]
-            import sys
-            sys.modules['anchor'] = anchor_module_real
-            recolor_method(harness, [same_color], [same_color])
-        finally:
-            anchor_module_real.propagate_anchor_color = original_propagate
-            anchor_module_real.all_anchors = original_all_anchors
-
-        self.assertEqual(len(propagate_calls), 0,
-                         "_recolor_anchors_for_changed_custom_colors must not call propagate_anchor_color "
-                         "when the old and new color values are identical")
+    def setUp(self):
+        import anchor as anchor_module
+        self.anchor_mod = anchor_module
+
+    def _node(self, color, node_class='NoOp', link_target=None, anchor_id_value=''):
+        knobs = {'tile_color': MagicMock()}
+        knobs['tile_color'].value.return_value = color
+        if link_target is not None:
+            knobs[self.anchor_mod.KNOB_NAME] = MagicMock()
+            knobs[self.anchor_mod.KNOB_NAME].getText.return_value = link_target
+        if anchor_id_value:
+            from constants import ANCHOR_ID_KNOB_NAME, LINK_ANCHOR_ID_KNOB_NAME
+            id_knob_name = (LINK_ANCHOR_ID_KNOB_NAME if link_target is not None
+                            else ANCHOR_ID_KNOB_NAME)
+            knobs[id_knob_name] = MagicMock()
+            knobs[id_knob_name].getText.return_value = anchor_id_value
+        node = MagicMock()
+        node.Class.return_value = node_class
+        node.knobs.return_value = knobs
+        node.__getitem__ = MagicMock(side_effect=knobs.__getitem__)
+        node.link_target = link_target
+        return node
+
+    def _recolor(self, anchors, links, remap):
+        import link as link_module
+        import nuke as nuke_stub
+        fqnns = {id(anchor_node): 'Anchor_%d' % i for i, anchor_node in enumerate(anchors)}
+        with patch.object(self.anchor_mod, 'all_anchors', return_value=anchors), \
+             patch.object(nuke_stub, 'allNodes', return_value=anchors + links) as all_nodes, \
+             patch.object(nuke_stub, 'Undo') as undo_class, \
+             patch.object(link_module, 'is_anchor', side_effect=lambda node: node in anchors), \
+             patch.object(link_module, 'is_link',
+                          side_effect=lambda node: node.link_target is not None), \
+             patch.object(link_module, 'get_fully_qualified_node_name',
+                          side_effect=lambda node: fqnns[id(node)]):
+            count = self.anchor_mod.recolor_anchors(remap)
+        return count, all_nodes, undo_class
+
+    def test_recolors_matching_anchors_and_their_links_in_one_undo_step(self):
+        red_anchor = self._node(0xFF0000FF)
+        blue_anchor = self._node(0x0000FFFF)
+        red_link = self._node(0xFF0000FF, link_target='Anchor_0')
+        blue_link = self._node(0x0000FFFF, link_target='Anchor_1')
+        count, all_nodes, undo_class = self._recolor(
+            [red_anchor, blue_anchor], [red_link, blue_link], {0xFF0000FF: 0x00FF00FF})
+        self.assertEqual(count, 1)
+        red_anchor['tile_color'].setValue.assert_called_once_with(0x00FF00FF)
+        red_link['tile_color'].setValue.assert_called_once_with(0x00FF00FF)
+        blue_anchor['tile_color'].setValue.assert_not_called()
+        blue_link['tile_color'].setValue.assert_not_called()
+        self.assertEqual(all_nodes.call_count, 1, "links are gathered in a single group scan")
+        undo_class.return_value.begin.assert_called_once()
+        undo_class.return_value.end.assert_called_once()
+
+    def test_links_follow_a_renamed_anchor_by_id(self):
+        renamed_anchor = self._node(0xFF0000FF, anchor_id_value='abc')
+        stale_link = self._node(0xFF0000FF, link_target='Anchor_OldName', anchor_id_value='abc')
+        self._recolor([renamed_anchor], [stale_link], {0xFF0000FF: 0x00FF00FF})
+        stale_link['tile_color'].setValue.assert_called_once_with(0x00FF00FF)
+
+    def test_remaps_do_not_cascade(self):
+        first = self._node(0x111111FF)
+        second = self._node(0x222222FF)
+        self._recolor([first, second], [], {0x111111FF: 0x222222FF, 0x222222FF: 0x333333FF})
+        first['tile_color'].setValue.assert_called_once_with(0x222222FF)
+        second['tile_color'].setValue.assert_called_once_with(0x333333FF)
+
+    def test_dot_anchors_and_unmatched_colors_are_untouched(self):
+        dot_anchor = self._node(0xFF0000FF, node_class='Dot')
+        count, all_nodes, undo_class = self._recolor([dot_anchor], [], {0xFF0000FF: 0x00FF00FF})
+        self.assertEqual(count, 0)
+        dot_anchor['tile_color'].setValue.assert_not_called()
+        undo_class.assert_not_called()
 
 
 # ---------------------------------------------------------------------------
@@ -1516,10 +1606,15 @@ class TestRecolorUsesAllAnchors(unittest.TestCase):
 
         self.assertIsNotNone(recolor_source,
                              "PrefsDialog._recolor_anchors_for_changed_custom_colors not found")
-        self.assertIn('all_anchors()', recolor_source,
-                      "_recolor_anchors_for_changed_custom_colors must call anchor_module.all_anchors() "
-                      "to iterate anchor nodes — nuke.allNodes() + knob('anchor_name') is wrong because "
-                      "anchor nodes have no 'anchor_name' knob")
+        self.assertIn('recolor_anchors(', recolor_source,
+                      "_recolor_anchors_for_changed_custom_colors must delegate to "
+                      "anchor.recolor_anchors()")
+        import inspect
+        import anchor as anchor_module
+        self.assertIn('all_anchors()', inspect.getsource(anchor_module.anchors_by_tile_color),
+                      "the color index must iterate anchor nodes via all_anchors() — "
+                      "nuke.allNodes() + knob('anchor_name') is wrong because anchor nodes "
+                      "have no 'anchor_name' knob")
         self.assertNotIn("knob('anchor_name')", recolor_source,
                          "_recolor_anchors_for_changed_custom_colors must not use knob('anchor_name') "
                          "to identify anchor nodes — anchor nodes have no such knob; use all_anchors() instead")
@@ -1603,43 +1698,16 @@ class TestHintModeKeyAssignment(unittest.TestCase):
                          f"got {row_keys!r}")
 
     def test_hint_overlay_shows_letter_then_number(self):
-        """_update_hint_overlays must display letter (row) then number (column) on each swatch button.
+        """Hint overlays display letter (row) then number (column), e.g. "a1", "a2", "b1".
 
-        The display format is row_label + col_label, e.g. "a1", "a2", "b1".
-        This matches the letter-first, number-second navigation order.
+        Letter-first matches the letter-then-number navigation order.
         """
-        with open(_REPO_ROOT / 'colors.py', 'r') as source_file:
-            source_text = source_file.read()
-
-        # Extract _update_hint_overlays from ColorPaletteDialog
-        tree = ast.parse(source_text)
-        overlay_source = None
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef) and node.name == 'ColorPaletteDialog':
-                for item in node.body:
-                    if (isinstance(item, ast.FunctionDef) and
-                            item.name == '_update_hint_overlays'):
-                        lines = source_text.splitlines()
-                        overlay_source = '\n'.join(
-                            lines[item.lineno - 1:item.end_lineno]
-                        )
-                        break
-                break
-
-        self.assertIsNotNone(overlay_source,
-                             "ColorPaletteDialog._update_hint_overlays not found in colors.py")
-        # The label must be formed as row_label (letter) then col_label (number)
-        # i.e. f"{row_label}{col_label}" — letter first matches navigation order
-        self.assertIn('col_label', overlay_source,
-                      "_update_hint_overlays must use col_label variable")
-        self.assertIn('row_label', overlay_source,
-                      "_update_hint_overlays must use row_label variable")
-        # Row (letter) is first in the display string, column (number) is second
-        import re
-        format_match = re.search(r'f["\'].*\{row_label\}.*\{col_label\}.*["\']', overlay_source)
-        self.assertIsNotNone(format_match,
-                             "_update_hint_overlays must display row_label (letter) before col_label (number) "
-                             "e.g. f'{row_label}{col_label}' → 'a1', 'b2' — letter-first matches navigation order")
+        hint_label = _real_colors_module._hint_label
+        self.assertEqual(hint_label(0, 0), 'a1')
+        self.assertEqual(hint_label(1, 0), 'a2')
+        self.assertEqual(hint_label(0, 1), 'b1')
+        self.assertEqual(hint_label(9, 2), 'c0')
+        self.assertEqual(hint_label(10, 26), '??')
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,176 @@
+"""Tests for persistent anchor IDs.
+
+Covers:
+- New anchors get a unique ID; legacy anchors get one when first linked
+- setup_link_node() stores the anchor ID on the link, and clears it for non-anchor inputs
+- find_anchor_node() resolves by ID before falling back to the stored FQNN
+- rename_anchor_to() leaves ID-carrying links' references untouched
+- Pasted copies of an anchor get a fresh ID; cut-and-pasted anchors keep theirs
+- Uncolliding a paste reads one index snapshot and moves the generation once
+- refresh_link_fqnn() brings a renamed anchor's FQNN back onto the link at copy time
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import anchor
+import link
+from constants import ANCHOR_ID_KNOB_NAME, KNOB_NAME, LINK_ANCHOR_ID_KNOB_NAME
+
+
+def _knobs(*names, **values):
+    import nuke as _nuke
+    knobs = {name: _nuke.StubKnob('', name) for name in names}
+    knobs.update({name: _nuke.StubKnob(value, name) for name, value in values.items()})
+    return knobs
+
+
+def _anchor(name, anchor_id_value=None):
+    import nuke as _nuke
+    knobs = _knobs('tile_color', label=name[len('Anchor_'):])
+    if anchor_id_value is not None:
+        knobs[ANCHOR_ID_KNOB_NAME] = _nuke.StubKnob(anchor_id_value, ANCHOR_ID_KNOB_NAME)
+    node = _nuke.StubNode(name=name, node_class='NoOp', knobs_dict=knobs)
+    node.setInput(0, _nuke.StubNode(name='Read1', node_class='Read',
+                                    knobs_dict=_knobs('label', 'tile_color')))
+    return node
+
+
+def _link(fqnn, anchor_id_value=None):
+    import nuke as _nuke
+    knobs = _knobs('hide_input', 'tile_color', 'label', 'note_font_size', **{KNOB_NAME: fqnn})
+    if anchor_id_value is not None:
+        knobs[LINK_ANCHOR_ID_KNOB_NAME] = _nuke.StubKnob(anchor_id_value, LINK_ANCHOR_ID_KNOB_NAME)
+    return _nuke.StubNode(name='Link', node_class='NoOp', knobs_dict=knobs)
+
+
+class _ScriptTestCase(unittest.TestCase):
+    """Runs each test against a root-level script holding self.nodes."""
+
+    def setUp(self):
+        import nuke as nuke_stub
+        self.nuke = nuke_stub
+        self.nodes = []
+        root = MagicMock(name='root')
+        root.Class.return_value = 'Root'
+        root.name.return_value = 'destScript.nk'
+        patches = [
+            patch.object(nuke_stub, 'root', return_value=root),
+            patch.object(nuke_stub, 'thisGroup', return_value=root),
+            patch.object(nuke_stub, 'allNodes',
+                         side_effect=lambda class_name=None, group=None: list(self.nodes)),
+            patch.object(link, '_group_indexes', {}),
+            patch.object(link, '_group_index_cache_enabled', False),
+            patch.object(link, 'find_node_default_color', return_value=0),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class TestAssigningIds(_ScriptTestCase):
+
+    def test_new_anchor_gets_an_id(self):
+        new_node = _anchor('NoOp1')
+        with patch.object(self.nuke, 'createNode', return_value=new_node), \
+             patch.object(anchor, 'find_anchor_color', return_value=0):
+            created = anchor.create_anchor_named('Plate')
+        self.assertTrue(link.anchor_id(created))
+
+    def test_ids_are_unique(self):
+        first, second = _anchor('Anchor_A'), _anchor('Anchor_B')
+        self.assertNotEqual(link.assign_new_anchor_id(first), link.assign_new_anchor_id(second))
+
+    def test_linking_a_legacy_anchor_assigns_and_stores_its_id(self):
+        legacy = _anchor('Anchor_Plate')
+        new_link = _link('')
+        link.setup_link_node(legacy, new_link)
+        self.assertTrue(link.anchor_id(legacy))
+        self.assertEqual(link.link_anchor_id(new_link), link.anchor_id(legacy))
+        self.assertEqual(new_link[KNOB_NAME].getText(), 'destScript.Anchor_Plate')
+
+    def test_repointing_a_link_at_a_plain_node_clears_its_anchor_id(self):
+        old_link = _link('destScript.Anchor_Plate', anchor_id_value='abc')
+        plain = self.nuke.StubNode(name='Grade1', node_class='Grade',
+                                   knobs_dict=_knobs('label', 'tile_color'))
+        link.setup_link_node(plain, old_link)
+        self.assertEqual(link.link_anchor_id(old_link), '')
+
+
+class TestResolvingById(_ScriptTestCase):
+
+    def test_id_wins_over_a_stale_fqnn(self):
+        renamed = _anchor('Anchor_NewName', anchor_id_value='abc')
+        impostor = _anchor('Anchor_OldName', anchor_id_value='xyz')
+        self.nodes = [renamed, impostor]
+        id_link = _link('destScript.Anchor_OldName', anchor_id_value='abc')
+        self.assertIs(link.find_anchor_node(id_link), renamed)
+
+    def test_links_without_an_id_fall_back_to_the_fqnn(self):
+        legacy_link = _link('destScript.Anchor_Plate')
+        with patch.object(self.nuke, 'toNode', return_value='plate') as to_node:
+            self.assertEqual(link.find_anchor_node(legacy_link), 'plate')
+        to_node.assert_called_once_with('root.Anchor_Plate')
+
+    def test_get_links_for_anchor_matches_id_and_legacy_links(self):
+        plate = _anchor('Anchor_Plate', anchor_id_value='abc')
+        id_link = _link('destScript.Anchor_Stale', anchor_id_value='abc')
+        legacy_link = _link('destScript.Anchor_Plate')
+        other_link = _link('destScript.Anchor_Plate', anchor_id_value='xyz')
+        self.nodes = [plate, id_link, legacy_link, other_link]
+        self.assertEqual(anchor.get_links_for_anchor(plate), [id_link, legacy_link])
+
+
+class TestRenameWithIds(_ScriptTestCase):
+
+    def test_rename_leaves_id_links_references_alone(self):
+        plate = _anchor('Anchor_Plate', anchor_id_value='abc')
+        id_link = _link('destScript.Anchor_Plate', anchor_id_value='abc')
+        legacy_link = _link('destScript.Anchor_Plate')
+        self.nodes = [plate, id_link, legacy_link]
+        anchor.rename_anchor_to(plate, 'Background')
+        self.assertEqual(id_link[KNOB_NAME].getText(), 'destScript.Anchor_Plate')
+        self.assertEqual(legacy_link[KNOB_NAME].getText(), 'destScript.Anchor_Background')
+        self.assertEqual(id_link['label'].getValue(), 'Link: Background')
+        self.assertIs(link.find_anchor_node(id_link), plate)
+
+    def test_copy_refreshes_the_fqnn_for_other_scripts(self):
+        plate = _anchor('Anchor_Background', anchor_id_value='abc')
+        id_link = _link('destScript.Anchor_Plate', anchor_id_value='abc')
+        self.nodes = [plate, id_link]
+        link.refresh_link_fqnn(id_link)
+        self.assertEqual(id_link[KNOB_NAME].getText(), 'destScript.Anchor_Background')
+
+
+class TestPastedAnchorIds(_ScriptTestCase):
+
+    def test_copy_pasted_beside_original_gets_a_new_id(self):
+        original = _anchor('Anchor_Plate', anchor_id_value='abc')
+        copy = _anchor('Anchor_Plate1', anchor_id_value='abc')
+        self.nodes = [original, copy]
+        self.assertEqual(link.uncollide_pasted_anchor_ids([copy]), [copy])
+        self.assertEqual(link.anchor_id(original), 'abc')
+        self.assertNotIn(link.anchor_id(copy), ('', 'abc'))
+
+    def test_cut_and_pasted_anchor_keeps_its_id(self):
+        moved = _anchor('Anchor_Plate', anchor_id_value='abc')
+        self.nodes = [moved]
+        self.assertEqual(link.uncollide_pasted_anchor_ids([moved]), [])
+        self.assertEqual(link.anchor_id(moved), 'abc')
+
+    def test_large_paste_scans_the_group_once(self):
+        link.enable_group_index_cache()
+        originals = [_anchor('Anchor_P%d' % i, anchor_id_value='id%d' % i) for i in range(50)]
+        copies = [_anchor('Anchor_C%d' % i, anchor_id_value='id%d' % i) for i in range(50)]
+        self.nodes = originals + copies
+        generation = link.anchor_generation()
+        self.assertEqual(link.uncollide_pasted_anchor_ids(copies), copies)
+        self.assertEqual(self.nuke.allNodes.call_count, 1)
+        self.assertEqual(link.anchor_generation(), generation + 1)
+        new_ids = {link.anchor_id(copy) for copy in copies}
+        self.assertEqual(len(new_ids), 50)
+        self.assertFalse(new_ids & {link.anchor_id(original) for original in originals})
+
+
+if __name__ == '__main__':
+    unittest.main()
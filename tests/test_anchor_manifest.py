@@ -0,0 +1,379 @@
+"""Tests for the script-embedded anchor manifest (manifest.py) and the seeded anchor index.
+
+Covers:
+- build_manifest() maps anchor full names to display names and lists links per anchor
+- Anchors sharing a display name each keep their manifest entry
+- write_manifest() / read_manifest() round-trip through a hidden Root knob
+- read_manifest() rejects corrupt, unknown-version and version 1 payloads
+- on_script_save() / on_script_load() are no-ops unless prefs.anchor_manifest_enabled
+- all_anchors() resolves seeded names lazily and drops stale entries
+- find_anchor_by_name() falls back to a full scan on a seeded miss
+- rename_anchor_to() keeps an active seed in step with the new node name
+- Anchors created or renamed outside the plugin join an active seed; Group anchors do not
+- get_links_for_anchor() reads the seeded link lists, until a link is created
+"""
+
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+
+def _make_noop_anchor(display_name, label=None):
+    import nuke as _nuke
+
+    from constants import ANCHOR_PREFIX
+    return _nuke.StubNode(
+        name=ANCHOR_PREFIX + display_name,
+        node_class='NoOp',
+        knobs_dict={
+            'label': _nuke.StubKnob(display_name if label is None else label),
+            'tile_color': _nuke.StubKnob(0),
+        },
+    )
+
+
+def _make_dot_anchor(name, label):
+    import nuke as _nuke
+
+    from constants import DOT_ANCHOR_KNOB_NAME
+    return _nuke.StubNode(
+        name=name,
+        node_class='Dot',
+        knobs_dict={
+            'label': _nuke.StubKnob(label),
+            'tile_color': _nuke.StubKnob(0),
+            DOT_ANCHOR_KNOB_NAME: _nuke.StubKnob(True),
+        },
+    )
+
+
+def _make_link(stored_fqnn, name='NoOp1'):
+    import nuke as _nuke
+
+    from constants import KNOB_NAME
+    return _nuke.StubNode(
+        name=name,
+        node_class='NoOp',
+        knobs_dict={
+            KNOB_NAME: _nuke.StubKnob(stored_fqnn),
+            'label': _nuke.StubKnob(''),
+            'hide_input': _nuke.StubKnob(True),
+        },
+    )
+
+
+def _make_root():
+    import nuke as _nuke
+    root = _nuke.StubNode(name='root', node_class='Root')
+    return root
+
+
+class _ManifestTestCase(unittest.TestCase):
+
+    def setUp(self):
+        import link
+        import prefs
+        link.invalidate_anchor_index()
+        self._saved_manifest_pref = prefs.anchor_manifest_enabled
+        self._saved_enabled_pref = prefs.plugin_enabled
+        prefs.plugin_enabled = True
+
+    def tearDown(self):
+        import link
+        import prefs
+        link.invalidate_anchor_index()
+        prefs.anchor_manifest_enabled = self._saved_manifest_pref
+        prefs.plugin_enabled = self._saved_enabled_pref
+
+
+class TestBuildManifest(_ManifestTestCase):
+
+    def test_build_manifest_maps_full_names_and_links(self):
+        """build_manifest() records each anchor's display name and the links pointing at it."""
+        import nuke as _nuke
+
+        import manifest
+
+        anchor_a = _make_noop_anchor('Plate')
+        anchor_b = _make_noop_anchor('Camera')
+        link_one = _make_link('destScript.Anchor_Plate', name='NoOp1')
+        link_two = _make_link('destScript.Anchor_Plate', name='NoOp2')
+        unrelated = _make_link('otherScript.Anchor_Plate', name='NoOp3')
+
+        with patch.object(_nuke, 'allNodes',
+                          return_value=[anchor_a, anchor_b, link_one, link_two, unrelated]):
+            result = manifest.build_manifest()
+
+        self.assertEqual(result, {
+            'version': manifest.MANIFEST_VERSION,
+            'anchors': {'Anchor_Plate': 'Plate', 'Anchor_Camera': 'Camera'},
+            'links': {'Anchor_Plate': ['NoOp1', 'NoOp2']},
+        })
+
+    def test_links_follow_a_renamed_anchor_by_id(self):
+        """A link carrying the anchor's ID is listed even though its stored FQNN is stale."""
+        import nuke as _nuke
+
+        import manifest
+        from constants import ANCHOR_ID_KNOB_NAME, LINK_ANCHOR_ID_KNOB_NAME
+
+        renamed = _make_noop_anchor('Plate')
+        renamed[ANCHOR_ID_KNOB_NAME] = _nuke.StubKnob('abc')
+        stale_link = _make_link('destScript.Anchor_OldName')
+        stale_link[LINK_ANCHOR_ID_KNOB_NAME] = _nuke.StubKnob('abc')
+
+        with patch.object(_nuke, 'allNodes', return_value=[renamed, stale_link]):
+            result = manifest.build_manifest()
+
+        self.assertEqual(result['links'], {'Anchor_Plate': ['NoOp1']})
+
+    def test_anchors_sharing_a_display_name_all_survive_a_reload(self):
+        """Two Dot anchors labelled "Plate" and Anchor_Plate are all seeded, none collapsed."""
+        import nuke as _nuke
+
+        import anchor
+        import manifest
+        import prefs
+
+        dots = [_make_dot_anchor('Anchor_Plate%d' % i, 'Plate') for i in (1, 2)]
+        noop = _make_noop_anchor('Plate')
+        nodes = dots + [noop]
+        prefs.anchor_manifest_enabled = True
+        root = _make_root()
+        with patch.object(_nuke, 'root', return_value=root), \
+             patch.object(_nuke, 'allNodes', return_value=nodes):
+            manifest.on_script_save()
+            manifest.on_script_load()
+
+        lookup = {node.fullName(): node for node in nodes}
+        with patch.object(_nuke, 'toNode', side_effect=lookup.get), \
+             patch.object(_nuke, 'allNodes', return_value=[]):
+            self.assertEqual(sorted(node.name() for node in anchor.all_anchors()),
+                             ['Anchor_Plate', 'Anchor_Plate1', 'Anchor_Plate2'])
+
+
+class TestManifestRoundTrip(_ManifestTestCase):
+
+    def test_write_then_read_returns_same_manifest(self):
+        """write_manifest() stores JSON that read_manifest() returns unchanged."""
+        import nuke as _nuke
+
+        import manifest
+        from constants import MANIFEST_KNOB_NAME
+
+        root = _make_root()
+        payload = {'version': manifest.MANIFEST_VERSION,
+                   'anchors': {'Anchor_Plate': 'Plate'}, 'links': {'Anchor_Plate': ['NoOp1']}}
+        with patch.object(_nuke, 'root', return_value=root):
+            manifest.write_manifest(payload)
+            result = manifest.read_manifest()
+
+        self.assertIn(MANIFEST_KNOB_NAME, root.knobs())
+        self.assertFalse(root[MANIFEST_KNOB_NAME]._visible, "manifest knob must be hidden")
+        self.assertEqual(result, payload)
+
+    def test_read_manifest_returns_none_without_knob(self):
+        import nuke as _nuke
+
+        import manifest
+
+        with patch.object(_nuke, 'root', return_value=_make_root()):
+            self.assertIsNone(manifest.read_manifest())
+
+    def test_read_manifest_rejects_corrupt_json_and_unknown_version(self):
+        import nuke as _nuke
+
+        import manifest
+        from constants import MANIFEST_KNOB_NAME
+
+        # Version 1 keyed anchors by display name and must not be read as version 2
+        for text in ('{not json',
+                     json.dumps({'version': 99, 'anchors': {}, 'links': {}}),
+                     json.dumps({'version': 1, 'anchors': {'Plate': 'Anchor_Plate'},
+                                 'links': {}})):
+            root = _make_root()
+            root.addKnob(_nuke.StubKnob(text, knob_name=MANIFEST_KNOB_NAME))
+            with patch.object(_nuke, 'root', return_value=root):
+                self.assertIsNone(manifest.read_manifest(), text)
+
+
+class TestManifestCallbacks(_ManifestTestCase):
+
+    def test_on_script_save_is_noop_when_pref_disabled(self):
+        import nuke as _nuke
+
+        import manifest
+        import prefs
+        from constants import MANIFEST_KNOB_NAME
+
+        prefs.anchor_manifest_enabled = False
+        root = _make_root()
+        with patch.object(_nuke, 'root', return_value=root), \
+             patch.object(_nuke, 'allNodes', return_value=[_make_noop_anchor('Plate')]):
+            manifest.on_script_save()
+
+        self.assertNotIn(MANIFEST_KNOB_NAME, root.knobs())
+
+    def test_on_script_load_seeds_anchor_index_when_enabled(self):
+        """After on_script_load(), all_anchors() resolves manifest names without allNodes()."""
+        import nuke as _nuke
+
+        import anchor
+        import link
+        import manifest
+        import prefs
+
+        prefs.anchor_manifest_enabled = True
+        root = _make_root()
+        plate = _make_noop_anchor('Plate')
+        with patch.object(_nuke, 'root', return_value=root), \
+             patch.object(_nuke, 'allNodes', return_value=[plate]):
+            manifest.on_script_save()
+            manifest.on_script_load()
+
+        self.assertTrue(link.is_anchor_index_seeded())
+        all_nodes_mock = MagicMock(return_value=[])
+        with patch.object(_nuke, 'toNode', side_effect={'Anchor_Plate': plate}.get), \
+             patch.object(_nuke, 'allNodes', all_nodes_mock):
+            self.assertEqual(anchor.all_anchors(), [plate])
+        all_nodes_mock.assert_not_called()
+
+    def test_on_script_load_drops_previous_seed_when_disabled(self):
+        import link
+        import manifest
+        import prefs
+
+        link.seed_anchor_index(['Anchor_Old'])
+        prefs.anchor_manifest_enabled = False
+        manifest.on_script_load()
+        self.assertFalse(link.is_anchor_index_seeded())
+
+
+class TestSeededAnchorIndex(_ManifestTestCase):
+
+    def test_stale_seeded_names_are_dropped(self):
+        """Seeded names that no longer resolve to an anchor are skipped, not returned."""
+        import nuke as _nuke
+
+        import anchor
+        import link
+
+        plate = _make_noop_anchor('Plate')
+        renamed_by_hand = _nuke.StubNode(name='NoOp7', node_class='NoOp',
+                                         knobs_dict={'label': _nuke.StubKnob('')})
+        link.seed_anchor_index(['Anchor_Plate', 'Anchor_Gone', 'NoOp7'])
+        lookup = {'Anchor_Plate': plate, 'NoOp7': renamed_by_hand}
+        with patch.object(_nuke, 'toNode', side_effect=lookup.get):
+            self.assertEqual(anchor.all_anchors(), [plate])
+
+    def test_find_anchor_by_name_falls_back_to_full_scan_on_seeded_miss(self):
+        import nuke as _nuke
+
+        import anchor
+        import link
+
+        unlisted = _make_noop_anchor('Unlisted')
+        link.seed_anchor_index([])
+        with patch.object(_nuke, 'allNodes', return_value=[unlisted]):
+            self.assertIs(anchor.find_anchor_by_name('Unlisted'), unlisted)
+        self.assertFalse(link.is_anchor_index_seeded(),
+                         "a seeded miss must invalidate the seed")
+
+    def test_rename_updates_seeded_full_name(self):
+        import nuke as _nuke
+
+        import anchor
+        import link
+
+        plate = _make_noop_anchor('Plate')
+        link.seed_anchor_index(['Anchor_Plate'])
+        with patch.object(_nuke, 'allNodes', return_value=[plate]):
+            anchor.rename_anchor_to(plate, 'BG')
+
+        with patch.object(_nuke, 'toNode', side_effect={'Anchor_BG': plate}.get):
+            self.assertEqual(anchor.all_anchors(), [plate])
+
+    def _run_callback(self, callback, node, knob_name=None):
+        import nuke as _nuke
+        with patch.object(_nuke, 'thisNode', create=True, return_value=node), \
+             patch.object(_nuke, 'thisKnob', create=True,
+                          return_value=_nuke.StubKnob(knob_name=knob_name)):
+            callback()
+
+    def test_anchors_created_outside_the_plugin_join_the_seed(self):
+        """An imported or natively pasted anchor is listed without a full scan."""
+        import nuke as _nuke
+
+        import anchor
+        import link
+
+        plate = _make_noop_anchor('Plate')
+        imported = _make_noop_anchor('Imported')
+        link.seed_anchor_index(['Anchor_Plate'])
+        self._run_callback(anchor.on_node_created_or_destroyed, imported)
+
+        lookup = {'Anchor_Plate': plate, 'Anchor_Imported': imported}
+        all_nodes_mock = MagicMock(return_value=[])
+        with patch.object(_nuke, 'toNode', side_effect=lookup.get), \
+             patch.object(_nuke, 'allNodes', all_nodes_mock):
+            self.assertEqual(anchor.all_anchors(), [imported, plate])
+        all_nodes_mock.assert_not_called()
+
+    def test_nodes_renamed_to_anchors_by_hand_join_the_seed(self):
+        import nuke as _nuke
+
+        import anchor
+        import link
+
+        renamed = _make_noop_anchor('Plate')
+        link.seed_anchor_index([])
+        self._run_callback(anchor.on_anchor_candidate_knob_changed, renamed, 'name')
+        with patch.object(_nuke, 'toNode', side_effect={'Anchor_Plate': renamed}.get):
+            self.assertEqual(anchor.all_anchors(), [renamed])
+
+    def test_links_are_read_from_the_seed(self):
+        import nuke as _nuke
+
+        import anchor
+        import link
+
+        plate = _make_noop_anchor('Plate')
+        plate_link = _make_link('destScript.Anchor_Plate', name='NoOp1')
+        moved_away = _make_link('destScript.Anchor_Camera', name='NoOp2')
+        link.seed_anchor_index(['Anchor_Plate'])
+        link.seed_link_index({'Anchor_Plate': ['NoOp1', 'NoOp2', 'NoOp9']})
+        lookup = {'NoOp1': plate_link, 'NoOp2': moved_away}
+        all_nodes_mock = MagicMock(return_value=[])
+        with patch.object(_nuke, 'toNode', side_effect=lookup.get), \
+             patch.object(_nuke, 'allNodes', all_nodes_mock):
+            self.assertEqual(anchor.get_links_for_anchor(plate), [plate_link])
+        all_nodes_mock.assert_not_called()
+
+    def test_creating_a_link_drops_the_seeded_links(self):
+        import nuke as _nuke
+
+        import anchor
+        import link
+
+        plate = _make_noop_anchor('Plate')
+        pasted_link = _make_link('destScript.Anchor_Plate', name='NoOp5')
+        link.seed_anchor_index(['Anchor_Plate'])
+        link.seed_link_index({'Anchor_Plate': []})
+        self._run_callback(anchor.on_node_created_or_destroyed, pasted_link)
+        self.assertIsNone(link.seeded_links_for(plate))
+        with patch.object(_nuke, 'allNodes', return_value=[plate, pasted_link]):
+            self.assertEqual(anchor.get_links_for_anchor(plate), [pasted_link])
+
+    def test_anchors_inside_groups_stay_out_of_the_seed(self):
+        import anchor
+        import link
+
+        in_group = _make_noop_anchor('Plate')
+        in_group.fullName = lambda: 'Comp1.Anchor_Plate'
+        link.seed_anchor_index([])
+        self._run_callback(anchor.on_node_created_or_destroyed, in_group)
+        self.assertEqual(link.seeded_anchors(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,10 @@ Covers:
 - FIND-01: AnchorNavigatePlugin.get_items() includes labelled BackdropNodes prefixed with Backdrops/
 - FIND-01: unlabelled BackdropNodes are excluded from get_items()
 - FIND-01: picker launches when only labelled Backdrops exist (no anchors)
+- Picker change token: moves on anchor create/rename and on name/label/tile_color
+  knob changes, but not on unrelated knob changes
+- prewarm_ui(): no-op unless prefs.prewarm_ui_enabled; builds both pickers hidden,
+  refreshes existing ones, and builds a throwaway ColorPaletteDialog
 """
 
 import sys
@@ -228,7 +232,7 @@ class TestGetItemsIncludesBackdrops(unittest.TestCase):
         """get_items() includes an item with menupath 'Backdrops/GradeStack' for labelled backdrop."""
         labelled_backdrop = self._make_stub_backdrop('GradeStack')
 
-        def _allNodes_side_effect(class_name=None):
+        def _allNodes_side_effect(class_name=None, group=None):
             if class_name == 'BackdropNode':
                 return [labelled_backdrop]
             return []
@@ -246,7 +250,7 @@ class TestGetItemsIncludesBackdrops(unittest.TestCase):
         """get_items() excludes BackdropNodes with an empty label."""
         unlabelled_backdrop = self._make_stub_backdrop('')
 
-        def _allNodes_side_effect(class_name=None):
+        def _allNodes_side_effect(class_name=None, group=None):
             if class_name == 'BackdropNode':
                 return [unlabelled_backdrop]
             return []
@@ -264,7 +268,7 @@ class TestGetItemsIncludesBackdrops(unittest.TestCase):
         """get_items() excludes BackdropNodes whose label is whitespace only."""
         whitespace_backdrop = self._make_stub_backdrop('   ')
 
-        def _allNodes_side_effect(class_name=None):
+        def _allNodes_side_effect(class_name=None, group=None):
             if class_name == 'BackdropNode':
                 return [whitespace_backdrop]
             return []
@@ -282,7 +286,7 @@ class TestGetItemsIncludesBackdrops(unittest.TestCase):
         """get_items() includes anchor nodes with Anchors/ prefix."""
         stub_anchor_node = self._make_stub_anchor('Foo')
 
-        def _allNodes_side_effect(class_name=None):
+        def _allNodes_side_effect(class_name=None, group=None):
             if class_name == 'BackdropNode':
                 return []
             return [stub_anchor_node]
@@ -364,7 +368,7 @@ class TestPickerLaunchGuard(unittest.TestCase):
         """select_anchor_and_navigate() launches picker when no anchors but labelled backdrops exist."""
         labelled_backdrop = self._make_stub_backdrop('GradeStack')
 
-        def _allNodes_side_effect(class_name=None):
+        def _allNodes_side_effect(class_name=None, group=None):
             if class_name == 'BackdropNode':
                 return [labelled_backdrop]
             return []
@@ -382,7 +386,7 @@ class TestPickerLaunchGuard(unittest.TestCase):
 
     def test_picker_suppressed_when_no_anchors_and_no_labelled_backdrops(self):
         """select_anchor_and_navigate() returns without creating widget when nothing to show."""
-        def _allNodes_side_effect(class_name=None):
+        def _allNodes_side_effect(class_name=None, group=None):
             return []
 
         import nuke as nuke_stub
@@ -395,5 +399,111 @@ class TestPickerLaunchGuard(unittest.TestCase):
             mock_widget_cls.assert_not_called()
 
 
+# ---------------------------------------------------------------------------
+# Picker change token — persistent pickers skip get_items() while it is unchanged
+# ---------------------------------------------------------------------------
+
+class TestPickerChangeToken(unittest.TestCase):
+
+    def setUp(self):
+        _ensure_qt_stubs_support_mock_attributes()
+        importlib.reload(anchor)
+
+    def _knob_changed(self, knob_name):
+        import nuke as nuke_stub
+        knob = MagicMock()
+        knob.name.return_value = knob_name
+        with patch.object(nuke_stub, 'thisKnob', create=True, return_value=knob), \
+             patch.object(nuke_stub, 'thisNode', create=True,
+                          return_value=nuke_stub.StubNode(name='NoOp1')):
+            anchor.on_anchor_candidate_knob_changed()
+
+    def test_both_plugins_share_token(self):
+        self.assertEqual(anchor.AnchorPlugin().get_change_token(),
+                         anchor.AnchorNavigatePlugin().get_change_token())
+
+    def test_listed_knob_changes_move_token(self):
+        plugin = anchor.AnchorPlugin()
+        for knob_name in ('name', 'label', 'tile_color'):
+            before = plugin.get_change_token()
+            self._knob_changed(knob_name)
+            self.assertNotEqual(plugin.get_change_token(), before, knob_name)
+
+    def test_unrelated_knob_change_keeps_token(self):
+        plugin = anchor.AnchorPlugin()
+        before = plugin.get_change_token()
+        self._knob_changed('xpos')
+        self.assertEqual(plugin.get_change_token(), before)
+
+    def test_node_create_or_destroy_moves_token(self):
+        plugin = anchor.AnchorPlugin()
+        before = plugin.get_change_token()
+        anchor.on_anchor_candidates_changed()
+        self.assertNotEqual(plugin.get_change_token(), before)
+
+    def test_registering_an_anchor_moves_token(self):
+        import link
+        plugin = anchor.AnchorPlugin()
+        before = plugin.get_change_token()
+        link.register_anchor_in_index(MagicMock())
+        self.assertNotEqual(plugin.get_change_token(), before)
+
+
+# ---------------------------------------------------------------------------
+# Idle-time prewarm of pickers and the color dialog
+# ---------------------------------------------------------------------------
+
+class TestPrewarmUi(unittest.TestCase):
+
+    def setUp(self):
+        _ensure_qt_stubs_support_mock_attributes()
+        importlib.reload(anchor)
+        import prefs
+        self._saved = (prefs.plugin_enabled, prefs.prewarm_ui_enabled)
+        prefs.plugin_enabled = True
+        anchor._anchor_picker_widget = None
+        anchor._anchor_navigate_widget = None
+
+    def tearDown(self):
+        import prefs
+        prefs.plugin_enabled, prefs.prewarm_ui_enabled = self._saved
+        anchor._anchor_picker_widget = None
+        anchor._anchor_navigate_widget = None
+
+    def test_noop_when_pref_disabled(self):
+        import prefs
+        prefs.prewarm_ui_enabled = False
+        with patch.object(sys.modules['tabtabtab'], 'TabTabTabWidget') as widget_cls, \
+             patch.object(anchor, '_color_palette_dialog_class') as dialog_class:
+            anchor.prewarm_ui()
+        widget_cls.assert_not_called()
+        dialog_cls = dialog_class.return_value
+        dialog_cls.assert_not_called()
+
+    def test_builds_pickers_hidden_and_warms_color_dialog(self):
+        import prefs
+        prefs.prewarm_ui_enabled = True
+        with patch.object(sys.modules['tabtabtab'], 'TabTabTabWidget') as widget_cls, \
+             patch.object(anchor, '_color_palette_dialog_class') as dialog_class:
+            anchor.prewarm_ui()
+        dialog_cls = dialog_class.return_value
+        self.assertEqual(widget_cls.call_count, 2)
+        self.assertIs(anchor._anchor_picker_widget, widget_cls.return_value)
+        widget_cls.return_value.show.assert_not_called()
+        dialog_cls.return_value.deleteLater.assert_called_once()
+
+    def test_existing_picker_is_refreshed_not_rebuilt(self):
+        import prefs
+        prefs.prewarm_ui_enabled = True
+        existing = MagicMock()
+        anchor._anchor_picker_widget = existing
+        with patch.object(sys.modules['tabtabtab'], 'TabTabTabWidget') as widget_cls, \
+             patch.object(anchor, '_color_palette_dialog_class'):
+            anchor.prewarm_ui()
+        existing.prewarm.assert_called_once()
+        self.assertIs(anchor._anchor_picker_widget, existing)
+        self.assertEqual(widget_cls.call_count, 1, 'only the navigate picker is new')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,263 @@
+"""Tests for the clipboard sidecar (clipboard.py) and how paste uses it.
+
+Covers:
+- write_sidecar() / read_sidecar() round-trip; unusable sidecars read as None
+- describe_reference() records anchor display name, color, upstream file path and dot type
+- copy_hidden() writes one reference per stored FQNN, and every stored FQNN copied
+- matching_references() only accepts a sidecar whose stored FQNNs and source
+  script match the pasted nodes
+- plan_paste() takes the anchor name and dot type from the sidecar, and plans
+  RECREATE_ANCHOR for missing anchors whose file is known
+- paste_hidden() resolves anchor names against one scan (rescanning once on a
+  seeded miss) and recreates anchors only when accepted
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import clipboard
+import copy_paste_plan
+import paste_hidden
+from constants import KNOB_NAME
+from tests.stubs import StubKnob
+
+
+def _node(name, node_class, **knob_values):
+    import nuke as _nuke
+    knobs = {'label': '', 'tile_color': 0, 'selected': False}
+    knobs.update(knob_values)
+    return _nuke.StubNode(name=name, node_class=node_class,
+                          knobs_dict={k: StubKnob(v, k) for k, v in knobs.items()})
+
+
+def _descriptor(key, node_class='Dot', **attributes):
+    return copy_paste_plan.NodeDescriptor(key, node_class, name=key, **attributes)
+
+
+class _SidecarTestCase(unittest.TestCase):
+    """Gives each test an empty sidecar directory of its own."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = patch.object(clipboard, 'SIDECAR_PATH',
+                               os.path.join(directory.name, 'paste_hidden_clipboard.json'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestSidecarFile(_SidecarTestCase):
+
+    def test_round_trip(self):
+        sidecar = {'version': clipboard.SIDECAR_VERSION, 'source_stem': 'shotA',
+                   'stored_fqnns': ['shotA.Anchor_Plate'],
+                   'references': {'shotA.Anchor_Plate': {'anchor': 'Plate', 'color': 5,
+                                                         'file': '/a.exr',
+                                                         'dot_type': 'link'}}}
+        clipboard.write_sidecar(sidecar)
+        self.assertEqual(clipboard.read_sidecar(), sidecar)
+
+    def test_missing_corrupt_or_unknown_version_reads_as_none(self):
+        self.assertIsNone(clipboard.read_sidecar())
+        with open(clipboard.SIDECAR_PATH, 'w') as file_handle:
+            file_handle.write('{not json')
+        self.assertIsNone(clipboard.read_sidecar())
+        with open(clipboard.SIDECAR_PATH, 'w') as file_handle:
+            json.dump({'version': 99, 'references': {}}, file_handle)
+        self.assertIsNone(clipboard.read_sidecar())
+
+    def test_anchor_reference_records_name_color_and_file(self):
+        read = _node('Read1', 'Read', file='/shots/plate_v001.exr')
+        plate = _node('Anchor_Plate', 'NoOp', tile_color=0x112233FF)
+        plate.setInput(0, read)
+        self.assertEqual(clipboard.describe_reference(plate, 'link'),
+                         {'anchor': 'Plate', 'color': 0x112233FF,
+                          'file': '/shots/plate_v001.exr', 'dot_type': 'link'})
+        self.assertEqual(clipboard.describe_reference(read)['anchor'], None)
+
+
+class TestCopyWritesSidecar(_SidecarTestCase):
+
+    def test_one_reference_per_stored_fqnn(self):
+        import prefs
+        read = _node('Read1', 'Read', file='/shots/plate_v001.exr')
+        plate = _node('Anchor_Plate', 'NoOp')
+        plate.setInput(0, read)
+        with patch.object(paste_hidden, 'nuke') as mock_nuke, \
+             patch.object(paste_hidden, 'script_stem', return_value='shotA'), \
+             patch.object(paste_hidden, 'nukescripts'), \
+             patch.object(paste_hidden, 'add_input_knob',
+                          side_effect=lambda node: node.addKnob(StubKnob('', KNOB_NAME))), \
+             patch.object(paste_hidden, 'get_fully_qualified_node_name',
+                          side_effect=lambda node: 'shotA.' + node.name()), \
+             patch.object(prefs, 'plugin_enabled', True), \
+             patch.object(prefs, 'link_classes_paste_mode', 'create_link'):
+            mock_nuke.root.return_value.name.return_value = 'shotA.nk'
+            mock_nuke.selectedNodes.return_value = [read]
+            mock_nuke.allNodes.return_value = [read, plate]
+            paste_hidden.copy_hidden()
+        sidecar = clipboard.read_sidecar()
+        self.assertEqual(sidecar['source_stem'], 'shotA')
+        self.assertEqual(sidecar['references'], {
+            'shotA.Anchor_Plate': {'anchor': 'Plate', 'color': 0,
+                                   'file': '/shots/plate_v001.exr', 'dot_type': None},
+        })
+        self.assertEqual(sidecar['stored_fqnns'], ['shotA.Anchor_Plate'])
+
+
+class TestMatchingReferences(unittest.TestCase):
+
+    def setUp(self):
+        self.sidecar = {
+            'version': clipboard.SIDECAR_VERSION, 'source_stem': 'shotA',
+            'stored_fqnns': ['shotA.Anchor_Plate', 'shotA.Grade1'],
+            'references': {'shotA.Anchor_Plate': {'anchor': 'Plate', 'color': 0, 'file': '',
+                                                  'dot_type': 'link'}},
+        }
+
+    def test_sidecar_of_the_pasted_copy_is_used(self):
+        self.assertEqual(
+            clipboard.matching_references(self.sidecar, ['shotA.Grade1', 'shotA.Anchor_Plate']),
+            self.sidecar['references'])
+
+    def test_sidecar_of_another_copy_is_ignored(self):
+        for stored_fqnns in (['shotA.Anchor_Plate'],
+                             ['shotA.Anchor_Plate', 'shotA.Grade1', 'shotA.Blur1'],
+                             []):
+            self.assertIsNone(clipboard.matching_references(self.sidecar, stored_fqnns))
+        self.assertIsNone(clipboard.matching_references(None, ['shotA.Anchor_Plate']))
+
+    def test_sidecar_from_another_script_is_ignored(self):
+        self.sidecar['source_stem'] = 'shotB'
+        self.assertIsNone(clipboard.matching_references(
+            self.sidecar, ['shotA.Anchor_Plate', 'shotA.Grade1']))
+
+
+class TestPlanPasteWithSidecar(unittest.TestCase):
+
+    def _plan(self, pasted, anchors_by_name, references):
+        return copy_paste_plan.plan_paste(pasted, 'shotB', lambda node: None,
+                                          anchors_by_name.get, references)
+
+    def test_anchor_name_comes_from_the_sidecar(self):
+        # A Dot anchor's display name is its label, which its node name only approximates.
+        dot = _descriptor('Dot1', stored_fqnn='shotA.Anchor_Hero_Plate', dot_type='link')
+        references = {'shotA.Anchor_Hero_Plate': {'anchor': 'Hero Plate', 'color': 0,
+                                                  'file': ''}}
+        destination = _descriptor('Anchor_Hero_Plate')
+        self.assertEqual(self._plan([dot], {'Hero Plate': destination}, references),
+                         [(copy_paste_plan.RELINK, 'Dot1', 'Anchor_Hero_Plate', None)])
+
+    def test_missing_anchor_with_a_known_file_is_planned_for_recreation(self):
+        dot = _descriptor('Dot1', stored_fqnn='shotA.Anchor_Plate', dot_type='link')
+        references = {'shotA.Anchor_Plate': {'anchor': 'Plate', 'color': 7, 'file': '/a.exr'}}
+        self.assertEqual(self._plan([dot], {}, references), [
+            (copy_paste_plan.RECREATE_ANCHOR, 'Dot1', 'Plate', '/a.exr', 7),
+        ])
+
+    def test_missing_anchor_without_a_sidecar_is_left_alone(self):
+        dot = _descriptor('Dot1', stored_fqnn='shotA.Anchor_Plate', dot_type='link')
+        self.assertEqual(self._plan([dot], {}, None), [])
+
+    def test_sidecar_settles_the_dot_type_of_legacy_dots(self):
+        # Without a DOT_TYPE knob, a plain node named like an anchor looks like a Link Dot.
+        dot = _descriptor('Dot1', stored_fqnn='shotA.Anchor_ish')
+        references = {'shotA.Anchor_ish': {'anchor': None, 'color': 0, 'file': ''}}
+        anchors_by_name = {'ish': _descriptor('Anchor_ish')}
+        self.assertEqual(self._plan([dot], anchors_by_name, references), [])
+        self.assertEqual(len(self._plan([dot], anchors_by_name, None)), 1)
+
+    def test_sidecar_dot_type_is_used_when_the_knob_is_missing(self):
+        dot = _descriptor('Dot1', stored_fqnn='shotA.Anchor_Plate')
+        references = {'shotA.Anchor_Plate': {'anchor': 'Plate', 'color': 0, 'file': '',
+                                             'dot_type': 'local'}}
+        self.assertEqual(self._plan([dot], {'Plate': _descriptor('Anchor_Plate')}, references),
+                         [])
+
+
+class TestPasteWithSidecar(_SidecarTestCase):
+
+    def setUp(self):
+        super().setUp()
+        import nuke as nuke_stub
+        clipboard.write_sidecar({
+            'version': clipboard.SIDECAR_VERSION, 'source_stem': 'shotA',
+            'stored_fqnns': ['shotA.Anchor_Plate'],
+            'references': {'shotA.Anchor_Plate': {'anchor': 'Plate', 'color': 7,
+                                                  'file': '/a.exr', 'dot_type': 'link'}},
+        })
+        self.dots = [_node('Dot%d' % i, 'Dot', **{KNOB_NAME: 'shotA.Anchor_Plate',
+                                                  'paste_hidden_dot_type': 'link'})
+                     for i in range(3)]
+        self.nuke = MagicMock(name='nuke')
+        self.nuke.root.return_value.name.return_value = 'shotB.nk'
+        self.nuke.selectedNodes.return_value = self.dots
+        self.setup_link_node = MagicMock(name='setup_link_node')
+        self.create_anchor_named = MagicMock(name='create_anchor_named')
+        self.anchors_by_display_name = MagicMock(name='anchors_by_display_name', return_value={})
+        patches = [
+            patch.object(paste_hidden, 'nuke', self.nuke),
+            patch.object(paste_hidden, 'script_stem', return_value='shotB'),
+            patch.object(paste_hidden, 'nukescripts'),
+            patch.object(paste_hidden, 'find_anchor_node', return_value=None),
+            patch.object(paste_hidden, 'anchors_by_display_name', self.anchors_by_display_name),
+            patch.object(paste_hidden, 'create_anchor_named', self.create_anchor_named),
+            patch.object(paste_hidden, 'setup_link_node', self.setup_link_node),
+            patch.object(paste_hidden, 'uncollide_pasted_anchor_ids'),
+            patch.object(nuke_stub, 'Undo'),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_anchor_names_are_resolved_against_one_scan(self):
+        self.nuke.ask.return_value = False
+        paste_hidden.paste_hidden()
+        self.anchors_by_display_name.assert_called_once_with()
+
+    def test_seeded_miss_rescans_once(self):
+        self.nuke.ask.return_value = False
+        invalidate = MagicMock(name='invalidate_anchor_index')
+        with patch.object(paste_hidden, 'is_anchor_index_seeded',
+                          side_effect=lambda: not invalidate.called), \
+             patch.object(paste_hidden, 'invalidate_anchor_index', invalidate):
+            paste_hidden.paste_hidden()
+        invalidate.assert_called_once_with()
+        self.assertEqual(self.anchors_by_display_name.call_count, 2)
+
+    def test_accepted_recreation_builds_one_anchor_and_links_every_dot(self):
+        self.nuke.GUI = True
+        self.nuke.ask.return_value = True
+        paste_hidden.paste_hidden()
+        self.nuke.ask.assert_called_once()
+        self.nuke.nodes.Read.assert_called_once_with(file='/a.exr')
+        self.create_anchor_named.assert_called_once_with(
+            'Plate', input_node=self.nuke.nodes.Read.return_value, color=7)
+        new_anchor = self.create_anchor_named.return_value
+        self.assertEqual([call.args for call in self.setup_link_node.call_args_list],
+                         [(new_anchor, dot) for dot in self.dots])
+
+    def test_stale_sidecar_is_not_used(self):
+        self.nuke.GUI = True
+        self.dots.append(_node('Dot9', 'Dot', **{KNOB_NAME: 'shotA.Anchor_Other',
+                                                 'paste_hidden_dot_type': 'link'}))
+        paste_hidden.paste_hidden()
+        self.nuke.ask.assert_not_called()
+        self.create_anchor_named.assert_not_called()
+
+    def test_declined_or_headless_recreation_creates_nothing(self):
+        self.nuke.GUI = True
+        self.nuke.ask.return_value = False
+        paste_hidden.paste_hidden()
+        self.nuke.GUI = False
+        paste_hidden.paste_hidden()
+        self.nuke.ask.assert_called_once()
+        self.create_anchor_named.assert_not_called()
+        self.setup_link_node.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 """Tests for cross-script paste reconnection logic.
 
 Covers:
-- _extract_display_name_from_fqnn() helper
+- display_name_from_fqnn() helper
 - paste_hidden() Path A/C cross-script name-based reconnect for NoOp anchors (XSCRIPT-01)
 - paste_hidden() Path B Dot cross-script disconnection (XSCRIPT-02 / PASTE-04)
 - LINK_SOURCE_CLASSES frozenset membership
@@ -43,15 +43,15 @@ class TestConstantsCleanup(unittest.TestCase):
 
 
 # ---------------------------------------------------------------------------
-# Tests for _extract_display_name_from_fqnn() helper
+# Tests for display_name_from_fqnn() helper
 # ---------------------------------------------------------------------------
 
 class TestExtractDisplayNameFromFqnn(unittest.TestCase):
 
     def setUp(self):
         # Import inside setUp to ensure stub is in place
-        from paste_hidden import _extract_display_name_from_fqnn
-        self.extract = _extract_display_name_from_fqnn
+        from copy_paste_plan import display_name_from_fqnn
+        self.extract = display_name_from_fqnn
 
     def test_simple_anchor_fqnn_returns_display_name(self):
         result = self.extract('shotA.Anchor_MyFootage')
@@ -134,7 +134,8 @@ class TestCrossScriptReconnect(unittest.TestCase):
         with patch('paste_hidden.nuke') as mock_nuke, \
              patch('paste_hidden.nukescripts') as mock_nukescripts, \
              patch('paste_hidden.find_anchor_node', return_value=None), \
-             patch('paste_hidden.find_anchor_by_name', return_value=destination_anchor), \
+             patch('paste_hidden.anchors_by_display_name',
+                   return_value={'MyFootage': destination_anchor}), \
              patch('paste_hidden.setup_link_node') as mock_setup_link_node, \
              patch('paste_hidden.is_anchor', return_value=True):
 
@@ -161,7 +162,7 @@ class TestCrossScriptReconnect(unittest.TestCase):
         with patch('paste_hidden.nuke') as mock_nuke, \
              patch('paste_hidden.nukescripts') as mock_nukescripts, \
              patch('paste_hidden.find_anchor_node', return_value=None), \
-             patch('paste_hidden.find_anchor_by_name', return_value=None), \
+             patch('paste_hidden.anchors_by_display_name', return_value={}), \
              patch('paste_hidden.setup_link_node') as mock_setup_link_node, \
              patch('paste_hidden.is_anchor', return_value=True):
 
@@ -187,7 +188,7 @@ class TestCrossScriptReconnect(unittest.TestCase):
         with patch('paste_hidden.nuke') as mock_nuke, \
              patch('paste_hidden.nukescripts') as mock_nukescripts, \
              patch('paste_hidden.find_anchor_node', return_value=None), \
-             patch('paste_hidden.find_anchor_by_name') as mock_find_by_name, \
+             patch('paste_hidden.anchors_by_display_name') as mock_find_by_name, \
              patch('paste_hidden.setup_link_node') as mock_setup_link_node, \
              patch('paste_hidden.is_anchor', return_value=True):
 
@@ -197,7 +198,7 @@ class TestCrossScriptReconnect(unittest.TestCase):
             from paste_hidden import paste_hidden
             paste_hidden()
 
-            # find_anchor_by_name must NOT be called for Dot anchors
+            # anchors must NOT be looked up by name for Dot anchors
             mock_find_by_name.assert_not_called()
             mock_nuke.createNode.assert_not_called()
             mock_nuke.delete.assert_not_called()
@@ -280,7 +281,8 @@ class TestBugRegressions(unittest.TestCase):
         with patch('paste_hidden.nuke') as mock_paste_nuke, \
              patch('paste_hidden.nukescripts') as mock_nukescripts, \
              patch('paste_hidden.find_anchor_node', return_value=None), \
-             patch('paste_hidden.find_anchor_by_name', return_value=destination_anchor), \
+             patch('paste_hidden.anchors_by_display_name',
+                   return_value={'MyFootage': destination_anchor}), \
              patch('link.find_node_color', return_value=anchor_color), \
              patch('link.nuke', stub_nuke_for_link):
 
@@ -333,7 +335,8 @@ class TestBugRegressions(unittest.TestCase):
         with patch('paste_hidden.nuke') as mock_nuke, \
              patch('paste_hidden.nukescripts') as mock_nukescripts, \
              patch('paste_hidden.find_anchor_node', return_value=None), \
-             patch('paste_hidden.find_anchor_by_name', return_value=destination_anchor), \
+             patch('paste_hidden.anchors_by_display_name',
+                   return_value={'MyFootage': destination_anchor}), \
              patch('paste_hidden.setup_link_node'), \
              patch('paste_hidden.is_anchor', side_effect=is_anchor_side_effect):
 
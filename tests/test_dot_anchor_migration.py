@@ -0,0 +1,153 @@
+"""Tests for the legacy Dot anchor migration (migrate_dot_anchors.py, prefs.legacy_dot_anchors).
+
+Covers:
+- is_anchor() applies the labelled-Dot heuristic only while prefs.legacy_dot_anchors is on
+- find_legacy_dot_anchors() keeps heuristic matches that a link resolves to, by anchor ID
+  or stored FQNN
+- migrate_legacy_dot_anchors() adds only the marker knob, in one undo step
+- The menu command offers to turn the heuristic off; main() migrates and saves .nk files
+"""
+
+import unittest
+from unittest.mock import MagicMock, call, patch
+
+import link
+import migrate_dot_anchors
+import prefs
+from constants import (
+    ANCHOR_ID_KNOB_NAME,
+    DOT_ANCHOR_KNOB_NAME,
+    KNOB_NAME,
+    LINK_ANCHOR_ID_KNOB_NAME,
+)
+from tests.stubs import StubKnob
+
+
+def _dot(name, label='', **knob_values):
+    import nuke as _nuke
+    knobs = {'label': label, 'hide_input': False, 'tile_color': 0}
+    knobs.update(knob_values)
+    return _nuke.StubNode(name=name, node_class='Dot',
+                          knobs_dict={k: StubKnob(v, k) for k, v in knobs.items()})
+
+
+def _link(fqnn, anchor_id_value=''):
+    import nuke as _nuke
+    knobs = {KNOB_NAME: StubKnob(fqnn, KNOB_NAME), 'label': StubKnob('Link: x', 'label')}
+    if anchor_id_value:
+        knobs[LINK_ANCHOR_ID_KNOB_NAME] = StubKnob(anchor_id_value, LINK_ANCHOR_ID_KNOB_NAME)
+    return _nuke.StubNode(name='Link', node_class='NoOp', knobs_dict=knobs)
+
+
+class _MigrationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        import nuke as nuke_stub
+        self.nuke = nuke_stub
+        self.plate = _dot('Dot1', label='Plate')
+        self.by_id = _dot('Dot2', label='BG', **{ANCHOR_ID_KNOB_NAME: 'abc'})
+        self.note = _dot('Dot3', label='just a note')
+        self.marked = _dot('Dot4', label='Marked', **{DOT_ANCHOR_KNOB_NAME: True})
+        self.nodes = [self.plate, self.by_id, self.note, self.marked,
+                      _link('destScript.Dot1'), _link('destScript.Renamed', 'abc'),
+                      _link('destScript.Dot4')]
+        patches = [
+            patch.object(nuke_stub, 'allNodes',
+                         side_effect=lambda *args, **kwargs: list(self.nodes)),
+            patch.object(nuke_stub, 'Undo'),
+            patch.object(nuke_stub, 'Boolean_Knob',
+                         side_effect=lambda name, *args: StubKnob(knob_name=name)),
+            patch.object(prefs, 'legacy_dot_anchors', True),
+            patch.object(link, '_group_indexes', {}),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class TestHeuristicPreference(_MigrationTestCase):
+
+    def test_unmarked_labelled_dots_are_anchors_only_while_enabled(self):
+        self.assertTrue(link.is_anchor(self.note))
+        prefs.legacy_dot_anchors = False
+        self.assertFalse(link.is_anchor(self.note))
+        self.assertTrue(link.is_anchor(self.marked))
+
+    def test_disabled_heuristic_reads_no_labels(self):
+        prefs.legacy_dot_anchors = False
+        label_knob = MagicMock()
+        self.note['label'] = label_knob
+        link.is_anchor(self.note)
+        label_knob.getValue.assert_not_called()
+
+
+class TestMigration(_MigrationTestCase):
+
+    def test_only_linked_legacy_dots_are_found(self):
+        self.assertEqual(migrate_dot_anchors.find_legacy_dot_anchors(),
+                         [self.plate, self.by_id])
+        self.assertEqual(self.nuke.allNodes.call_args_list[0], call(recurseGroups=True))
+
+    def test_links_are_resolved_as_reconnecting_would(self):
+        # A link whose stored FQNN no longer names the Dot still finds it when it resolves.
+        moved = _dot('Dot5', label='Moved')
+        self.nodes = [moved, _link('destScript.SomethingElse')]
+        with patch.object(link.FqnnResolver, 'find_anchor_node', return_value=moved):
+            self.assertEqual(migrate_dot_anchors.find_legacy_dot_anchors(), [moved])
+
+    def test_marker_only_in_one_undo_step(self):
+        self.assertEqual(migrate_dot_anchors.migrate_legacy_dot_anchors(), 2)
+        for node in (self.plate, self.by_id):
+            self.assertTrue(node[DOT_ANCHOR_KNOB_NAME].value())
+            self.assertEqual(node._set_name_calls, [])
+            self.assertEqual(node['tile_color'].value(), 0)
+        self.assertNotIn(DOT_ANCHOR_KNOB_NAME, self.note.knobs())
+        self.nuke.Undo.return_value.begin.assert_called_once()
+
+    def test_nothing_to_migrate_makes_no_undo_step(self):
+        self.nodes = [self.note, self.marked]
+        self.assertEqual(migrate_dot_anchors.migrate_legacy_dot_anchors(), 0)
+        self.nuke.Undo.assert_not_called()
+
+
+class TestMigrationCommand(_MigrationTestCase):
+
+    def _run(self, answer):
+        with patch.object(self.nuke, 'ask', create=True, return_value=answer) as ask, \
+             patch.object(prefs, 'save') as save:
+            migrate_dot_anchors.migrate_legacy_dot_anchors_command()
+        return ask, save
+
+    def test_accepting_turns_the_heuristic_off(self):
+        generation = link.anchor_generation()
+        ask, save = self._run(True)
+        self.assertIn('Marked 2', ask.call_args.args[0])
+        self.assertFalse(prefs.legacy_dot_anchors)
+        save.assert_called_once()
+        self.assertNotEqual(link.anchor_generation(), generation)
+
+    def test_declining_keeps_the_heuristic(self):
+        _, save = self._run(False)
+        self.assertTrue(prefs.legacy_dot_anchors)
+        save.assert_not_called()
+
+
+class TestHeadlessMode(_MigrationTestCase):
+
+    def test_each_script_is_opened_migrated_and_saved(self):
+        with patch.object(self.nuke, 'scriptClear', create=True), \
+             patch.object(self.nuke, 'scriptOpen', create=True) as script_open, \
+             patch.object(self.nuke, 'scriptSave', create=True) as script_save, \
+             patch('builtins.print'):
+            self.assertEqual(migrate_dot_anchors.main(['a.nk', 'b.nk']), 0)
+        self.assertEqual(script_open.call_args_list, [call('a.nk'), call('b.nk')])
+        # b.nk opens with the Dots a.nk already marked, so only a.nk is saved
+        script_save.assert_called_once_with('a.nk')
+
+    def test_no_scripts_is_a_usage_error(self):
+        with patch('builtins.print'):
+            self.assertEqual(migrate_dot_anchors.main([]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -186,14 +186,15 @@ class TestCopyHiddenDotTypeBehavior(unittest.TestCase):
             base_knobs.update(knobs_dict)
         return _nuke.StubNode(name=name, node_class='Dot', knobs_dict=base_knobs)
 
-    def test_copy_hidden_anchor_backed_dot_calls_add_input_knob_with_dot_type_link(self):
-        """copy_hidden() on anchor-backed Dot must call add_input_knob(node, dot_type='link')."""
+    def test_copy_hidden_anchor_backed_dot_sets_up_link_with_dot_type_link(self):
+        """copy_hidden() on anchor-backed Dot must set it up as a link with dot_type='link'."""
         dot_node = self._make_dot_node_with_hide_input()
         anchor_input_node = _make_stub_node(name='Anchor_MyFootage', node_class='NoOp')
 
         dot_node._input = anchor_input_node
 
         with patch('paste_hidden.nuke') as mock_nuke, \
+             patch('paste_hidden.script_stem', return_value='sourceScript'), \
              patch('paste_hidden.nukescripts') as mock_nukescripts, \
              patch('paste_hidden.is_link', return_value=False), \
              patch('paste_hidden.is_anchor', return_value=True) as mock_is_anchor, \
@@ -203,11 +204,17 @@ class TestCopyHiddenDotTypeBehavior(unittest.TestCase):
                    return_value='sourceScript.Anchor_MyFootage'):
 
             mock_nuke.selectedNodes.return_value = [dot_node]
+            mock_nuke.root.return_value.name.return_value = 'sourceScript.nk'
 
             from paste_hidden import copy_hidden
             copy_hidden()
 
-            mock_add_input_knob.assert_called_once_with(dot_node, dot_type='link')
+            mock_setup_link_node.assert_called_once()
+            self.assertEqual(mock_setup_link_node.call_args.args, (anchor_input_node, dot_node))
+            self.assertEqual(mock_setup_link_node.call_args.kwargs['dot_type'], 'link')
+            self.assertEqual(mock_setup_link_node.call_args.kwargs['fqnn'],
+                             'sourceScript.Anchor_MyFootage')
+            mock_add_input_knob.assert_not_called()
 
     def test_copy_hidden_anchor_backed_dot_sets_tile_color_to_anchor_default_color(self):
         """copy_hidden() on anchor-backed Dot must set tile_color to ANCHOR_DEFAULT_COLOR."""
@@ -218,47 +225,55 @@ class TestCopyHiddenDotTypeBehavior(unittest.TestCase):
         dot_node._input = anchor_input_node
 
         with patch('paste_hidden.nuke') as mock_nuke, \
+             patch('paste_hidden.script_stem', return_value='sourceScript'), \
              patch('paste_hidden.nukescripts') as mock_nukescripts, \
              patch('paste_hidden.is_link', return_value=False), \
              patch('paste_hidden.is_anchor', return_value=True), \
-             patch('paste_hidden.setup_link_node'), \
+             patch('paste_hidden.setup_link_node') as mock_setup_link_node, \
              patch('paste_hidden.add_input_knob'), \
              patch('paste_hidden.get_fully_qualified_node_name',
                    return_value='sourceScript.Anchor_MyFootage'):
 
             mock_nuke.selectedNodes.return_value = [dot_node]
+            mock_nuke.root.return_value.name.return_value = 'sourceScript.nk'
 
             from paste_hidden import copy_hidden
             copy_hidden()
 
             self.assertEqual(
-                dot_node['tile_color'].getValue(),
+                mock_setup_link_node.call_args.kwargs['tile_color'],
                 ANCHOR_DEFAULT_COLOR,
                 "Anchor-backed Dot tile_color must be set to ANCHOR_DEFAULT_COLOR (canonical purple)"
             )
 
-    def test_copy_hidden_plain_node_backed_dot_calls_add_input_knob_with_dot_type_local(self):
-        """copy_hidden() on plain-node-backed Dot must call add_input_knob(node, dot_type='local')."""
+    def test_copy_hidden_plain_node_backed_dot_sets_up_link_with_dot_type_local(self):
+        """copy_hidden() on plain-node-backed Dot must set it up as a link with dot_type='local'."""
         dot_node = self._make_dot_node_with_hide_input()
         plain_input_node = _make_stub_node(name='Blur1', node_class='Blur',
                                            knobs_dict={'label': _make_knob('')})
         dot_node._input = plain_input_node
 
         with patch('paste_hidden.nuke') as mock_nuke, \
+             patch('paste_hidden.script_stem', return_value='sourceScript'), \
              patch('paste_hidden.nukescripts') as mock_nukescripts, \
              patch('paste_hidden.is_link', return_value=False), \
              patch('paste_hidden.is_anchor', return_value=False), \
-             patch('paste_hidden.setup_link_node'), \
+             patch('paste_hidden.setup_link_node') as mock_setup_link_node, \
              patch('paste_hidden.add_input_knob') as mock_add_input_knob, \
              patch('paste_hidden.get_fully_qualified_node_name',
                    return_value='sourceScript.Blur1'):
 
             mock_nuke.selectedNodes.return_value = [dot_node]
+            mock_nuke.root.return_value.name.return_value = 'sourceScript.nk'
 
             from paste_hidden import copy_hidden
             copy_hidden()
 
-            mock_add_input_knob.assert_called_once_with(dot_node, dot_type='local')
+            mock_setup_link_node.assert_called_once()
+            self.assertEqual(mock_setup_link_node.call_args.args, (plain_input_node, dot_node))
+            self.assertEqual(mock_setup_link_node.call_args.kwargs['dot_type'], 'local')
+            self.assertEqual(mock_setup_link_node.call_args.kwargs['fqnn'], 'sourceScript.Blur1')
+            mock_add_input_knob.assert_not_called()
 
     def test_copy_hidden_plain_node_backed_dot_sets_label_to_local_prefix(self):
         """copy_hidden() on plain-node-backed Dot must set label to 'Local: {source name}'."""
@@ -268,21 +283,23 @@ class TestCopyHiddenDotTypeBehavior(unittest.TestCase):
         dot_node._input = plain_input_node
 
         with patch('paste_hidden.nuke') as mock_nuke, \
+             patch('paste_hidden.script_stem', return_value='sourceScript'), \
              patch('paste_hidden.nukescripts') as mock_nukescripts, \
              patch('paste_hidden.is_link', return_value=False), \
              patch('paste_hidden.is_anchor', return_value=False), \
-             patch('paste_hidden.setup_link_node'), \
+             patch('paste_hidden.setup_link_node') as mock_setup_link_node, \
              patch('paste_hidden.add_input_knob'), \
              patch('paste_hidden.get_fully_qualified_node_name',
                    return_value='sourceScript.Blur1'):
 
             mock_nuke.selectedNodes.return_value = [dot_node]
+            mock_nuke.root.return_value.name.return_value = 'sourceScript.nk'
 
             from paste_hidden import copy_hidden
             copy_hidden()
 
             self.assertEqual(
-                dot_node['label'].getValue(),
+                mock_setup_link_node.call_args.kwargs['label'],
                 'Local: Blur1',
                 "Plain-node-backed Dot label must be set to 'Local: {source name}'"
             )
@@ -297,21 +314,23 @@ class TestCopyHiddenDotTypeBehavior(unittest.TestCase):
         dot_node._input = plain_input_node
 
         with patch('paste_hidden.nuke') as mock_nuke, \
+             patch('paste_hidden.script_stem', return_value='sourceScript'), \
              patch('paste_hidden.nukescripts') as mock_nukescripts, \
              patch('paste_hidden.is_link', return_value=False), \
              patch('paste_hidden.is_anchor', return_value=False), \
-             patch('paste_hidden.setup_link_node'), \
+             patch('paste_hidden.setup_link_node') as mock_setup_link_node, \
              patch('paste_hidden.add_input_knob'), \
              patch('paste_hidden.get_fully_qualified_node_name',
                    return_value='sourceScript.Blur1'):
 
             mock_nuke.selectedNodes.return_value = [dot_node]
+            mock_nuke.root.return_value.name.return_value = 'sourceScript.nk'
 
             from paste_hidden import copy_hidden
             copy_hidden()
 
             self.assertEqual(
-                dot_node['tile_color'].getValue(),
+                mock_setup_link_node.call_args.kwargs['tile_color'],
                 LOCAL_DOT_COLOR,
                 "Plain-node-backed Dot tile_color must be set to LOCAL_DOT_COLOR (burnt orange)"
             )
@@ -355,8 +374,8 @@ class TestPasteHiddenCrossScriptDotTypeBehavior(unittest.TestCase):
         with patch('paste_hidden.nuke') as mock_nuke, \
              patch('paste_hidden.nukescripts') as mock_nukescripts, \
              patch('paste_hidden.find_anchor_node', return_value=None), \
-             patch('paste_hidden.find_anchor_by_name',
-                   return_value=destination_anchor) as mock_find_by_name, \
+             patch('paste_hidden.anchors_by_display_name',
+                   return_value={'MyFootage': destination_anchor}) as mock_find_by_name, \
              patch('paste_hidden.setup_link_node') as mock_setup_link_node, \
              patch('paste_hidden.is_anchor', return_value=False):
 
@@ -369,7 +388,7 @@ class TestPasteHiddenCrossScriptDotTypeBehavior(unittest.TestCase):
             from paste_hidden import paste_hidden
             paste_hidden()
 
-            mock_find_by_name.assert_called_once_with('MyFootage')
+            mock_find_by_name.assert_called_once_with()
             mock_setup_link_node.assert_called_once_with(destination_anchor, dot_node)
 
     def test_link_dot_pasted_cross_script_with_no_matching_anchor_does_not_call_setup_link_node(self):
@@ -382,8 +401,8 @@ class TestPasteHiddenCrossScriptDotTypeBehavior(unittest.TestCase):
         with patch('paste_hidden.nuke') as mock_nuke, \
              patch('paste_hidden.nukescripts') as mock_nukescripts, \
              patch('paste_hidden.find_anchor_node', return_value=None), \
-             patch('paste_hidden.find_anchor_by_name',
-                   return_value=None) as mock_find_by_name, \
+             patch('paste_hidden.anchors_by_display_name',
+                   return_value={}) as mock_find_by_name, \
              patch('paste_hidden.setup_link_node') as mock_setup_link_node, \
              patch('paste_hidden.is_anchor', return_value=False):
 
@@ -396,11 +415,11 @@ class TestPasteHiddenCrossScriptDotTypeBehavior(unittest.TestCase):
             from paste_hidden import paste_hidden
             paste_hidden()
 
-            mock_find_by_name.assert_called_once_with('MyFootage')
+            mock_find_by_name.assert_called_once_with()
             mock_setup_link_node.assert_not_called()
 
-    def test_local_dot_pasted_cross_script_does_not_call_find_anchor_by_name_or_setup_link_node(self):
-        """Local Dot pasted cross-script must NOT call find_anchor_by_name or setup_link_node,
+    def test_local_dot_pasted_cross_script_does_not_look_up_anchor_names_or_setup_link_node(self):
+        """Local Dot pasted cross-script must NOT look anchors up by name or setup_link_node,
         even when the input_node (from find_anchor_node) is non-None (different stem, different script)."""
         dot_node = self._make_hidden_dot_node(
             stored_fqnn='sourceScript.Blur1',
@@ -410,7 +429,7 @@ class TestPasteHiddenCrossScriptDotTypeBehavior(unittest.TestCase):
         with patch('paste_hidden.nuke') as mock_nuke, \
              patch('paste_hidden.nukescripts') as mock_nukescripts, \
              patch('paste_hidden.find_anchor_node', return_value=None), \
-             patch('paste_hidden.find_anchor_by_name') as mock_find_by_name, \
+             patch('paste_hidden.anchors_by_display_name') as mock_find_by_name, \
              patch('paste_hidden.setup_link_node') as mock_setup_link_node, \
              patch('paste_hidden.is_anchor', return_value=False):
 
@@ -467,9 +486,10 @@ class TestPasteHiddenCrossScriptDotTypeBehavior(unittest.TestCase):
         false_positive_node = _make_stub_node(name='Blur1', node_class='Blur')
 
         with patch('paste_hidden.nuke') as mock_nuke, \
+             patch('paste_hidden.script_stem', return_value='otherScript'), \
              patch('paste_hidden.nukescripts') as mock_nukescripts, \
              patch('paste_hidden.find_anchor_node', return_value=false_positive_node), \
-             patch('paste_hidden.find_anchor_by_name') as mock_find_by_name, \
+             patch('paste_hidden.anchors_by_display_name') as mock_find_by_name, \
              patch('paste_hidden.setup_link_node') as mock_setup_link_node, \
              patch('paste_hidden.is_anchor', return_value=False):
 
@@ -521,8 +541,8 @@ class TestPasteHiddenBackwardCompatibility(unittest.TestCase):
         with patch('paste_hidden.nuke') as mock_nuke, \
              patch('paste_hidden.nukescripts') as mock_nukescripts, \
              patch('paste_hidden.find_anchor_node', return_value=None), \
-             patch('paste_hidden.find_anchor_by_name',
-                   return_value=destination_anchor) as mock_find_by_name, \
+             patch('paste_hidden.anchors_by_display_name',
+                   return_value={'MyFootage': destination_anchor}) as mock_find_by_name, \
              patch('paste_hidden.setup_link_node') as mock_setup_link_node, \
              patch('paste_hidden.is_anchor', return_value=False):
 
@@ -536,7 +556,7 @@ class TestPasteHiddenBackwardCompatibility(unittest.TestCase):
             paste_hidden()
 
             # Should have attempted reconnect because FQNN has anchor prefix
-            mock_find_by_name.assert_called_once_with('MyFootage')
+            mock_find_by_name.assert_called_once_with()
             mock_setup_link_node.assert_called_once_with(destination_anchor, dot_node)
 
     def test_backward_compat_plain_fqnn_without_dot_type_knob_does_not_reconnect(self):
@@ -549,7 +569,7 @@ class TestPasteHiddenBackwardCompatibility(unittest.TestCase):
         with patch('paste_hidden.nuke') as mock_nuke, \
              patch('paste_hidden.nukescripts') as mock_nukescripts, \
              patch('paste_hidden.find_anchor_node', return_value=None), \
-             patch('paste_hidden.find_anchor_by_name') as mock_find_by_name, \
+             patch('paste_hidden.anchors_by_display_name') as mock_find_by_name, \
              patch('paste_hidden.setup_link_node') as mock_setup_link_node, \
              patch('paste_hidden.is_anchor', return_value=False):
 
@@ -604,9 +624,10 @@ class TestPasteHiddenSameScriptDotTypeBehavior(unittest.TestCase):
                                       knobs_dict={'label': _make_knob('My Blur')})
 
         with patch('paste_hidden.nuke') as mock_nuke, \
+             patch('paste_hidden.script_stem', return_value='shotA'), \
              patch('paste_hidden.nukescripts') as mock_nukescripts, \
              patch('paste_hidden.find_anchor_node', return_value=source_node), \
-             patch('paste_hidden.find_anchor_by_name') as mock_find_by_name, \
+             patch('paste_hidden.anchors_by_display_name') as mock_find_by_name, \
              patch('paste_hidden.setup_link_node') as mock_setup_link_node, \
              patch('paste_hidden.is_anchor', return_value=False):
 
@@ -649,9 +670,10 @@ class TestPasteHiddenSameScriptDotTypeBehavior(unittest.TestCase):
                                       knobs_dict={'label': _make_knob('MyFootage')})
 
         with patch('paste_hidden.nuke') as mock_nuke, \
+             patch('paste_hidden.script_stem', return_value='shotA'), \
              patch('paste_hidden.nukescripts') as mock_nukescripts, \
              patch('paste_hidden.find_anchor_node', return_value=anchor_node), \
-             patch('paste_hidden.find_anchor_by_name') as mock_find_by_name, \
+             patch('paste_hidden.anchors_by_display_name') as mock_find_by_name, \
              patch('paste_hidden.setup_link_node') as mock_setup_link_node, \
              patch('paste_hidden.is_anchor', return_value=False):
 
@@ -742,6 +764,7 @@ class TestPasteHiddenSameScriptDotTypeKnobPreservation(unittest.TestCase):
                                       knobs_dict={'label': _make_knob('My Blur')})
 
         with patch('paste_hidden.nuke') as mock_nuke, \
+             patch('paste_hidden.script_stem', return_value='shotA'), \
              patch('paste_hidden.nukescripts') as mock_nukescripts, \
              patch('paste_hidden.find_anchor_node', return_value=source_node), \
              patch('paste_hidden.setup_link_node') as mock_setup_link_node, \
@@ -784,7 +807,7 @@ class TestPasteHiddenPathACLinkClass(unittest.TestCase):
 
     def test_path_ac_dot_anchor_source_creates_dot_link_node(self):
         """paste_hidden() Path A/C: when the resolved source is a Dot node,
-        nuke.createNode must be called with 'Dot' (not hardcoded 'NoOp')."""
+        the link must be created with nuke.nodes.Dot (not hardcoded NoOp)."""
         import nuke as _nuke
 
         # Anchor node (LINK_SOURCE_CLASSES-style: is_anchor returns True)
@@ -811,6 +834,7 @@ class TestPasteHiddenPathACLinkClass(unittest.TestCase):
                                             })
 
         with patch('paste_hidden.nuke') as mock_nuke, \
+             patch('paste_hidden.script_stem', return_value='shotA'), \
              patch('paste_hidden.nukescripts') as mock_nukescripts, \
              patch('paste_hidden.find_anchor_node', return_value=dot_source_node), \
              patch('paste_hidden.is_anchor', return_value=True), \
@@ -821,17 +845,18 @@ class TestPasteHiddenPathACLinkClass(unittest.TestCase):
             mock_nuke.root.return_value = root_obj
             mock_nuke.nodePaste.return_value = None
             mock_nuke.selectedNodes.return_value = [anchor_node]
-            mock_nuke.createNode.return_value = created_link_node
+            mock_nuke.nodes.Dot.return_value = created_link_node
 
             from paste_hidden import paste_hidden
             paste_hidden()
 
-            # Must call createNode with 'Dot' since dot_source_node.Class() == 'Dot'
-            mock_nuke.createNode.assert_called_once_with('Dot')
+            # Must create a Dot link since dot_source_node.Class() == 'Dot'
+            mock_nuke.nodes.Dot.assert_called_once_with()
+            mock_nuke.nodes.NoOp.assert_not_called()
 
     def test_path_ac_noop_anchor_source_creates_noop_link_node(self):
         """paste_hidden() Path A/C: when the resolved source is a NoOp anchor,
-        nuke.createNode must be called with 'NoOp'."""
+        the link must be created with nuke.nodes.NoOp."""
         import nuke as _nuke
 
         anchor_node = self._make_anchor_node(
@@ -855,6 +880,7 @@ class TestPasteHiddenPathACLinkClass(unittest.TestCase):
                                             })
 
         with patch('paste_hidden.nuke') as mock_nuke, \
+             patch('paste_hidden.script_stem', return_value='shotA'), \
              patch('paste_hidden.nukescripts') as mock_nukescripts, \
              patch('paste_hidden.find_anchor_node', return_value=noop_source_node), \
              patch('paste_hidden.is_anchor', return_value=True), \
@@ -865,13 +891,14 @@ class TestPasteHiddenPathACLinkClass(unittest.TestCase):
             mock_nuke.root.return_value = root_obj
             mock_nuke.nodePaste.return_value = None
             mock_nuke.selectedNodes.return_value = [anchor_node]
-            mock_nuke.createNode.return_value = created_link_node
+            mock_nuke.nodes.NoOp.return_value = created_link_node
 
             from paste_hidden import paste_hidden
             paste_hidden()
 
-            # Must call createNode with 'NoOp' since noop_source_node.Class() == 'NoOp'
-            mock_nuke.createNode.assert_called_once_with('NoOp')
+            # Must create a NoOp link since noop_source_node.Class() == 'NoOp'
+            mock_nuke.nodes.NoOp.assert_called_once_with()
+            mock_nuke.nodes.Dot.assert_not_called()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,147 @@
+"""Tests for the cached script stem, FQNN parsing and FqnnResolver in link.py.
+
+Covers:
+- script_stem() is cached only once enabled, and dropped by invalidate_script_stem()
+  and by a Root name change (Save As)
+- parse_fqnn() splits stem, group path and name, and memoizes the result
+- FqnnResolver scans each group once per batch, resolves anchors by name without
+  nuke.toNode(), and falls back to nuke.toNode() for other nodes
+- Cross-script FQNNs are remembered as unresolvable until the stem changes
+- reconnect_all_links() resolves a group's links with one index scan
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import anchor
+import link
+from constants import KNOB_NAME
+
+
+def _in_group(node, path):
+    node.fullName = lambda: path + '.' + node.name() if path else node.name()
+    return node
+
+
+def _link_node(fqnn, path='', name='Link'):
+    import nuke as _nuke
+    node = _nuke.StubNode(name=name, node_class='NoOp',
+                          knobs_dict={KNOB_NAME: _nuke.StubKnob(fqnn)})
+    return _in_group(node, path)
+
+
+class _ResolutionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        import nuke as nuke_stub
+        self.nuke = nuke_stub
+        self.root = MagicMock(name='root')
+        self.root.Class.return_value = 'Root'
+        self.root.name.return_value = 'destScript.nk'
+        self.plate = _in_group(nuke_stub.StubNode(name='Anchor_Plate', node_class='NoOp'), '')
+        self.grade = _in_group(nuke_stub.StubNode(name='Grade1', node_class='Grade'), '')
+        self.all_nodes = MagicMock(
+            side_effect=lambda class_name=None, group=None: [self.plate, self.grade])
+        self.to_node = MagicMock(side_effect={'root.Grade1': self.grade}.get)
+        patches = [
+            patch.object(nuke_stub, 'root', return_value=self.root),
+            patch.object(nuke_stub, 'thisGroup', return_value=self.root),
+            patch.object(nuke_stub, 'allNodes', self.all_nodes),
+            patch.object(nuke_stub, 'toNode', self.to_node),
+            patch.object(link, '_group_indexes', {}),
+            patch.object(link, '_group_index_cache_enabled', False),
+            patch.object(link, '_script_stem', None),
+            patch.object(link, '_script_stem_cache_enabled', False),
+            patch.object(link, '_parsed_fqnns', {}),
+            patch.object(link, '_cross_script_fqnns', set()),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class TestScriptStem(_ResolutionTestCase):
+
+    def test_read_every_call_until_caching_is_enabled(self):
+        link.script_stem()
+        self.root.name.return_value = 'renamed.nk'
+        self.assertEqual(link.script_stem(), 'renamed')
+
+    def test_cached_until_invalidated(self):
+        link.enable_script_stem_cache()
+        self.assertEqual(link.script_stem(), 'destScript')
+        self.root.name.return_value = 'renamed.nk'
+        self.assertEqual(link.get_fully_qualified_node_name(self.plate),
+                         'destScript.Anchor_Plate')
+        link.invalidate_script_stem()
+        self.assertEqual(link.script_stem(), 'renamed')
+        self.assertEqual(self.root.name.call_count, 2)
+
+    def test_root_rename_invalidates(self):
+        link.enable_script_stem_cache()
+        link.script_stem()
+        self.root.name.return_value = 'renamed.nk'
+        for knob_name, expected in (('label', 'destScript'), ('name', 'renamed')):
+            knob = MagicMock()
+            knob.name.return_value = knob_name
+            with patch.object(self.nuke, 'thisKnob', create=True, return_value=knob):
+                link.on_root_knob_changed()
+            self.assertEqual(link.script_stem(), expected)
+
+
+class TestParseFqnn(_ResolutionTestCase):
+
+    def test_splits_stem_group_path_and_name(self):
+        self.assertEqual(link.parse_fqnn('shot.Anchor_Plate'), ('shot', '', 'Anchor_Plate'))
+        self.assertEqual(link.parse_fqnn('shot.Comp1.Inner.Anchor_Plate'),
+                         ('shot', 'Comp1.Inner', 'Anchor_Plate'))
+        self.assertIsNone(link.parse_fqnn(''))
+
+    def test_results_are_memoized(self):
+        parsed = link.parse_fqnn('shot.Comp1.Anchor_Plate')
+        self.assertIs(link.parse_fqnn('shot.Comp1.Anchor_Plate'), parsed)
+
+
+class TestFqnnResolver(_ResolutionTestCase):
+
+    def test_anchors_resolve_by_name_with_one_scan_per_group(self):
+        links = [_link_node('destScript.Anchor_Plate', name='Link%d' % i) for i in range(5)]
+        resolver = link.FqnnResolver()
+        self.assertEqual([resolver.find_anchor_node(node) for node in links], [self.plate] * 5)
+        self.all_nodes.assert_called_once_with(group=self.root)
+        self.to_node.assert_not_called()
+
+    def test_other_nodes_fall_back_to_to_node(self):
+        local_dot = _link_node('destScript.Grade1')
+        self.assertIs(link.FqnnResolver().find_anchor_node(local_dot), self.grade)
+
+    def test_other_groups_and_missing_nodes_do_not_resolve(self):
+        resolver = link.FqnnResolver()
+        self.assertIsNone(resolver.find_anchor_node(_link_node('destScript.Comp1.Anchor_X')))
+        self.assertIsNone(resolver.find_anchor_node(_link_node('destScript.Deleted1')))
+
+    def test_cross_script_fqnns_are_remembered_until_the_stem_changes(self):
+        link.enable_script_stem_cache()
+        cross_script = _link_node('sourceScript.Anchor_Plate')
+        self.assertIsNone(link.find_anchor_node(cross_script))
+        self.assertIn('sourceScript.Anchor_Plate', link._cross_script_fqnns)
+        self.root.name.return_value = 'sourceScript.nk'
+        link.invalidate_script_stem()
+        self.assertEqual(link._cross_script_fqnns, set())
+        self.assertIs(link.FqnnResolver().find_anchor_node(cross_script), self.plate)
+
+
+class TestReconnectAllLinks(_ResolutionTestCase):
+
+    def test_one_index_scan_for_all_links(self):
+        links = [_link_node('destScript.Anchor_Plate', name='Link%d' % i) for i in range(3)]
+        self.all_nodes.side_effect = lambda class_name=None, group=None: [self.plate] + links
+        link.enable_group_index_cache()
+        anchor.reconnect_all_links()
+        self.assertEqual([node.input(0) for node in links], [self.plate] * 3)
+        self.all_nodes.assert_called_once_with(group=self.root)
+        self.to_node.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,216 @@
+"""Tests for the per-group anchor/link indexes in link.py.
+
+Covers:
+- group_path() / parent_group_path() / group_node() map Groups to paths and back
+- all_anchors() and get_links_for_anchor() scan only the relevant group
+- Indexes are reused once caching is enabled, and rebuilt when the generation moves
+- Nodes deleted since their index was built are skipped
+- Creating or deleting an anchor or link of any class moves the generation
+- find_anchor_node() resolves FQNNs from the root, whatever the current context
+- The pickers list and create inside the group they were opened from
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import anchor
+import link
+from constants import KNOB_NAME
+
+
+def _group(path):
+    group = MagicMock(name='Group ' + path)
+    group.Class.return_value = 'Group'
+    group.fullName.return_value = path
+    group.name.return_value = path.rpartition('.')[2]
+    group.knobs.return_value = {}
+    return group
+
+
+def _in_group(node, path):
+    """Give *node* the fullName() Nuke reports for a node inside the Group at *path*."""
+    node.fullName = lambda: path + '.' + node.name() if path else node.name()
+    return node
+
+
+def _anchor_node(name, path=''):
+    import nuke as _nuke
+    return _in_group(_nuke.StubNode(name=name, node_class='NoOp'), path)
+
+
+def _link_node(fqnn, path=''):
+    import nuke as _nuke
+    node = _nuke.StubNode(name='Link', node_class='NoOp',
+                          knobs_dict={KNOB_NAME: _nuke.StubKnob(fqnn)})
+    return _in_group(node, path)
+
+
+class _GroupIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        import nuke as nuke_stub
+        self.nuke = nuke_stub
+        self.root = MagicMock(name='root')
+        self.root.Class.return_value = 'Root'
+        self.root.name.return_value = 'destScript.nk'
+        self.comp = _group('Comp1')
+        self.comp_anchor = _anchor_node('Anchor_Plate', 'Comp1')
+        self.comp_link = _link_node('destScript.Comp1.Anchor_Plate', 'Comp1')
+        self.root_anchor = _anchor_node('Anchor_BG')
+        self.contents = {
+            id(self.root): [self.root_anchor, self.comp],
+            id(self.comp): [self.comp_anchor, self.comp_link],
+        }
+        self.all_nodes = MagicMock(
+            side_effect=lambda class_name=None, group=None: list(self.contents[id(group)]))
+        patches = [
+            patch.object(nuke_stub, 'root', return_value=self.root),
+            patch.object(nuke_stub, 'thisGroup', return_value=self.root),
+            patch.object(nuke_stub, 'allNodes', self.all_nodes),
+            patch.object(nuke_stub, 'toNode',
+                         side_effect={'root.Comp1': self.comp}.get),
+            patch.object(link, '_group_indexes', {}),
+            patch.object(link, '_group_index_cache_enabled', False),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _enter(self, group):
+        patcher = patch.object(self.nuke, 'thisGroup', return_value=group)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestGroupPaths(_GroupIndexTestCase):
+
+    def test_root_is_the_empty_path(self):
+        self.assertEqual(link.group_path(self.root), '')
+        self.assertIs(link.group_node(''), self.root)
+
+    def test_group_paths_round_trip(self):
+        self.assertEqual(link.group_path(self.comp), 'Comp1')
+        self.assertIs(link.group_node('Comp1'), self.comp)
+        self.assertEqual(link.parent_group_path(self.comp_anchor), 'Comp1')
+        self.assertEqual(link.parent_group_path(self.root_anchor), '')
+
+
+class TestGroupScopedLookups(_GroupIndexTestCase):
+
+    def test_all_anchors_lists_only_the_current_group(self):
+        self._enter(self.comp)
+        self.assertEqual(anchor.all_anchors(), [self.comp_anchor])
+        self.all_nodes.assert_called_once_with(group=self.comp)
+
+    def test_all_anchors_at_root_ignores_anchors_inside_groups(self):
+        self.assertEqual(anchor.all_anchors(), [self.root_anchor])
+
+    def test_links_are_read_from_the_anchors_own_group(self):
+        self.assertEqual(anchor.get_links_for_anchor(self.comp_anchor), [self.comp_link])
+        self.all_nodes.assert_called_once_with(group=self.comp)
+
+    def test_find_anchor_node_resolves_from_root_inside_a_group(self):
+        self._enter(self.comp)
+        with patch.object(self.nuke, 'toNode', return_value=self.comp_anchor) as to_node:
+            self.assertIs(link.find_anchor_node(self.comp_link), self.comp_anchor)
+        to_node.assert_called_once_with('root.Comp1.Anchor_Plate')
+
+
+class TestGroupIndexCache(_GroupIndexTestCase):
+
+    def test_rescans_every_call_until_caching_is_enabled(self):
+        anchor.all_anchors('Comp1')
+        anchor.all_anchors('Comp1')
+        self.assertEqual(self.all_nodes.call_count, 2)
+
+    def test_cached_index_is_reused_until_the_generation_moves(self):
+        link.enable_group_index_cache()
+        anchor.all_anchors('Comp1')
+        anchor.get_links_for_anchor(self.comp_anchor)
+        self.assertEqual(self.all_nodes.call_count, 1)
+        link.bump_anchor_generation()
+        anchor.all_anchors('Comp1')
+        self.assertEqual(self.all_nodes.call_count, 2)
+
+    def test_each_group_has_its_own_index(self):
+        link.enable_group_index_cache()
+        anchor.all_anchors('')
+        anchor.all_anchors('Comp1')
+        anchor.all_anchors('')
+        self.assertEqual([call.kwargs['group'] for call in self.all_nodes.call_args_list],
+                         [self.root, self.comp])
+
+
+    def test_nodes_deleted_since_indexing_are_skipped(self):
+        link.enable_group_index_cache()
+        anchor.all_anchors('Comp1')
+        self.comp_anchor.name = MagicMock(side_effect=ValueError('A PythonObject is not attached'))
+        self.assertEqual(anchor.all_anchors('Comp1'), [])
+        self.assertEqual(link.group_index('Comp1').links, [self.comp_link])
+        self.assertEqual(self.all_nodes.call_count, 1)
+
+
+class TestCreateDestroyCallback(_GroupIndexTestCase):
+
+    def _generation_moves(self, node):
+        generation = link.anchor_generation()
+        with patch.object(self.nuke, 'thisNode', create=True, return_value=node):
+            anchor.on_node_created_or_destroyed()
+        return link.anchor_generation() != generation
+
+    def test_anchor_or_link_of_another_class_moves_the_generation(self):
+        import nuke as _nuke
+        stamped_read = _nuke.StubNode(name='Read1', node_class='Read',
+                                      knobs_dict={KNOB_NAME: _nuke.StubKnob('destScript.Read1')})
+        self.assertTrue(self._generation_moves(stamped_read))
+        self.assertTrue(self._generation_moves(
+            _nuke.StubNode(name='Anchor_Grade', node_class='Grade')))
+
+    def test_other_nodes_leave_the_generation_alone(self):
+        import nuke as _nuke
+        self.assertFalse(self._generation_moves(_nuke.StubNode(name='Grade1',
+                                                               node_class='Grade')))
+        # The class-filtered callback already covers NoOps, Dots, ...
+        self.assertFalse(self._generation_moves(_nuke.StubNode(name='NoOp1')))
+
+
+class TestPickersRememberTheirGroup(_GroupIndexTestCase):
+
+    def tearDown(self):
+        anchor._picker_group_path = ''
+
+    def test_items_come_from_the_group_the_picker_was_opened_in(self):
+        self._enter(self.comp)
+        with patch.object(anchor, '_new_picker'), \
+             patch.object(anchor, '_anchor_picker_widget', None):
+            anchor.select_anchor_and_create()
+        self.assertEqual(anchor._picker_group_path, 'Comp1')
+        items = anchor.AnchorPlugin().get_items()
+        self.assertEqual([item['menuobj'] for item in items], [self.comp_anchor])
+
+    def test_invoke_creates_the_link_inside_that_group(self):
+        anchor._picker_group_path = 'Comp1'
+        entered = []
+        self.comp.__enter__ = MagicMock(side_effect=lambda: entered.append(True))
+        with patch.object(self.nuke, 'exists', return_value=True), \
+             patch.object(anchor, 'create_from_anchor',
+                          side_effect=lambda node: self.assertEqual(entered, [True])) as create:
+            anchor.AnchorPlugin().invoke({'menuobj': self.comp_anchor})
+        create.assert_called_once_with(self.comp_anchor)
+        self.comp.__exit__.assert_called_once()
+
+    def test_invoke_is_a_no_op_when_the_group_was_deleted(self):
+        anchor._picker_group_path = 'Deleted1'
+        with patch.object(anchor, 'create_from_anchor') as create:
+            anchor.AnchorPlugin().invoke({'menuobj': self.comp_anchor})
+        create.assert_not_called()
+
+    def test_change_token_differs_per_group(self):
+        plugin = anchor.AnchorPlugin()
+        root_token = plugin.get_change_token()
+        anchor._picker_group_path = 'Comp1'
+        self.assertNotEqual(plugin.get_change_token(), root_token)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""Tests that the plugin loads without Qt, as in a `nuke -t` session.
+
+Covers:
+- menu.py and the non-UI modules import with PySide blocked
+- Loading them does not import PySide, tabtabtab or colors
+- UI entry points degrade to no-ops when Qt is unavailable
+
+Each test runs in a fresh interpreter so the suite's PySide6 and tabtabtab
+stubs (installed by conftest.py) cannot leak in.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+_REPO_ROOT = Path(__file__).parent.parent
+
+_CHILD_SCRIPT = '''
+import importlib.abc
+import importlib.util
+import json
+import sys
+from unittest.mock import MagicMock
+
+repo_root = sys.argv[1]
+
+
+class _BlockQt(importlib.abc.MetaPathFinder):
+    def find_spec(self, fullname, path, target=None):
+        if fullname.split('.')[0] in ('PySide2', 'PySide6'):
+            raise ImportError('Qt blocked for test: ' + fullname)
+        return None
+
+
+sys.meta_path.insert(0, _BlockQt())
+sys.path.insert(0, repo_root)
+spec = importlib.util.spec_from_file_location('_stubs', repo_root + '/tests/stubs.py')
+stubs = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(stubs)
+nuke = stubs.make_stub_nuke_module()
+nuke.GUI = False
+nuke.__getattr__ = lambda name: MagicMock(name='nuke.' + name)
+sys.modules['nuke'] = nuke
+sys.modules['nukescripts'] = stubs.make_stub_nukescripts_module()
+
+import anchor, labels, link, manifest, menu, paste_hidden, prefs  # noqa: E401,F401
+
+loaded_at_import = sorted(
+    name for name in sys.modules
+    if name.split('.')[0] in ('PySide2', 'PySide6', 'tabtabtab', 'colors')
+)
+anchor.select_anchor_and_create()
+anchor.select_anchor_and_navigate()
+prefs.prewarm_ui_enabled = True
+anchor.schedule_prewarm_ui()
+anchor.prewarm_ui()
+print(json.dumps({
+    'loaded_at_import': loaded_at_import,
+    'qt_modules': anchor._qt_modules(),
+    'dialog_class': anchor._color_palette_dialog_class(),
+}))
+'''
+
+
+def _run_headless():
+    with tempfile.TemporaryDirectory() as home:
+        result = subprocess.run(
+            [sys.executable, '-c', _CHILD_SCRIPT, str(_REPO_ROOT)],
+            env=dict(os.environ, HOME=home),
+            cwd=home,
+            capture_output=True,
+            text=True,
+        )
+    if result.returncode != 0:
+        raise AssertionError('headless import failed:\n' + result.stderr)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestHeadlessImport(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.result = _run_headless()
+
+    def test_plugin_modules_load_without_ui_modules(self):
+        self.assertEqual(self.result['loaded_at_import'], [])
+
+    def test_qt_accessors_report_unavailable(self):
+        self.assertIsNone(self.result['qt_modules'])
+        self.assertIsNone(self.result['dialog_class'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+"""Tests for expression-driven link labels (prefs.expression_link_labels).
+
+Covers:
+- setup_link_node() writes LINK_LABEL_EXPRESSION for anchor inputs only when the pref is on
+- rename_anchor_to() and Dot relabelling make no writes to ID links with expression labels
+- Dot relabelling keeps expression labels on links without an ID, and still reconnects them
+- convert_link_labels_to_expressions() converts anchor links in one pass and one undo step
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import anchor
+import labels
+import link
+import prefs
+from constants import (
+    ANCHOR_ID_KNOB_NAME,
+    KNOB_NAME,
+    LINK_ANCHOR_ID_KNOB_NAME,
+    LINK_LABEL_EXPRESSION,
+)
+from tests.stubs import StubKnob
+
+
+class _RecordingKnob(StubKnob):
+    """Knob stub that records every setValue() call."""
+
+    def __init__(self, value='', knob_name=''):
+        super().__init__(value, knob_name)
+        self.writes = []
+
+    def setValue(self, value):
+        self.writes.append(value)
+        super().setValue(value)
+
+
+def _node(name, node_class='NoOp', **knob_values):
+    import nuke as _nuke
+    knobs = {'label': '', 'tile_color': 0, 'hide_input': False, 'note_font_size': 0}
+    knobs.update(knob_values)
+    return _nuke.StubNode(name=name, node_class=node_class,
+                          knobs_dict={k: _RecordingKnob(v) for k, v in knobs.items()})
+
+
+def _link_to(anchor_node, label):
+    node = _node('Link1', **{
+        KNOB_NAME: 'destScript.' + anchor_node.name(),
+        LINK_ANCHOR_ID_KNOB_NAME: 'abc',
+        'label': label,
+    })
+    node.setInput(0, anchor_node)
+    return node
+
+
+def _written(node):
+    return {name: knob.writes for name, knob in node.knobs().items() if knob.writes}
+
+
+class _LabelTestCase(unittest.TestCase):
+
+    def setUp(self):
+        import nuke as nuke_stub
+        self.nuke = nuke_stub
+        self.nodes = []
+        root = MagicMock(name='root')
+        root.Class.return_value = 'Root'
+        root.name.return_value = 'destScript.nk'
+        patches = [
+            patch.object(nuke_stub, 'root', return_value=root),
+            patch.object(nuke_stub, 'thisGroup', return_value=root),
+            patch.object(nuke_stub, 'allNodes',
+                         side_effect=lambda *args, **kwargs: list(self.nodes)),
+            patch.object(nuke_stub, 'Undo'),
+            patch.object(nuke_stub, 'String_Knob',
+                         side_effect=lambda name, *args: _RecordingKnob('', name)),
+            patch.object(link, '_group_indexes', {}),
+            patch.object(link, '_group_index_cache_enabled', False),
+            patch.object(link, 'find_node_default_color', return_value=0),
+            patch.object(prefs, 'expression_link_labels', True),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class TestNewLinkLabels(_LabelTestCase):
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch.object(link, 'add_input_knob',
+                               side_effect=lambda node, dot_type=None: node.addKnob(
+                                   _RecordingKnob('', KNOB_NAME)))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_anchor_links_get_the_expression_when_enabled(self):
+        plate = _node('Anchor_Plate', label='Plate')
+        new_link = _node('NoOp1')
+        link.setup_link_node(plate, new_link)
+        self.assertEqual(new_link['label'].getText(), LINK_LABEL_EXPRESSION)
+
+    def test_plain_inputs_keep_static_labels(self):
+        grade = _node('Grade1', node_class='Grade', label='warm')
+        new_link = _node('NoOp1')
+        link.setup_link_node(grade, new_link)
+        self.assertEqual(new_link['label'].getText(), 'Link: warm')
+
+    def test_static_labels_when_disabled(self):
+        prefs.expression_link_labels = False
+        plate = _node('Anchor_Plate', label='Plate')
+        new_link = _node('NoOp1')
+        link.setup_link_node(plate, new_link)
+        self.assertEqual(new_link['label'].getText(), 'Link: Plate')
+
+
+class TestRenameWithoutLinkWrites(_LabelTestCase):
+
+    def test_rename_writes_nothing_to_expression_id_links(self):
+        plate = _node('Anchor_Plate', label='Plate', **{ANCHOR_ID_KNOB_NAME: 'abc'})
+        expression_link = _link_to(plate, LINK_LABEL_EXPRESSION)
+        static_link = _link_to(plate, 'Link: Plate')
+        self.nodes = [plate, expression_link, static_link]
+        anchor.rename_anchor_to(plate, 'Background')
+        self.assertEqual(_written(expression_link), {})
+        self.assertEqual(_written(static_link), {'label': ['Link: Background']})
+
+    def test_dot_relabel_writes_nothing_to_expression_id_links(self):
+        dot = _node('Anchor_Plate', node_class='Dot', label='Plate',
+                    **{ANCHOR_ID_KNOB_NAME: 'abc'})
+        expression_link = _link_to(dot, LINK_LABEL_EXPRESSION)
+        self.nodes = [dot, expression_link]
+        labels._update_dot_link_labels(dot, 'Background')
+        self.assertEqual(_written(expression_link), {})
+
+    def test_dot_relabel_keeps_expression_labels_on_links_without_id(self):
+        dot = _node('Anchor_Plate', node_class='Dot', label='Plate')
+        legacy_link = _node('Link1', **{KNOB_NAME: 'destScript.Anchor_Plate',
+                                        'label': LINK_LABEL_EXPRESSION})
+        self.nodes = [dot, legacy_link]
+        with patch.object(labels, 'reconnect_link_node') as reconnect:
+            labels._update_dot_link_labels(dot, 'Background')
+        self.assertEqual(_written(legacy_link), {})
+        reconnect.assert_called_once_with(legacy_link)
+
+
+class TestConvertLinkLabels(_LabelTestCase):
+
+    def test_converts_anchor_links_in_one_undo_step(self):
+        plate = _node('Anchor_Plate', label='Plate')
+        anchor_link = _link_to(plate, 'Link: Plate')
+        already = _link_to(plate, LINK_LABEL_EXPRESSION)
+        grade = _node('Grade1', node_class='Grade')
+        local_dot = _node('Dot1', node_class='Dot',
+                          label='Local: Grade1', **{KNOB_NAME: 'destScript.Grade1'})
+        local_dot.setInput(0, grade)
+        self.nodes = [plate, anchor_link, already, grade, local_dot]
+
+        self.assertEqual(labels.convert_link_labels_to_expressions(), 1)
+
+        self.assertEqual(anchor_link['label'].getText(), LINK_LABEL_EXPRESSION)
+        self.assertEqual(_written(already), {})
+        self.assertEqual(local_dot['label'].getText(), 'Local: Grade1')
+        self.nuke.allNodes.assert_called_once_with(recurseGroups=True)
+        self.nuke.Undo.return_value.begin.assert_called_once()
+
+    def test_nothing_to_convert_makes_no_undo_step(self):
+        self.assertEqual(labels.convert_link_labels_to_expressions(), 0)
+        self.nuke.Undo.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,222 @@
+"""Tests for copy/paste planning (copy_paste_plan.py) and the paste transaction layer.
+
+Covers:
+- plan_paste() turns descriptors into replace/rewire/relink steps without touching Nuke
+- plan_copy() turns descriptors into stamp/restyle/refresh steps without touching Nuke
+- paste_hidden() applies the whole paste as one undo step with no createNode() calls
+- Pasted nodes fed by a replaced node are rewired to its link
+- The final selection is set once, with links standing in for the nodes they replaced
+- copy_hidden() on a large selection scans allNodes() once and sets each Dot up in one call
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import copy_paste_plan
+import paste_hidden
+from constants import KNOB_NAME
+from tests.stubs import StubKnob
+
+
+def _node(name, node_class, **knob_values):
+    import nuke as _nuke
+    knobs = {'label': '', 'tile_color': 0, 'selected': False}
+    knobs.update(knob_values)
+    return _nuke.StubNode(name=name, node_class=node_class,
+                          knobs_dict={k: _nuke.StubKnob(v, k) for k, v in knobs.items()})
+
+
+class _PasteTestCase(unittest.TestCase):
+
+    def setUp(self):
+        import nuke as nuke_stub
+        self.source_read = _node('Read1', 'Read', file='/shots/plate_v001.exr')
+        self.pasted_read = _node('Read2', 'Read', **{KNOB_NAME: 'destScript.Read1'})
+        self.grade = _node('Grade1', 'Grade')
+        self.grade.setInput(0, self.pasted_read)
+        self.pasted = [self.pasted_read, self.grade]
+        self.links = []
+
+        def new_noop():
+            link_node = _node('NoOp%d' % (len(self.links) + 1), 'NoOp')
+            self.links.append(link_node)
+            return link_node
+
+        self.nuke = MagicMock(name='nuke')
+        self.nuke.root.return_value.name.return_value = 'destScript.nk'
+        self.nuke.selectedNodes.return_value = self.pasted
+        self.nuke.nodes.NoOp.side_effect = new_noop
+        self.nukescripts = MagicMock(name='nukescripts')
+        self.setup_link_node = MagicMock(name='setup_link_node')
+        patches = [
+            patch.object(paste_hidden, 'nuke', self.nuke),
+            patch.object(paste_hidden, 'nukescripts', self.nukescripts),
+            patch.object(paste_hidden, 'find_anchor_node',
+                         side_effect=lambda node: self.source_read
+                         if node is self.pasted_read else None),
+            patch.object(paste_hidden, 'is_anchor', return_value=False),
+            patch.object(paste_hidden, 'setup_link_node', self.setup_link_node),
+            patch.object(paste_hidden, 'uncollide_pasted_anchor_ids'),
+            patch.object(nuke_stub, 'Undo'),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.undo_class = nuke_stub.Undo
+
+
+def _descriptor(key, node_class='NoOp', **attributes):
+    return copy_paste_plan.NodeDescriptor(key, node_class, name=key,
+                                          fqnn='destScript.' + key, **attributes)
+
+
+class TestPlanPaste(unittest.TestCase):
+    """plan_paste() on descriptors alone — no nuke calls."""
+
+    def setUp(self):
+        self.sources = {'Read2': _descriptor('Read1', 'Read')}
+        self.anchors_by_name = {}
+
+    def _plan(self, pasted):
+        return copy_paste_plan.plan_paste(
+            pasted, 'destScript',
+            lambda descriptor: self.sources.get(descriptor.key),
+            self.anchors_by_name.get)
+
+    def test_plan_lists_the_replacement_and_the_rewire(self):
+        pasted_read = _descriptor('Read2', 'Read', xpos=10, ypos=20,
+                                  stored_fqnn='destScript.Read1')
+        grade = _descriptor('Grade1', 'Grade', inputs=['Read2'])
+        self.assertEqual(self._plan([pasted_read, grade]), [
+            (copy_paste_plan.REPLACE_WITH_LINK, 'Read2', 'Read1', 'NoOp', 10, 20),
+            (copy_paste_plan.REWIRE, 'Grade1', 0, 'Read2'),
+        ])
+
+    def test_dot_sources_get_dot_links(self):
+        self.sources = {'Anchor_Plate1': _descriptor('Anchor_Plate', 'Dot')}
+        pasted = _descriptor('Anchor_Plate1', 'Dot', is_anchor=True,
+                             stored_fqnn='destScript.Anchor_Plate')
+        self.assertEqual(self._plan([pasted])[0][3], 'Dot')
+
+    def test_cross_script_link_dot_relinks_by_name(self):
+        self.anchors_by_name = {'Plate': _descriptor('Anchor_Plate')}
+        link_dot = _descriptor('Dot1', 'Dot', stored_fqnn='otherScript.Anchor_Plate',
+                               dot_type='link')
+        local_dot = _descriptor('Dot2', 'Dot', stored_fqnn='otherScript.Grade1',
+                                dot_type='local')
+        self.assertEqual(self._plan([link_dot, local_dot]),
+                         [(copy_paste_plan.RELINK, 'Dot1', 'Anchor_Plate', None)])
+
+    def test_same_script_dot_keeps_its_stored_dot_type(self):
+        self.sources = {'Dot1': _descriptor('Grade1', 'Grade')}
+        local_dot = _descriptor('Dot1', 'Dot', stored_fqnn='destScript.Grade1',
+                                dot_type='local')
+        self.assertEqual(self._plan([local_dot]),
+                         [(copy_paste_plan.RELINK, 'Dot1', 'Grade1', 'local')])
+
+    def test_unstamped_and_unresolved_nodes_are_left_alone(self):
+        self.sources = {}
+        plain = _descriptor('Grade1', 'Grade')
+        orphan = _descriptor('Read2', 'Read', stored_fqnn='otherScript.Read1')
+        self.assertEqual(self._plan([plain, orphan]), [])
+
+
+class TestPlanCopy(unittest.TestCase):
+    """plan_copy() on descriptors alone — no nuke calls."""
+
+    def test_read_is_stamped_with_the_anchor_fed_by_it(self):
+        read = _descriptor('Read1', 'Read')
+        plate = _descriptor('Anchor_Plate', is_anchor=True)
+        plan = copy_paste_plan.plan_copy([read], {}, anchor_for_input={'Read1': plate}.get)
+        self.assertEqual(plan, [(copy_paste_plan.STAMP, 'Read1', 'destScript.Anchor_Plate',
+                                'Anchor_Plate')])
+
+    def test_cut_and_passthrough_skip_the_anchor_lookup(self):
+        read = _descriptor('Read1', 'Read')
+        self.assertEqual(copy_paste_plan.plan_copy([read], {}, cut=True),
+                         [(copy_paste_plan.STAMP, 'Read1', '', None)])
+        self.assertEqual(copy_paste_plan.plan_copy([read], {}, passthrough=True), [])
+
+    def test_hidden_input_dots_become_link_or_local_dots(self):
+        plate = _descriptor('Anchor_Plate', is_anchor=True)
+        grade = _descriptor('Grade1', 'Grade', label='warm')
+        link_dot = _descriptor('Dot1', 'Dot', hide_input=True, inputs=['Anchor_Plate'])
+        local_dot = _descriptor('Dot2', 'Dot', hide_input=True, inputs=['Grade1'])
+        graph = {descriptor.key: descriptor for descriptor in (plate, grade)}
+        self.assertEqual(copy_paste_plan.plan_copy([link_dot, local_dot], graph), [
+            (copy_paste_plan.MAKE_LINK_DOT, 'Dot1', 'Anchor_Plate', 'destScript.Anchor_Plate'),
+            (copy_paste_plan.MAKE_LOCAL_DOT, 'Dot2', 'Grade1', 'destScript.Grade1', 'warm'),
+        ])
+
+    def test_dot_copied_with_its_input_stores_no_reference(self):
+        grade = _descriptor('Grade1', 'Grade')
+        dot = _descriptor('Dot1', 'Dot', hide_input=True, inputs=['Grade1'])
+        self.assertEqual(copy_paste_plan.plan_copy([grade, dot], {}),
+                         [(copy_paste_plan.STAMP, 'Dot1', '', None)])
+
+    def test_links_are_refreshed_unless_cut(self):
+        existing_link = _descriptor('Link1', is_link=True, stored_fqnn='destScript.Anchor_A')
+        self.assertEqual(copy_paste_plan.plan_copy([existing_link], {}),
+                         [(copy_paste_plan.REFRESH_FQNN, 'Link1')])
+        self.assertEqual(copy_paste_plan.plan_copy([existing_link], {}, cut=True), [])
+
+
+class TestPasteHidden(_PasteTestCase):
+
+    def test_paste_is_one_undo_step_without_create_node(self):
+        paste_hidden.paste_hidden()
+        self.undo_class.return_value.begin.assert_called_once_with("Paste")
+        self.undo_class.return_value.end.assert_called_once()
+        self.nuke.createNode.assert_not_called()
+        self.nuke.delete.assert_called_once_with(self.pasted_read)
+
+    def test_downstream_nodes_are_rewired_to_the_link(self):
+        paste_hidden.paste_hidden()
+        self.assertEqual(len(self.links), 1)
+        self.assertIs(self.grade.input(0), self.links[0])
+        self.setup_link_node.assert_called_once_with(self.source_read, self.links[0])
+
+    def test_selection_is_cleared_once_and_ends_on_the_result(self):
+        paste_hidden.paste_hidden()
+        self.nukescripts.clear_selection_recursive.assert_called_once_with()
+        self.assertTrue(self.links[0]['selected'].getValue())
+        self.assertTrue(self.grade['selected'].getValue())
+        self.assertFalse(self.pasted_read['selected'].getValue())
+
+
+class TestLargeCopy(unittest.TestCase):
+
+    def test_large_selection_is_copied_in_one_pass(self):
+        import prefs
+        grades = [_node('Grade%d' % i, 'Grade') for i in range(50)]
+        dots = []
+        for i in range(2500):
+            dot = _node('Dot%d' % i, 'Dot', hide_input=True)
+            dot.setInput(0, grades[i % len(grades)])
+            dots.append(dot)
+        reads = [_node('Read%d' % i, 'Read') for i in range(2500)]
+        with patch.object(paste_hidden, 'nuke') as mock_nuke, \
+             patch.object(paste_hidden, 'nukescripts'), \
+             patch.object(paste_hidden, 'setup_link_node') as setup_link_node, \
+             patch.object(paste_hidden, 'add_input_knob',
+                          side_effect=lambda node: node.addKnob(StubKnob('', KNOB_NAME))), \
+             patch.object(paste_hidden, 'get_fully_qualified_node_name',
+                          side_effect=lambda node: 'destScript.' + node.name()), \
+             patch.object(prefs, 'plugin_enabled', True), \
+             patch.object(prefs, 'link_classes_paste_mode', 'replace'):
+            mock_nuke.root.return_value.name.return_value = 'destScript.nk'
+            mock_nuke.selectedNodes.return_value = dots + reads
+            mock_nuke.allNodes.return_value = grades + dots + reads
+            paste_hidden.copy_hidden()
+
+        mock_nuke.allNodes.assert_called_once_with()
+        self.assertEqual(setup_link_node.call_count, len(dots))
+        for call in setup_link_node.call_args_list:
+            self.assertEqual(call.kwargs['dot_type'], 'local')
+            self.assertIn('tile_color', call.kwargs)
+            self.assertIn('fqnn', call.kwargs)
+        self.assertEqual(reads[0][KNOB_NAME].getText(), 'destScript.Read0')
+
+
+if __name__ == '__main__':
+    unittest.main()
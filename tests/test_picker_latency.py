@@ -0,0 +1,55 @@
+"""Tests for the offscreen picker latency harness (benchmarks/bench_picker_latency.py).
+
+Covers:
+- percentiles() reports p50/p90/p99/max, including for a single timing
+- The harness runs a real TabTabTabWidget offscreen, synchronous and background
+  scoring sizes alike, within generous budgets (skipped without PySide)
+"""
+
+import importlib.util
+import os
+import subprocess
+import sys
+import unittest
+
+HARNESS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       'benchmarks', 'bench_picker_latency.py')
+
+
+def _load_harness():
+    spec = importlib.util.spec_from_file_location('_bench_picker_latency', HARNESS)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestPercentiles(unittest.TestCase):
+
+    def test_percentiles(self):
+        stats = _load_harness().percentiles([float(value) for value in range(1, 101)])
+        self.assertAlmostEqual(stats['p50'], 50.5)
+        self.assertAlmostEqual(stats['p90'], 90.1)
+        self.assertEqual(stats['max'], 100.0)
+
+    def test_single_timing(self):
+        self.assertEqual(_load_harness().percentiles([3.0]),
+                         {'p50': 3.0, 'p90': 3.0, 'p99': 3.0, 'max': 3.0})
+
+
+class TestOffscreenHarness(unittest.TestCase):
+
+    def test_runs_offscreen_within_generous_budgets(self):
+        # A separate interpreter: the test suite replaces PySide6 with stubs.
+        environment = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+        result = subprocess.run(
+            [sys.executable, HARNESS, '--sizes', '100', '6000', '--repeat', '1',
+             '--budget-ms', '250', '--open-budget-ms', '1000'],
+            capture_output=True, text=True, env=environment, timeout=300)
+        if result.returncode == 2:
+            self.skipTest('PySide6 or PySide2 is not installed')
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        self.assertIn('6000 items', result.stdout)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,453 @@
+"""Tests for tabtabtab.py — the picker's search and weighting core.
+
+The conftest replaces `tabtabtab` in sys.modules with a stub, so these tests
+load the real module from disk under a private name.
+
+Covers:
+- nonconsec_find(): documented examples still hold after the allocation-free rewrite
+- SearchIndex.scored_chunks(): same buckets as consec_find()/nonconsec_find() per item, in order
+- SearchIndex: bitmask prefilter rejects items missing a needle character
+- SearchIndex(previous=...): unchanged menupaths reuse their precomputed entries
+- fuzzy_match(): word-boundary, camelCase and consecutive hits outrank scattered ones
+- fuzzy_match() / SearchIndex.scored_chunks(): match positions index the displayed text
+- SearchIndex.scored_chunks(): one walk per fuzzy candidate; chunking leaves results unchanged
+- bold_runs(): splits display text into matched / unmatched runs for painting
+- parse_filter(): leading-space and legacy "*" / "[" search modes
+- ScoringJob: ranks by match score plus weight, publishes partial top-N from the previous
+  top-N plus each new chunk, stops when cancelled
+- _PickList / invoke_many(): Ctrl+Enter multi-select (opt-in per plugin) toggles picks and
+  keeps picking order; Enter adds the current row only if it was never toggled
+- NodeWeights: time-decayed frecency ranking (recent use beats stale frequent use)
+- NodeWeights: hard MAX_ITEMS cap with least-recently-used eviction
+- NodeWeights: save() compacts fully-decayed entries and writes the versioned format
+- NodeWeights: legacy {key: count} files are migrated on load
+- NodeWeights: get() uses a cached max instead of rescanning every call
+- NodeWeights: load() skips re-reading an unchanged file (mtime/size gate)
+- NodeWeights: save() writes atomically on a background thread and coalesces bursts
+"""
+
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+_TABTABTAB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'tabtabtab.py')
+
+
+def _load_real_tabtabtab():
+    spec = importlib.util.spec_from_file_location('_real_tabtabtab', _TABTABTAB_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+tabtabtab = _load_real_tabtabtab()
+NodeWeights = tabtabtab.NodeWeights
+
+_DAY = 24 * 60 * 60
+_NOW = 1_700_000_000.0
+
+
+_MENU_ITEMS = [
+    {'menupath': 'Anchors/Plate_Main', 'menuobj': 0},
+    {'menupath': 'Anchors/plate-grade', 'menuobj': 1},
+    {'menupath': 'Filter/Blur', 'menuobj': 2},
+    {'menupath': 'Merge/&Merge', 'menuobj': 3},
+    {'menupath': 'Transform/Matchmove', 'menuobj': 4},
+    {'menupath': 'Transform/Move2D', 'menuobj': 5},
+    {'menupath': 'NoPath', 'menuobj': 6},
+]
+
+
+def _scored(index, needle, anchored=True, force_consecutive=False, chunk_size=None):
+    """Flatten scored_chunks() into [(menuobj, score, positions), ...] in yield order."""
+    return [(entry.item['menuobj'], score, positions)
+            for chunk in index.scored_chunks(needle, anchored, force_consecutive, chunk_size)
+            for entry, score, positions in chunk]
+
+
+class TestMatching(unittest.TestCase):
+
+    def test_nonconsec_find_documented_examples(self):
+        """The docstring examples, on picker-style "name [menu]" haystacks."""
+        def find(needle, name, anchored=False):
+            return tabtabtab.nonconsec_find(needle, name + ' [menu]', anchored)
+
+        self.assertTrue(find('m2', 'move2d'))
+        self.assertFalse(find('m2', 'matchmove'))
+        self.assertTrue(find('atch', 'matchmove', anchored=False))
+        self.assertFalse(find('atch', 'matchmove', anchored=True))
+        self.assertTrue(find('match', 'matchmove', anchored=True))
+        self.assertFalse(find(' mt', 'matchmove', anchored=True))
+        self.assertTrue(find(' ma', 'matchmove', anchored=True))
+        self.assertFalse(find(' oe', 'matchmove', anchored=False))
+        self.assertTrue(find(' ov', 'matchmove', anchored=False))
+
+    def test_scored_chunks_match_per_item_find_functions(self):
+        index = tabtabtab.SearchIndex(_MENU_ITEMS)
+        for needle in ('', 'p', 'pl', 'plm', 'platem', 'mm', 'm2', 'mov', '[anch', 'zz', ' ov'):
+            for anchored in (True, False):
+                for force_consecutive in (True, False):
+                    expected_a, expected_b = [], []
+                    for entry in index.entries:
+                        if tabtabtab.consec_find(needle, entry.search, anchored):
+                            expected_a.append(entry.item['menuobj'])
+                        elif not force_consecutive and tabtabtab.nonconsec_find(
+                                needle, entry.search, anchored):
+                            expected_b.append(entry.item['menuobj'])
+                    got = _scored(index, needle, anchored, force_consecutive)
+                    self.assertEqual(
+                        [menuobj for menuobj, _, _ in got], expected_a + expected_b,
+                        (needle, anchored, force_consecutive))
+
+    def test_chunking_leaves_scored_matches_unchanged(self):
+        for drop_first_char in (False, True):
+            index = tabtabtab.SearchIndex(_MENU_ITEMS, drop_first_char=drop_first_char)
+            for needle in ('', 'p', 'plm', 'platem', 'mm', 'm2', '[anch', 'zz', ' ov', 'pl m'):
+                for anchored in (True, False):
+                    self.assertEqual(
+                        sorted(_scored(index, needle, anchored, chunk_size=2)),
+                        sorted(_scored(index, needle, anchored)),
+                        (needle, anchored))
+
+    def test_fuzzy_candidates_are_not_walked_twice(self):
+        index = tabtabtab.SearchIndex(_MENU_ITEMS)
+        with patch.object(tabtabtab, '_nonconsec_match') as nonconsec:
+            list(index.scored_chunks('plm'))
+        nonconsec.assert_not_called()
+
+    def test_index_builds_display_text(self):
+        index = tabtabtab.SearchIndex(_MENU_ITEMS)
+        self.assertEqual(index.entries[3].text, 'Merge [Merge]')
+        self.assertEqual(index.entries[3].name, 'merge')
+
+    def test_previous_index_entries_are_reused(self):
+        old = tabtabtab.SearchIndex(_MENU_ITEMS)
+        renamed = {'menupath': 'Filter/Blur2', 'menuobj': 2}
+        same_path_new_object = dict(_MENU_ITEMS[1])
+        mlist = [_MENU_ITEMS[0], same_path_new_object, renamed]
+        with patch.object(tabtabtab, '_char_mask', wraps=tabtabtab._char_mask) as char_mask:
+            new = tabtabtab.SearchIndex(mlist, previous=old)
+        self.assertEqual(char_mask.call_count, 2, 'only the renamed item is recomputed')
+        self.assertIs(new.entries[0], old.entries[0])
+        self.assertIs(new.entries[1].item, same_path_new_object)
+        self.assertEqual(new.entries[1].search, old.entries[1].search)
+        self.assertEqual(new.entries[2].text, 'Blur2 [Filter]')
+
+    def test_mask_prefilter_skips_items_missing_a_character(self):
+        index = tabtabtab.SearchIndex(_MENU_ITEMS)
+        with patch.object(tabtabtab, '_consec_match') as consec, \
+             patch.object(tabtabtab, 'fuzzy_match') as fuzzy:
+            self.assertEqual(_scored(index, 'bq', anchored=False), [])
+        consec.assert_not_called()
+        fuzzy.assert_not_called()
+
+
+class TestFuzzyScoring(unittest.TestCase):
+
+    def test_no_subsequence_returns_none(self):
+        self.assertIsNone(tabtabtab.fuzzy_match('pz', 'plate'))
+        self.assertEqual(tabtabtab.fuzzy_match('', 'plate'), (0, []))
+
+    def test_word_boundary_hits_outrank_mid_word_hits(self):
+        boundary, _ = tabtabtab.fuzzy_match('pm', 'plate_main')
+        mid_word, _ = tabtabtab.fuzzy_match('pm', 'plumb')
+        self.assertGreater(boundary, mid_word)
+
+    def test_camel_case_hump_earns_bonus(self):
+        camel, positions = tabtabtab.fuzzy_match('pm', 'platemain', 'PlateMain')
+        flat, _ = tabtabtab.fuzzy_match('pm', 'platemain', 'platemain')
+        self.assertGreater(camel, flat)
+        self.assertEqual(positions, [0, 5])
+
+    def test_consecutive_run_outranks_scattered_match(self):
+        run, _ = tabtabtab.fuzzy_match('gra', 'grade')
+        scattered, _ = tabtabtab.fuzzy_match('gra', 'garbage_rate')
+        self.assertGreater(run, scattered)
+
+    def test_backward_scan_picks_tightest_window(self):
+        _, positions = tabtabtab.fuzzy_match('ab', 'a_xab')
+        self.assertEqual(positions, [3, 4])
+
+    def test_scored_positions_follow_display_text(self):
+        for drop_first_char in (False, True):
+            index = tabtabtab.SearchIndex(_MENU_ITEMS, drop_first_char=drop_first_char)
+            text = index.entries[0].text  # "Plate_Main [Anchors]"
+            for needle in ('la', 'am', '[anch'):
+                matched = {menuobj: positions
+                           for menuobj, _, positions in _scored(index, needle, anchored=False)}
+                self.assertEqual(''.join(text[p] for p in matched[0]).lower(), needle)
+
+    def test_bold_runs(self):
+        self.assertEqual(
+            tabtabtab.bold_runs('Blur [Filter]', [0, 1]),
+            [('Bl', True), ('ur [Filter]', False)])
+        self.assertEqual(tabtabtab.bold_runs('ab', []), [('ab', False)])
+
+
+class TestScoringJob(unittest.TestCase):
+
+    def _job(self, filtertext, weights=None, num_items=18, items=_MENU_ITEMS):
+        index = tabtabtab.SearchIndex(items)
+        return tabtabtab.ScoringJob(index, items, filtertext, weights or {}, num_items)
+
+    def test_parse_filter_modes(self):
+        parse = tabtabtab.parse_filter
+        self.assertEqual(parse('Bl'), ('bl', True, False, False))
+        self.assertEqual(parse(' bl'), ('bl', False, False, False))
+        self.assertEqual(parse('  bl'), ('bl', False, True, False))
+        self.assertEqual(parse('*bl'), ('bl', False, False, False))
+        self.assertEqual(parse('**bl'), ('bl', False, False, True))
+
+    def test_results_sorted_by_rank_then_text(self):
+        results = self._job('p').run()
+        self.assertEqual([r['text'] for r in results],
+                         ['Plate_Main [Anchors]', 'plate-grade [Anchors]'])
+        self.assertNotIn('color', results[0], 'colors are filled in lazily on the UI thread')
+
+    def test_weight_lifts_equally_matched_item(self):
+        results = self._job('p', weights={'Anchors/plate-grade': 1.0}).run()
+        self.assertEqual(results[0]['menupath'], 'Anchors/plate-grade')
+        self.assertEqual(results[0]['score'], 1.0)
+
+    def test_partial_results_are_top_n_so_far(self):
+        items = [{'menupath': 'Anchors/plate%d' % i, 'menuobj': i} for i in range(10)]
+        partials = []
+        results = self._job('pl', num_items=3, items=items).run(
+            chunk_size=4, on_partial=partials.append)
+        self.assertEqual(len(partials), 3)
+        self.assertTrue(all(len(p) <= 3 for p in partials))
+        self.assertEqual(partials[-1], results[:3])
+        self.assertEqual(len(results), 10)
+
+    def test_partial_ranking_only_sees_best_so_far_and_new_chunk(self):
+        items = [{'menupath': 'Anchors/plate%d' % i, 'menuobj': i} for i in range(40)]
+        with patch.object(tabtabtab.heapq, 'nsmallest', wraps=tabtabtab.heapq.nsmallest) as ranked:
+            self._job('pl', num_items=3, items=items).run(chunk_size=4, on_partial=lambda _: None)
+        self.assertEqual(ranked.call_count, 10)
+        self.assertTrue(all(len(call.args[1]) <= 3 + 4 for call in ranked.call_args_list))
+
+    def test_cancelled_job_returns_none(self):
+        items = [{'menupath': 'Anchors/plate%d' % i, 'menuobj': i} for i in range(10)]
+        checks = []
+
+        def is_cancelled():
+            checks.append(True)
+            return len(checks) > 1
+
+        self.assertIsNone(self._job('pl', items=items).run(chunk_size=4, is_cancelled=is_cancelled))
+        self.assertEqual(len(checks), 2, 'job stops at the first chunk boundary after cancel')
+
+
+class TestMultiSelect(unittest.TestCase):
+
+    def _thing(self, name):
+        return {'menupath': 'Anchors/' + name, 'menuobj': name, 'text': name}
+
+    def test_toggle_adds_then_removes(self):
+        picks = tabtabtab._PickList()
+        self.assertTrue(picks.toggle(self._thing('a')))
+        self.assertTrue(picks.toggle(self._thing('b')))
+        self.assertFalse(picks.toggle(self._thing('a')))
+        self.assertEqual([t['menuobj'] for t in picks.things_with(None)], ['b'])
+
+    def test_things_with_appends_current_row_once(self):
+        picks = tabtabtab._PickList()
+        picks.toggle(self._thing('a'))
+        picks.toggle(self._thing('b'))
+        self.assertEqual([t['menuobj'] for t in picks.things_with(self._thing('c'))],
+                         ['a', 'b', 'c'])
+        self.assertEqual([t['menuobj'] for t in picks.things_with(self._thing('a'))],
+                         ['a', 'b'])
+        self.assertIn('2 picked', picks.summary())
+
+    def test_things_with_leaves_out_a_row_toggled_off(self):
+        picks = tabtabtab._PickList()
+        picks.toggle(self._thing('a'))
+        picks.toggle(self._thing('b'))
+        picks.toggle(self._thing('b'))
+        self.assertEqual([t['menuobj'] for t in picks.things_with(self._thing('b'))], ['a'])
+        picks.clear()
+        self.assertEqual([t['menuobj'] for t in picks.things_with(self._thing('b'))], ['b'])
+
+    def test_default_invoke_many_invokes_each_in_order(self):
+        invoked = []
+
+        class Plugin(tabtabtab.TabTabTabPlugin):
+            def invoke(self, thing):
+                invoked.append(thing['menuobj'])
+
+        Plugin().invoke_many([self._thing('a'), self._thing('b')])
+        self.assertEqual(invoked, ['a', 'b'])
+
+    def test_multi_select_is_opt_in(self):
+        self.assertFalse(tabtabtab.TabTabTabPlugin.supports_multi_select)
+
+
+class _WeightsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._tmpdir = tempfile.mkdtemp()
+        self.fname = os.path.join(self._tmpdir, 'weights.json')
+
+    def tearDown(self):
+        shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+    def _clock(self, value):
+        return patch.object(tabtabtab.time, 'time', return_value=value)
+
+
+class TestFrecencyRanking(_WeightsTestCase):
+
+    def test_recent_use_outranks_old_frequent_use(self):
+        """Five uses two months ago rank below two uses today."""
+        weights = NodeWeights(self.fname)
+        with self._clock(_NOW - 60 * _DAY):
+            for _ in range(5):
+                weights.increment('Old')
+        with self._clock(_NOW):
+            weights.increment('New')
+            weights.increment('New')
+            self.assertGreater(weights.get('New'), weights.get('Old'))
+            self.assertEqual(weights.get('New'), 1.0)
+            self.assertEqual(weights.get('Missing'), 0)
+            self.assertEqual(weights.snapshot(),
+                             {'New': weights.get('New'), 'Old': weights.get('Old')})
+
+    def test_increment_decays_previous_score(self):
+        weights = NodeWeights(self.fname)
+        with self._clock(_NOW):
+            weights.increment('Blur')
+        with self._clock(_NOW + NodeWeights.HALF_LIFE):
+            weights.increment('Blur')
+        self.assertAlmostEqual(weights._weights['Blur'][0], 1.5)
+
+    def test_get_uses_cached_max_until_increment(self):
+        weights = NodeWeights(self.fname)
+        with self._clock(_NOW):
+            weights.increment('A')
+            weights.get('A')
+            with patch.object(weights, '_decay', side_effect=AssertionError('rescanned')):
+                weights.get('A')
+                weights.get('B')
+
+
+class TestBoundedStorage(_WeightsTestCase):
+
+    def test_cap_evicts_least_recently_used(self):
+        weights = NodeWeights(self.fname)
+        with patch.object(NodeWeights, 'MAX_ITEMS', 3):
+            for i in range(5):
+                with self._clock(_NOW + i):
+                    weights.increment('item%d' % i)
+        self.assertEqual(sorted(weights._weights), ['item2', 'item3', 'item4'])
+
+    def test_save_drops_decayed_entries_and_writes_versioned_format(self):
+        weights = NodeWeights(self.fname)
+        weights._successful_load = True
+        with self._clock(_NOW - 365 * _DAY):
+            weights.increment('Ancient')
+        with self._clock(_NOW):
+            weights.increment('Recent')
+            weights.save()
+        weights.flush()
+
+        with open(self.fname) as f:
+            data = json.load(f)
+        self.assertEqual(data['version'], NodeWeights.FORMAT_VERSION)
+        self.assertEqual(list(data['items']), ['Recent'])
+
+    def test_legacy_count_file_is_migrated_on_load(self):
+        with open(self.fname, 'w') as f:
+            json.dump({'Draw/Roto': 10, 'Filter/Blur': 2}, f)
+
+        weights = NodeWeights(self.fname)
+        with self._clock(_NOW):
+            weights.load()
+            self.assertTrue(weights._successful_load)
+            self.assertEqual(weights.get('Draw/Roto'), 1.0)
+            self.assertAlmostEqual(weights.get('Filter/Blur'), 0.2)
+
+    def test_oversized_file_is_compacted_on_load(self):
+        items = {'item%d' % i: [1.0, _NOW + i] for i in range(10)}
+        with open(self.fname, 'w') as f:
+            json.dump({'version': NodeWeights.FORMAT_VERSION, 'items': items}, f)
+
+        weights = NodeWeights(self.fname)
+        with patch.object(NodeWeights, 'MAX_ITEMS', 4), self._clock(_NOW + 10):
+            weights.load()
+        self.assertEqual(sorted(weights._weights), ['item6', 'item7', 'item8', 'item9'])
+
+
+class TestGatedLoadAndBackgroundSave(_WeightsTestCase):
+
+    def _write(self, items):
+        with open(self.fname, 'w') as f:
+            json.dump({'version': NodeWeights.FORMAT_VERSION, 'items': items}, f)
+
+    def test_unchanged_file_is_not_reparsed(self):
+        self._write({'Blur': [1.0, _NOW]})
+        weights = NodeWeights(self.fname)
+        with patch.object(weights, '_parse', wraps=weights._parse) as parse:
+            weights.load()
+            weights.load()
+            self.assertEqual(parse.call_count, 1)
+
+            # A different size (or mtime) means another session wrote the file
+            self._write({'Blur': [1.0, _NOW], 'Grade': [2.0, _NOW]})
+            weights.load()
+            self.assertEqual(parse.call_count, 2)
+        self.assertIn('Grade', weights._weights)
+
+    def test_own_save_does_not_trigger_reload(self):
+        self._write({'Blur': [1.0, _NOW]})
+        weights = NodeWeights(self.fname)
+        weights.load()
+        weights.increment('Grade')
+        weights.save()
+        weights.flush()
+        with patch.object(weights, '_parse') as parse:
+            weights.load()
+        parse.assert_not_called()
+
+    def test_save_replaces_file_atomically(self):
+        weights = NodeWeights(self.fname)
+        weights.load()
+        weights.increment('Blur')
+        with patch.object(tabtabtab.os, 'replace', wraps=os.replace) as replace:
+            weights.save()
+            weights.flush()
+        replace.assert_called_once()
+        self.assertEqual(os.listdir(self._tmpdir), ['weights.json'])
+
+    def test_rapid_saves_are_coalesced(self):
+        """Saves queued while a write is in flight collapse into one write of the newest data."""
+        import threading
+        weights = NodeWeights(self.fname)
+        weights.load()
+        release = threading.Event()
+        written = []
+        real_write = weights._write_file
+
+        def slow_write(payload):
+            release.wait(5)
+            written.append(payload)
+            real_write(payload)
+
+        with patch.object(weights, '_write_file', side_effect=slow_write):
+            for name in ('A', 'B', 'C', 'D'):
+                weights.increment(name)
+                weights.save()
+            release.set()
+            weights.flush()
+
+        self.assertLessEqual(len(written), 2)
+        with open(self.fname) as f:
+            self.assertEqual(sorted(json.load(f)['items']), ['A', 'B', 'C', 'D'])
+
+
+if __name__ == '__main__':
+    unittest.main()
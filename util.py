@@ -1,3 +1,5 @@
+import contextlib
+
 import nuke
 import nukescripts
 
@@ -23,3 +25,14 @@ def select_upstream_ignoring_hidden():
     for n in ns:
         n["selected"].setValue(True)
     node["selected"].setValue(True)
+
+
+@contextlib.contextmanager
+def undo_group(name):
+    """Record every change made inside the block as a single Edit > Undo step named *name*."""
+    undo = nuke.Undo()
+    undo.begin(name)
+    try:
+        yield
+    finally:
+        undo.end()